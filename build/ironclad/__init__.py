@@ -11,7 +11,7 @@ import os
 _dirname = os.path.dirname(__file__)
 
 import clr
-from System import GC, Int32, IntPtr
+from System import Array, Environment, GC, Int32, IntPtr
 from System.Reflection import Assembly
 from System.Runtime.InteropServices import Marshal
 
@@ -19,7 +19,7 @@ if Marshal.SizeOf(Int32()) != Marshal.SizeOf(IntPtr()):
     raise ImportError("Ironclad is currently 32-bit only")
 
 clr.AddReference(Assembly.LoadFile(os.path.join(_dirname, "ironclad.dll")))
-from Ironclad import CPyMarshal, PythonMapper
+from Ironclad import CPyMarshal, PythonMapper, WorkerPool
 from Ironclad.Structs import PyObject, PyVarObject, PyTypeObject
 _mapper = PythonMapper(os.path.join(_dirname, "python27.dll"))
 
@@ -138,6 +138,8 @@ unpatch_native_filenos = _patch_lifetime.unpatch_filenos
 ###############################################################################
 #### various useful functions
 
+from contextlib import contextmanager
+
 def log_info(obj, size=None):
     """
     Print useful debugging information about the first argument.
@@ -173,10 +175,13 @@ def log_refs():
 
 def set_gc_threshold(value):
     """
-    Set how frequently Ironclad performs tedious bookkeeping tasks. The default value of
-    50,000 gives decent performance at the cost of a noticeably sawtoothed memory usage 
-    graph when lots of objects are being created and destroyed; if you find yourself 
-    running out of memory, you may want to reduce this value.
+    Set how frequently Ironclad performs tedious bookkeeping tasks. The bookkeeping is
+    done a little at a time, whenever the GIL is released, such that every object is
+    examined once every <value> releases; a value of 0 examines every object on every
+    release. The default value of 50,000 gives decent performance at the cost of a 
+    slowly-reclaimed memory usage graph when lots of objects are being created and 
+    destroyed; if you find yourself running out of memory, you may want to reduce 
+    this value.
     
     For reference, a value of 500 produces a near-enough-flat memory usage graph, with 
     *average* performance degradation of approximately 50%; however, in the worst case, 
@@ -195,6 +200,291 @@ def get_gc_threshold():
     """
     return _mapper.GCThreshold
 
+def set_sweep_budget(value):
+    """
+    Set the maximum number of objects examined by a single step of the bookkeeping
+    described in set_gc_threshold's docstring. The default of 1,000 keeps each step
+    short, even when very many objects are alive; larger values let the bookkeeping
+    keep up with a low threshold at the cost of longer pauses. A value of 0 removes
+    the limit.
+    """
+    _mapper.SweepBudget = value
+
+def get_sweep_budget():
+    """
+    Get the current sweep budget. See set_sweep_budget docstring.
+    """
+    return _mapper.SweepBudget
+
+def set_fallback_sweep_interval(value):
+    """
+    Set how many GC thresholds' worth of GIL releases a complete fallback sweep is
+    spread over. Objects which pass through unmanaged code are re-examined straight
+    away, so the sweep only has to catch the rare ones which change some other way;
+    the default of 100 means the cost of a release no longer depends much on how
+    many objects are alive. A value of 1 sweeps everything once per threshold.
+    """
+    _mapper.FallbackSweepInterval = value
+
+def get_fallback_sweep_interval():
+    """
+    Get the current fallback sweep interval. See set_fallback_sweep_interval docstring.
+    """
+    return _mapper.FallbackSweepInterval
+
+def set_value_cache_size(value):
+    """
+    Set how many recently-used short strs, and how many recently-used floats, Ironclad
+    will keep alive so that storing an equal value again can reuse the same unmanaged
+    object. While the size is non-zero, ints from -5 to 1024 are cached as well. Set to 0
+    to disable the cache entirely; the default is 1,024.
+    """
+    _mapper.ValueCacheSize = value
+
+def get_value_cache_size():
+    """
+    Get the current value cache size. See set_value_cache_size docstring.
+    """
+    return _mapper.ValueCacheSize
+
+def value_cache_stats(reset=False):
+    """
+    Return a dict describing how effective the value cache has been: 'hits' and 'misses'
+    count lookups since the stats were last reset, and 'size' is the number of objects
+    currently cached. Pass reset=True to zero the counts after reading them.
+    """
+    stats = {
+        'hits': _mapper.ValueCacheHits,
+        'misses': _mapper.ValueCacheMisses,
+        'size': _mapper.ValueCacheCount,
+    }
+    if reset:
+        _mapper.ResetValueCacheStats()
+    return stats
+
+set_value_cache_size(1024)
+
+def set_free_list_limit(value):
+    """
+    Set how many deallocated objects of each kind Ironclad keeps around for reuse. There
+    is one list each for ints, floats and bound methods, and one for every tuple length
+    from 0 to 20. Higher values make creating these objects cheaper, at the cost of
+    holding on to memory after a burst of activity. Set to 0 to disable the free lists;
+    the default is 100.
+    """
+    _mapper.FreeListLimit = value
+
+def get_free_list_limit():
+    """
+    Get the current free list limit. See set_free_list_limit docstring.
+    """
+    return _mapper.FreeListLimit
+
+set_free_list_limit(100)
+
+def add_memory_pressure(bytes):
+    """
+    Tell Ironclad (and hence the .NET garbage collector) that <bytes> of unmanaged memory,
+    which Ironclad didn't allocate itself, is being kept alive by managed objects. Memory 
+    allocated through the Python API is already accounted for; use this for buffers which
+    extensions get from malloc directly, so that large short-lived objects get collected 
+    before they exhaust memory. Every call should be balanced by remove_memory_pressure.
+    """
+    _mapper.AddMemoryPressure(bytes)
+
+def remove_memory_pressure(bytes):
+    """
+    Undo a previous add_memory_pressure.
+    """
+    _mapper.RemoveMemoryPressure(bytes)
+
+def set_record_gil_stats(value):
+    """
+    Turn GIL instrumentation on or off. While it's on, Ironclad records, for every thread,
+    how often it took the GIL, how long it waited for it and how long it held it, and how
+    often C code released it with PyEval_SaveThread. The overhead is a couple of timer 
+    reads per acquisition; it is off by default, so call set_record_gil_stats(True)
+    before the code you want to measure.
+    """
+    _mapper.RecordGILStats = value
+
+def get_record_gil_stats():
+    """
+    Find out whether GIL instrumentation is on. See set_record_gil_stats docstring.
+    """
+    return _mapper.RecordGILStats
+
+def gil_stats():
+    """
+    Return a dict mapping managed thread ids to dicts describing each thread's use of the
+    GIL since the stats were last reset: 'name' is the thread's name (or None);
+    'acquisitions' and 'save_thread_releases' are counts; 'total_wait', 'max_wait',
+    'total_hold' and 'max_hold' are in seconds. The 'wait_histogram' and 'hold_histogram'
+    lists count waits and holds by duration: the first entry counts those under 1us, and
+    entry n those from 2**(n-1) to 2**n us.
+    """
+    stats = {}
+    for threadStats in _mapper.GetGILStats():
+        stats[threadStats.ThreadId] = {
+            'name': threadStats.ThreadName,
+            'acquisitions': threadStats.Acquisitions,
+            'save_thread_releases': threadStats.SaveThreadReleases,
+            'total_wait': threadStats.TotalWait,
+            'max_wait': threadStats.MaxWait,
+            'total_hold': threadStats.TotalHold,
+            'max_hold': threadStats.MaxHold,
+            'wait_histogram': list(threadStats.WaitHistogram),
+            'hold_histogram': list(threadStats.HoldHistogram),
+        }
+    return stats
+
+def reset_gil_stats():
+    """
+    Zero all the counts and times reported by gil_stats.
+    """
+    _mapper.ResetGILStats()
+
+def set_switch_interval(value):
+    """
+    Set how long, in seconds, a thread waits for the GIL before asking for it. Once a
+    thread has asked, the next time the GIL is released it goes straight to the thread
+    which has waited longest, and threads inside gil_held() blocks give it up between
+    calls; otherwise, a thread which repeatedly calls into C extensions can keep other
+    threads waiting indefinitely. Set to 0 to let whichever thread gets there first take
+    the GIL; the default is 0.005.
+    """
+    _mapper.SwitchInterval = value
+
+def get_switch_interval():
+    """
+    Get the current switch interval. See set_switch_interval docstring.
+    """
+    return _mapper.SwitchInterval
+
+set_switch_interval(0.005)
+
+@contextmanager
+def gil_held():
+    """
+    Hold Ironclad's GIL for the duration of a with block, so that calls into C extensions
+    inside the block don't each have to acquire and release it; temporary objects and
+    bookkeeping are dealt with once, when the block ends. Other threads can only call into
+    C extensions meanwhile if they've waited longer than the switch interval (see
+    set_switch_interval), so keep the block short if you use threads.
+    
+    with ironclad.gil_held():
+        for x in data:
+            ext.process(x)
+    """
+    _mapper.EnterGILBatch()
+    try:
+        yield
+    finally:
+        _mapper.ExitGILBatch()
+
+class Future(object):
+    """
+    The eventual result of a call made by an Executor.
+    """
+    
+    def __init__(self, future):
+        self._future = future
+    
+    def done(self):
+        """
+        Return True if the call has finished, successfully or otherwise.
+        """
+        return self._future.Done
+    
+    def result(self, timeout=None):
+        """
+        Wait for the call to finish, and return its result or raise its exception. If
+        <timeout> seconds pass first, raise RuntimeError. If this thread holds the GIL
+        (inside gil_held(), for example), it's given up while waiting, and taken back
+        afterwards.
+        """
+        self._wait(timeout)
+        return self._future.Result
+    
+    def exception(self, timeout=None):
+        """
+        Wait for the call to finish, and return the exception it raised, or None. The
+        GIL is given up while waiting, as in result().
+        """
+        self._wait(timeout)
+        return self._future.Exception
+    
+    def _wait(self, timeout):
+        if timeout is None:
+            timeout = -1
+        # the workers may need the GIL to finish, so we mustn't hang on to it while
+        # we wait (for example, inside a gil_held() block)
+        suspended = _mapper.SuspendGIL()
+        try:
+            finished = self._future.Wait(timeout)
+        finally:
+            if suspended:
+                _mapper.ResumeGIL()
+        if not finished:
+            raise RuntimeError('call did not finish within %s seconds' % timeout)
+
+class Executor(object):
+    """
+    Run callables on a dedicated pool of <workers> threads (by default, one per
+    processor), returning Futures. Calls into C extensions still take the GIL to marshal
+    their arguments and results, but extension code which releases the GIL (as much of
+    numpy and scipy does, around heavy computation) runs on all the workers at once.
+    
+    with ironclad.Executor() as executor:
+        futures = [executor.submit(numpy.linalg.inv, m) for m in matrices]
+        inverses = [f.result() for f in futures]
+    """
+    
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = Environment.ProcessorCount
+        self._pool = WorkerPool(workers)
+    
+    def submit(self, func, *args):
+        """
+        Arrange for func(*args) to be called on a worker thread, and return a Future.
+        """
+        return Future(self._pool.Submit(func, Array[object](args)))
+    
+    def map(self, func, iterable):
+        """
+        Call func on every item of <iterable>, concurrently; return a list of the results,
+        in order. If any call raised an exception, the first one is raised here. Like
+        Future.result, this is safe to call while holding the GIL.
+        """
+        futures = [self.submit(func, item) for item in iterable]
+        return [future.result() for future in futures]
+    
+    def shutdown(self, wait=True):
+        """
+        Stop accepting new calls. Calls already submitted are still made; if <wait>,
+        don't return until they have finished.
+        """
+        self._pool.Shutdown(wait)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *_):
+        self.shutdown()
+
+def parallel_map(func, iterable, workers=None):
+    """
+    Like map(func, iterable), but the calls are made concurrently on a temporary
+    Executor with <workers> threads. Only worthwhile when func spends most of its time
+    in extension code which releases the GIL.
+    """
+    executor = Executor(workers)
+    try:
+        return executor.map(func, iterable)
+    finally:
+        executor.shutdown()
+
 def set_log_errors(value):
     """
     Spam stdout with an unimaginably vast quantity of pointless information. Even if
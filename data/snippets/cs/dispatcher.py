@@ -62,11 +62,9 @@ METHOD_TEMPLATE = """\
 %(cleanup_objs)s
 %(handle_ret)s
 
-                PythonExceptions.BaseException error = (PythonExceptions.BaseException)this.mapper.LastException;
-                if (error != null)
+                if (this.mapper.ErrorOccurred)
                 {
-                    this.mapper.LastException = null;
-                    throw error.clsException;
+                    throw this.mapper.TakeException();
                 }
 %(return_ret)s
             }
@@ -83,6 +81,17 @@ SIGNATURE_TEMPLATE = """\
         public %(rettype)s %(name)s(%(arglist)s)"""
 
 
+#================================================================================================
+
+# generated Python binds each callable to its delegate once, and calls the method above; this
+# overload is for anyone who only has the key
+LOOKUP_METHOD_TEMPLATE = """\
+%(signature)s
+        {
+            %(return_)sthis.%(name)s(key, (dgt_%(spec)s)this.table[key]%(arglist)s);
+        }"""
+
+
 #================================================================================================
 
 TRANSLATE_OBJ_TEMPLATE = """\
@@ -95,6 +104,9 @@ TRANSLATE_NULLABLE_KWARGS_TEMPLATE = """\
                     ptr%(index)d = this.mapper.Store(arg%(index)d);
                 }"""
 
+TRANSLATE_ARGS_TUPLE_TEMPLATE = """\
+                IntPtr ptr%(index)d = this.mapper.StoreArgs(arg%(index)d);"""
+
 
 #================================================================================================
 
@@ -111,7 +123,7 @@ NULL_ARG = 'IntPtr.Zero'
 
 MODULE_ARG = 'this.modulePtr'
 
-CALL_DGT_TEMPLATE = '((dgt_%(spec)s)(this.table[key]))(%(arglist)s);'
+CALL_DGT_TEMPLATE = 'dgt(%(arglist)s);'
 
 
 #================================================================================================
@@ -122,6 +134,9 @@ CLEANUP_OBJ_TEMPLATE = """\
                     this.mapper.DecRef(ptr%(index)d);
                 }"""
 
+CLEANUP_ARGS_TUPLE_TEMPLATE = """\
+                this.mapper.ReleaseArgs(ptr%(index)d);"""
+
 
 #================================================================================================
 
@@ -132,12 +147,9 @@ SIMPLE_RETURN = """\
 #================================================================================================
 
 THROW_RET_NEGATIVE = """\
-                if (ret < 0)
+                if (ret < 0 && !this.mapper.ErrorOccurred)
                 {
-                    if (this.mapper.LastException == null)
-                    {
-                        this.mapper.LastException = new Exception(key);
-                    }
+                    throw new Exception(key);
                 }"""
 
 
@@ -147,9 +159,9 @@ HANDLE_RET_NULL = """\
                 object ret = null;
                 if (retptr == IntPtr.Zero)
                 {
-                    if (this.mapper.LastException == null)
+                    if (!this.mapper.ErrorOccurred)
                     {
-                        this.mapper.LastException = %s;
+                        throw %s;
                     }
                 }
                 else
@@ -8,7 +8,7 @@ MAGICMETHODS_TEMPLATE = """\
     public class MagicMethods
     {
         public static void
-        GetInfo(string field, out string name, out string template, out Type dgtType, out bool needGetSwappedInfo)
+        GetInfo(string field, out string name, out string functype, out string binder, out Type dgtType, out bool needGetSwappedInfo)
         {
             needGetSwappedInfo = false;
             switch (field)
@@ -20,7 +20,7 @@ MAGICMETHODS_TEMPLATE = """\
         }
         
         public static void
-        GetSwappedInfo(string field, out string name, out string template, out Type dgtType)
+        GetSwappedInfo(string field, out string name, out string functype, out string binder, out Type dgtType)
         {
             switch (field)
             {
@@ -39,8 +39,9 @@ MAGICMETHODS_FILE_TEMPLATE = FILE_TEMPLATE % MAGICMETHODS_TEMPLATE
 MAGICMETHOD_CASE_TEMPLATE = """\
                 case "%(c_field)s":%(has_swapped_version_code)s
                     name = "%(py_field)s";
+                    functype = "%(functype)s";
+                    binder = "%(binder)s";
                     dgtType = typeof(dgt_%(dgt_spec)s);
-                    template = @"%(template)s";
                     break;"""
 
 SWAP_NO_CODE = ''
@@ -51,29 +52,25 @@ SWAP_YES_CODE = """
 
 #================================================================================================
 
-MAGICMETHOD_TEMPLATE2 = """
-def {0}(%(arglist)s):
-    '''{1}'''
-    return _0._dispatcher.%(functype)s('{2}{0}', %(callargs)s)
-_ironclad_class_attrs['{0}'] = {0}"""
-
-SQUISHKWARGS_TEMPLATE2 = """
-def {0}(self, *args, **kwargs):
-    '''{1}'''
-    return self._dispatcher.%(functype)s('{2}{0}', self, args, kwargs)
-_ironclad_class_attrs['{0}'] = {0}"""
-
-POW_TEMPLATE2 = """
-def {0}(self, other, modulo=None):
-    '''{1}'''
-    return self._dispatcher.%(functype)s('{2}{0}', self, other, modulo)
-_ironclad_class_attrs['{0}'] = {0}"""
-
-POW_SWAPPED_TEMPLATE2 = """
-def {0}(self, other):
-    '''{1}'''
-    return self._dispatcher.%(functype)s('{2}{0}', other, self, None)
-_ironclad_class_attrs['{0}'] = {0}"""
+# binders are defined in data/snippets/py/CALLABLE_BINDERS_CODE.py; by default, a magic
+# method's binder is chosen by the number of arguments its dispatcher method takes
+
+ARITY_BINDERS = {
+    1: '_ironclad_magic_unary',
+    2: '_ironclad_magic_binary',
+    3: '_ironclad_magic_ternary',
+    4: '_ironclad_magic_quaternary',
+}
+
+SWAPPED_ARITY_BINDERS = {
+    2: '_ironclad_magic_binary_swapped',
+}
+
+SQUISHKWARGS_BINDER = '_ironclad_magic_squishkwargs'
+
+POW_BINDER = '_ironclad_magic_pow'
+
+POW_SWAPPED_BINDER = '_ironclad_magic_pow_swapped'
 
 
 #================================================================================================
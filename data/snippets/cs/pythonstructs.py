@@ -19,10 +19,33 @@ STRUCT_TEMPLATE = """\
         public struct %(name)s
         {
 %(fields)s
+        }
+
+        public static class %(name)sFields
+        {
+%(offsets)s
+%(accessors)s
         }"""
 
 STRUCT_FIELD_TEMPLATE = """\
             public %(type)s %(name)s;"""
 
+STRUCT_OFFSET_TEMPLATE = """\
+            public static readonly int %(name)s = (int)Marshal.OffsetOf(typeof(%(struct)s), "%(name)s");"""
+
+STRUCT_ACCESSORS_TEMPLATE = """\
+
+            public static %(type)s
+            Read%(accessor)s(IntPtr ptr)
+            {
+                return CPyMarshal.Read%(kind)s(CPyMarshal.Offset(ptr, %(name)s));
+            }
+
+            public static void
+            Write%(accessor)s(IntPtr ptr, %(type)s value)
+            {
+                CPyMarshal.Write%(kind)s(CPyMarshal.Offset(ptr, %(name)s), value);
+            }"""
+
 
 #================================================================================================
@@ -0,0 +1,238 @@
+
+# Everything ClassBuilder and CallableBuilder put into a class or module comes from one
+# of these functions: they're compiled once, when the mapper is created, and each call
+# binds a dispatcher method and a delegate into a new callable.
+
+def _ironclad_rename(func, name, doc, module=None):
+    func.__name__ = name
+    func.__doc__ = doc
+    if module is not None:
+        func.__module__ = module
+    return func
+
+
+def _ironclad_oldargs_function(dispatcher, key, dgt, name, doc, module):
+    def function(*args):
+        if len(args) == 1:
+            return dispatcher.ic_function_objarg(key, dgt, args[0])
+        return dispatcher.ic_function_varargs(key, dgt, args)
+    return _ironclad_rename(function, name, doc, module)
+
+def _ironclad_noargs_function(dispatcher, key, dgt, name, doc, module):
+    def function():
+        return dispatcher.ic_function_noargs(key, dgt)
+    return _ironclad_rename(function, name, doc, module)
+
+def _ironclad_objarg_function(dispatcher, key, dgt, name, doc, module):
+    def function(arg):
+        return dispatcher.ic_function_objarg(key, dgt, arg)
+    return _ironclad_rename(function, name, doc, module)
+
+def _ironclad_varargs_function(dispatcher, key, dgt, name, doc, module):
+    def function(*args):
+        return dispatcher.ic_function_varargs(key, dgt, args)
+    return _ironclad_rename(function, name, doc, module)
+
+def _ironclad_varargs_kwargs_function(dispatcher, key, dgt, name, doc, module):
+    def function(*args, **kwargs):
+        return dispatcher.ic_function_kwargs(key, dgt, args, kwargs)
+    return _ironclad_rename(function, name, doc, module)
+
+
+def _ironclad_oldargs_method(dispatcher, key, dgt, name, doc, module):
+    def method(self, *args):
+        if len(args) == 1:
+            return dispatcher.ic_method_objarg(key, dgt, self, args[0])
+        return dispatcher.ic_method_varargs(key, dgt, self, args)
+    return _ironclad_rename(method, name, doc, module)
+
+def _ironclad_noargs_method(dispatcher, key, dgt, name, doc, module):
+    def method(self):
+        return dispatcher.ic_method_noargs(key, dgt, self)
+    return _ironclad_rename(method, name, doc, module)
+
+def _ironclad_objarg_method(dispatcher, key, dgt, name, doc, module):
+    def method(self, arg):
+        return dispatcher.ic_method_objarg(key, dgt, self, arg)
+    return _ironclad_rename(method, name, doc, module)
+
+def _ironclad_varargs_method(dispatcher, key, dgt, name, doc, module):
+    def method(self, *args):
+        return dispatcher.ic_method_varargs(key, dgt, self, args)
+    return _ironclad_rename(method, name, doc, module)
+
+def _ironclad_varargs_kwargs_method(dispatcher, key, dgt, name, doc, module):
+    def method(self, *args, **kwargs):
+        return dispatcher.ic_method_kwargs(key, dgt, self, args, kwargs)
+    return _ironclad_rename(method, name, doc, module)
+
+class _ironclad_lazy_method(object):
+    # stands in for a method in its class's __dict__ until somebody looks the method
+    # up; only then is the real method created, and it replaces this in the class
+    # which defined it
+    __slots__ = ('name', 'binding')
+
+    def __init__(self, name, binding):
+        self.name = name
+        self.binding = binding
+
+    def __get__(self, instance, owner=None):
+        if owner is None:
+            owner = type(instance)
+        method = self.binding.Create()
+        for klass in owner.__mro__:
+            if klass.__dict__.get(self.name) is self:
+                type.__setattr__(klass, self.name, method)
+                break
+        return method.__get__(instance, owner)
+
+
+# magic methods; functype is the name of the dispatcher method to call
+
+def _ironclad_magic_unary(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(_0):
+        return call(key, dgt, _0)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_binary(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(_0, _1):
+        return call(key, dgt, _0, _1)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_binary_swapped(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(_0, _1):
+        return call(key, dgt, _1, _0)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_ternary(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(_0, _1, _2):
+        return call(key, dgt, _0, _1, _2)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_quaternary(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(_0, _1, _2, _3):
+        return call(key, dgt, _0, _1, _2, _3)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_squishkwargs(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(self, *args, **kwargs):
+        return call(key, dgt, self, args, kwargs)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_pow(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(self, other, modulo=None):
+        return call(key, dgt, self, other, modulo)
+    return _ironclad_rename(magic, name, '')
+
+def _ironclad_magic_pow_swapped(dispatcher, functype, key, dgt, name):
+    call = getattr(dispatcher, functype)
+    def magic(self, other):
+        return call(key, dgt, other, self, None)
+    return _ironclad_rename(magic, name, '')
+
+
+def _ironclad_richcmp_methods(dispatcher, key, dgt, attrs):
+    def __lt__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 0)
+    def __le__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 1)
+    def __eq__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 2)
+    def __ne__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 3)
+    def __gt__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 4)
+    def __ge__(self, other):
+        return dispatcher.richcmpfunc(key, dgt, self, other, 5)
+    for method in (__lt__, __le__, __eq__, __ne__, __gt__, __ge__):
+        attrs[method.__name__] = method
+
+
+def _ironclad_getter(dispatcher, key, dgt, closure):
+    def _ironclad_getter(self):
+        return dispatcher.getter(key, dgt, self, closure)
+    return _ironclad_getter
+
+def _ironclad_setter(dispatcher, key, dgt, closure):
+    def _ironclad_setter(self, value):
+        return dispatcher.setter(key, dgt, self, value, closure)
+    return _ironclad_setter
+
+def _ironclad_member_getter(dispatcher, infix, offset):
+    get = getattr(dispatcher, 'get_' + infix)
+    def _ironclad_getter(self):
+        return get(self, offset)
+    return _ironclad_getter
+
+def _ironclad_member_setter(dispatcher, infix, offset):
+    set_ = getattr(dispatcher, 'set_' + infix)
+    def _ironclad_setter(self, value):
+        set_(self, offset, value)
+    return _ironclad_setter
+
+def _ironclad_property(getter, setter, doc):
+    return property(getter, setter, None, doc)
+
+
+def _ironclad_complex_method():
+    def __complex__(self):
+        return complex(float(self.real), float(self.imag))
+    return __complex__
+
+def _ironclad_new_method(dispatcher, key, dgt):
+    if dgt is None:
+        def __new__(cls, *args, **kwargs):
+            return dispatcher.newfunc(key, cls, args, kwargs)
+    else:
+        def __new__(cls, *args, **kwargs):
+            return dispatcher.newfunc(key, dgt, cls, args, kwargs)
+    return __new__
+
+def _ironclad_del_method(name):
+    def __del__(self):
+        self._dispatcher.ic_destroy(name, self)
+    return __del__
+
+def _ironclad_create_class(metaclass, name, bases, attrs, doc, module):
+    klass = metaclass(name, bases, attrs)
+    klass.__doc__ = doc
+    klass.__module__ = module
+    return klass
+
+
+def _ironclad_create_class_stub(metaclass, bases):
+    def __new__(cls, *args, **kwargs):
+        if issubclass(cls, int):
+            return int.__new__(cls, args[0])
+        if issubclass(cls, float):
+            return float.__new__(cls, args[0])
+        if issubclass(cls, str):
+            return str.__new__(cls, args[0])
+        if issubclass(cls, type):
+            return type.__new__(cls, *args, **kwargs)
+        return object.__new__(cls)
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __del__(self):
+        pass
+
+    def __setattr__(self, name, value):
+        # not directly tested: if you can work out how to, be my guest
+        # numpy fromrecords test will overflow stack if this breaks
+        object.__setattr__(self, name, value)
+
+    return metaclass('_ironclad_class_stub', bases, {
+        '__new__': __new__,
+        '__init__': __init__,
+        '__del__': __del__,
+        '__setattr__': __setattr__,
+    })
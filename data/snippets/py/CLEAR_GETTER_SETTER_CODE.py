@@ -1,2 +0,0 @@
-
-_ironclad_getter = _ironclad_setter = None
@@ -1,4 +0,0 @@
-
-def _ironclad_getter(self):
-    return self._dispatcher.get_{2}(self, {1})
-_ironclad_class_attrs['{0}'] = _ironclad_getter
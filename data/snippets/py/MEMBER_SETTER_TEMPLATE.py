@@ -1,4 +0,0 @@
-
-def _ironclad_setter(self, value):
-    self._dispatcher.set_{2}(self, {1}, value)
-_ironclad_class_attrs['{0}'] = _ironclad_setter
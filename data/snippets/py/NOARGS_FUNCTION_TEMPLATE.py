@@ -1,4 +0,0 @@
-
-def {0}():
-    '''{1}'''
-    return _dispatcher.ic_function_noargs('{2}{0}')
@@ -1,5 +0,0 @@
-
-def {0}(self):
-    '''{1}'''
-    return self._dispatcher.ic_method_noargs('{2}{0}', self)
-_ironclad_class_attrs['{0}'] = {0}
@@ -1,4 +0,0 @@
-
-def {0}(arg):
-    '''{1}'''
-    return _dispatcher.ic_function_objarg('{2}{0}', arg)
@@ -1,5 +0,0 @@
-
-def {0}(self, arg):
-    '''{1}'''
-    return self._dispatcher.ic_method_objarg('{2}{0}', self, arg)
-_ironclad_class_attrs['{0}'] = {0}
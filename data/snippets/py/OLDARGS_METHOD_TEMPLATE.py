@@ -1,7 +0,0 @@
-
-def {0}(self, *args):
-    '''{1}'''
-    if len(args) == 1:
-        return self._dispatcher.ic_method_objarg('{2}{0}', self, args[0])
-    return self._dispatcher.ic_method_varargs('{2}{0}', self, args)
-_ironclad_class_attrs['{0}'] = {0}
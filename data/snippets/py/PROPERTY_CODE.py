@@ -1,2 +0,0 @@
-
-_ironclad_class_attrs['{0}'] = property(_ironclad_getter, _ironclad_setter, None, '''{1}''')
@@ -1,4 +0,0 @@
-
-def {0}(*args):
-    '''{1}'''
-    return _dispatcher.ic_function_varargs('{2}{0}', args)
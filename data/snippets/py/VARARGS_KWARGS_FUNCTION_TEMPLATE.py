@@ -1,4 +0,0 @@
-
-def {0}(*args, **kwargs):
-    '''{1}'''
-    return _dispatcher.ic_function_kwargs('{2}{0}', args, kwargs)
@@ -1,5 +0,0 @@
-
-def {0}(self, *args):
-    '''{1}'''
-    return self._dispatcher.ic_method_varargs('{2}{0}', self, args)
-_ironclad_class_attrs['{0}'] = {0}
@@ -0,0 +1,294 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+
+namespace Ironclad
+{
+    internal class ArenaPool
+    {
+        // a POOL_SIZE chunk of an arena, carved into blocks of a single size class
+        public IntPtr start;
+        public int sizeClass = -1;
+        public int blockSize;
+        public int capacity;
+        public int used;
+        public int bumpIndex;
+        public IntPtr freeList;
+        public uint[] allocated;
+        public bool available;
+    }
+
+    public class ArenaAllocator : IAllocator
+    {
+        // Much like CPython's pymalloc: requests of up to SMALL_MAX bytes are rounded up
+        // to a multiple of ALIGNMENT and served from pools dedicated to that size class;
+        // pools live in big arenas from AllocHGlobal, and freed blocks go on a free list
+        // threaded through the blocks themselves. Anything bigger goes straight to
+        // AllocHGlobal.
+        public const int ALIGNMENT = 8;
+        public const int SMALL_MAX = 512;
+        public const int POOL_BITS = 12;
+        public const int POOL_SIZE = 1 << POOL_BITS;
+        public const int POOLS_PER_ARENA = 64;
+
+        private const int SIZE_CLASSES = SMALL_MAX / ALIGNMENT;
+
+        private List<IntPtr> arenas = new List<IntPtr>();
+        private Dictionary<long, ArenaPool> pools = new Dictionary<long, ArenaPool>();
+        private Stack<ArenaPool> emptyPools = new Stack<ArenaPool>();
+        private List<ArenaPool>[] usablePools = new List<ArenaPool>[SIZE_CLASSES];
+        private Dictionary<IntPtr, uint> largeBlocks = new Dictionary<IntPtr, uint>();
+        private MemoryPressure pressure = new MemoryPressure();
+
+        public ArenaAllocator()
+        {
+            for (int i = 0; i < SIZE_CLASSES; i++)
+            {
+                this.usablePools[i] = new List<ArenaPool>();
+            }
+        }
+
+        public int
+        ArenaCount
+        {
+            get { return this.arenas.Count; }
+        }
+
+        public MemoryPressure
+        Pressure
+        {
+            get { return this.pressure; }
+        }
+
+        public virtual IntPtr
+        Alloc(uint bytes)
+        {
+            if (bytes > SMALL_MAX)
+            {
+                IntPtr ptr = Marshal.AllocHGlobal((IntPtr)bytes);
+                this.largeBlocks[ptr] = bytes;
+                this.pressure.Add(bytes);
+                return ptr;
+            }
+            return this.AllocSmall(bytes == 0 ? 0 : (int)(bytes - 1) / ALIGNMENT);
+        }
+
+        public virtual IntPtr
+        Realloc(IntPtr oldptr, uint bytes)
+        {
+            if (oldptr == IntPtr.Zero)
+            {
+                return this.Alloc(bytes);
+            }
+
+            uint oldSize;
+            if (this.largeBlocks.TryGetValue(oldptr, out oldSize))
+            {
+                if (bytes > SMALL_MAX)
+                {
+                    IntPtr newptr = Marshal.ReAllocHGlobal(oldptr, (IntPtr)bytes);
+                    this.largeBlocks.Remove(oldptr);
+                    this.largeBlocks[newptr] = bytes;
+                    this.pressure.Add((long)bytes - oldSize);
+                    return newptr;
+                }
+            }
+            else
+            {
+                ArenaPool pool = this.GetPool(oldptr, "Realloc");
+                oldSize = (uint)pool.blockSize;
+                if (bytes <= oldSize && bytes > oldSize - ALIGNMENT)
+                {
+                    return oldptr;
+                }
+            }
+
+            IntPtr result = this.Alloc(bytes);
+            Unmanaged.memcpy(result, oldptr, Math.Min(oldSize, bytes));
+            this.Free(oldptr);
+            return result;
+        }
+
+        public virtual bool
+        Contains(IntPtr ptr)
+        {
+            ArenaPool pool;
+            if (this.pools.TryGetValue(ptr.ToInt64() >> POOL_BITS, out pool))
+            {
+                int index;
+                return this.TryGetBlockIndex(pool, ptr, out index) && IsAllocated(pool, index);
+            }
+            return this.largeBlocks.ContainsKey(ptr);
+        }
+
+        public virtual void
+        Free(IntPtr ptr)
+        {
+            uint size;
+            if (this.largeBlocks.TryGetValue(ptr, out size))
+            {
+                this.largeBlocks.Remove(ptr);
+                Marshal.FreeHGlobal(ptr);
+                this.pressure.Remove(size);
+                return;
+            }
+
+            ArenaPool pool = this.GetPool(ptr, "Free");
+            int index;
+            this.TryGetBlockIndex(pool, ptr, out index);
+            pool.allocated[index >> 5] &= ~(1u << (index & 31));
+            CPyMarshal.WritePtr(ptr, pool.freeList);
+            pool.freeList = ptr;
+            pool.used -= 1;
+
+            if (pool.used == 0)
+            {
+                // give the whole pool back, so any size class can use it
+                this.usablePools[pool.sizeClass].Remove(pool);
+                pool.sizeClass = -1;
+                pool.available = false;
+                this.emptyPools.Push(pool);
+            }
+            else if (!pool.available)
+            {
+                pool.available = true;
+                this.usablePools[pool.sizeClass].Add(pool);
+            }
+        }
+
+        public virtual void
+        FreeAll()
+        {
+            foreach (IntPtr arena in this.arenas)
+            {
+                Marshal.FreeHGlobal(arena);
+            }
+            foreach (IntPtr ptr in this.largeBlocks.Keys)
+            {
+                Marshal.FreeHGlobal(ptr);
+            }
+            this.arenas.Clear();
+            this.pools.Clear();
+            this.emptyPools.Clear();
+            this.largeBlocks.Clear();
+            foreach (List<ArenaPool> usable in this.usablePools)
+            {
+                usable.Clear();
+            }
+            this.pressure.Reset();
+        }
+
+        private IntPtr
+        AllocSmall(int sizeClass)
+        {
+            List<ArenaPool> usable = this.usablePools[sizeClass];
+            ArenaPool pool;
+            if (usable.Count > 0)
+            {
+                pool = usable[usable.Count - 1];
+            }
+            else
+            {
+                pool = this.NewPool(sizeClass);
+                usable.Add(pool);
+            }
+
+            IntPtr ptr;
+            int index;
+            if (pool.freeList != IntPtr.Zero)
+            {
+                ptr = pool.freeList;
+                pool.freeList = CPyMarshal.ReadPtr(ptr);
+                this.TryGetBlockIndex(pool, ptr, out index);
+            }
+            else
+            {
+                index = pool.bumpIndex++;
+                ptr = CPyMarshal.Offset(pool.start, index * pool.blockSize);
+            }
+            pool.allocated[index >> 5] |= 1u << (index & 31);
+            pool.used += 1;
+
+            if (pool.used == pool.capacity)
+            {
+                pool.available = false;
+                usable.RemoveAt(usable.Count - 1);
+            }
+            return ptr;
+        }
+
+        private ArenaPool
+        NewPool(int sizeClass)
+        {
+            if (this.emptyPools.Count == 0)
+            {
+                this.NewArena();
+            }
+            ArenaPool pool = this.emptyPools.Pop();
+            pool.sizeClass = sizeClass;
+            pool.blockSize = (sizeClass + 1) * ALIGNMENT;
+            pool.capacity = POOL_SIZE / pool.blockSize;
+            pool.used = 0;
+            pool.bumpIndex = 0;
+            pool.freeList = IntPtr.Zero;
+            pool.available = true;
+            Array.Clear(pool.allocated, 0, pool.allocated.Length);
+            return pool;
+        }
+
+        private void
+        NewArena()
+        {
+            // over-allocate so that every pool can be POOL_SIZE-aligned, which lets us
+            // find a block's pool from its address alone
+            IntPtr arena = Marshal.AllocHGlobal((POOLS_PER_ARENA + 1) * POOL_SIZE);
+            this.arenas.Add(arena);
+            this.pressure.Add((POOLS_PER_ARENA + 1) * POOL_SIZE);
+            long first = (arena.ToInt64() + POOL_SIZE - 1) >> POOL_BITS;
+            for (int i = POOLS_PER_ARENA - 1; i >= 0; i--)
+            {
+                ArenaPool pool = new ArenaPool();
+                pool.start = new IntPtr((first + i) << POOL_BITS);
+                pool.allocated = new uint[POOL_SIZE / ALIGNMENT / 32];
+                this.pools[first + i] = pool;
+                this.emptyPools.Push(pool);
+            }
+        }
+
+        private ArenaPool
+        GetPool(IntPtr ptr, string caller)
+        {
+            ArenaPool pool;
+            int index;
+            if (!this.pools.TryGetValue(ptr.ToInt64() >> POOL_BITS, out pool) ||
+                !this.TryGetBlockIndex(pool, ptr, out index) || !IsAllocated(pool, index))
+            {
+                throw new KeyNotFoundException(String.Format("{0}: {1} was not allocated by this allocator", caller, ptr.ToString("x")));
+            }
+            return pool;
+        }
+
+        private bool
+        TryGetBlockIndex(ArenaPool pool, IntPtr ptr, out int index)
+        {
+            index = -1;
+            if (pool.sizeClass == -1)
+            {
+                return false;
+            }
+            int offset = (int)(ptr.ToInt64() - pool.start.ToInt64());
+            if (offset % pool.blockSize != 0)
+            {
+                return false;
+            }
+            index = offset / pool.blockSize;
+            return index < pool.bumpIndex;
+        }
+
+        private static bool
+        IsAllocated(ArenaPool pool, int index)
+        {
+            return (pool.allocated[index >> 5] & (1u << (index & 31))) != 0;
+        }
+    }
+}
@@ -1,8 +1,8 @@
 using System;
-using System.Text;
 using System.Runtime.InteropServices;
 
 using IronPython.Runtime;
+using IronPython.Runtime.Operations;
 
 using Ironclad.Structs;
 
@@ -11,15 +11,15 @@ namespace Ironclad
     internal static class CallableBuilder
     {
         public static void
-        GenerateFunctions(StringBuilder code, IntPtr methods, PythonDictionary methodTable)
+        GenerateFunctions(PythonDictionary target, IntPtr methods, Dispatcher dispatcher, PythonDictionary binders, string module)
         {
             GenerateCallablesFromMethodDefs(
-                code, methods, methodTable, "",
-                CodeSnippets.OLDARGS_FUNCTION_TEMPLATE,
-                CodeSnippets.NOARGS_FUNCTION_TEMPLATE,
-                CodeSnippets.OBJARG_FUNCTION_TEMPLATE,
-                CodeSnippets.VARARGS_FUNCTION_TEMPLATE,
-                CodeSnippets.VARARGS_KWARGS_FUNCTION_TEMPLATE);
+                target, methods, dispatcher, binders, "", module, false,
+                "_ironclad_oldargs_function",
+                "_ironclad_noargs_function",
+                "_ironclad_objarg_function",
+                "_ironclad_varargs_function",
+                "_ironclad_varargs_kwargs_function");
         }
 
         public static void
@@ -45,27 +45,30 @@ namespace Ironclad
         }
 
         public static void
-        GenerateMethods(StringBuilder code, IntPtr methods, PythonDictionary methodTable, string tablePrefix)
+        GenerateMethods(PythonDictionary target, IntPtr methods, Dispatcher dispatcher, PythonDictionary binders, string tablePrefix)
         {
             GenerateCallablesFromMethodDefs(
-                code, methods, methodTable, tablePrefix,
-                CodeSnippets.OLDARGS_METHOD_TEMPLATE,
-                CodeSnippets.NOARGS_METHOD_TEMPLATE,
-                CodeSnippets.OBJARG_METHOD_TEMPLATE,
-                CodeSnippets.VARARGS_METHOD_TEMPLATE,
-                CodeSnippets.VARARGS_KWARGS_METHOD_TEMPLATE);
+                target, methods, dispatcher, binders, tablePrefix, null, true,
+                "_ironclad_oldargs_method",
+                "_ironclad_noargs_method",
+                "_ironclad_objarg_method",
+                "_ironclad_varargs_method",
+                "_ironclad_varargs_kwargs_method");
         }
 
         public static void
-        GenerateCallablesFromMethodDefs(StringBuilder code,
+        GenerateCallablesFromMethodDefs(PythonDictionary target,
                         IntPtr methods,
-                        PythonDictionary methodTable,
+                        Dispatcher dispatcher,
+                        PythonDictionary binders,
                         string tablePrefix,
-                        string oldargsTemplate,
-                        string noargsTemplate,
-                        string objargTemplate,
-                        string varargsTemplate,
-                        string varargsKwargsTemplate)
+                        string module,
+                        bool lazy,
+                        string oldargsBinder,
+                        string noargsBinder,
+                        string objargBinder,
+                        string varargsBinder,
+                        string varargsKwargsBinder)
         {
             IntPtr methodPtr = methods;
             if (methodPtr == IntPtr.Zero)
@@ -78,8 +81,8 @@ namespace Ironclad
                 PyMethodDef thisMethod = (PyMethodDef)Marshal.PtrToStructure(
                     methodPtr, typeof(PyMethodDef));
                 string name = thisMethod.ml_name;
-                string template = null;
-                Delegate dgt = null;
+                string binder = null;
+                Type dgtType = null;
 
                 // COEXIST flag ignored; which method is chosen depends on order of calls in ClassBuilder.
                 bool unsupportedFlags = false;
@@ -87,39 +90,29 @@ namespace Ironclad
                 switch (flags)
                 {
                     case METH.OLDARGS:
-                        template = oldargsTemplate;
-                        dgt = Marshal.GetDelegateForFunctionPointer(
-                            thisMethod.ml_meth,
-                            typeof(dgt_ptr_ptrptr));
+                        binder = oldargsBinder;
+                        dgtType = typeof(dgt_ptr_ptrptr);
                         break;
 
                     case METH.NOARGS:
-                        template = noargsTemplate;
-                        dgt = Marshal.GetDelegateForFunctionPointer(
-                            thisMethod.ml_meth,
-                            typeof(dgt_ptr_ptrptr));
+                        binder = noargsBinder;
+                        dgtType = typeof(dgt_ptr_ptrptr);
                         break;
 
                     case METH.O:
-                        template = objargTemplate;
-                        dgt = Marshal.GetDelegateForFunctionPointer(
-                            thisMethod.ml_meth,
-                            typeof(dgt_ptr_ptrptr));
+                        binder = objargBinder;
+                        dgtType = typeof(dgt_ptr_ptrptr);
                         break;
 
                     case METH.VARARGS:
-                        template = varargsTemplate;
-                        dgt = Marshal.GetDelegateForFunctionPointer(
-                            thisMethod.ml_meth,
-                            typeof(dgt_ptr_ptrptr));
+                        binder = varargsBinder;
+                        dgtType = typeof(dgt_ptr_ptrptr);
                         break;
 
                     case METH.KEYWORDS:
                     case METH.VARARGS | METH.KEYWORDS:
-                        template = varargsKwargsTemplate;
-                        dgt = Marshal.GetDelegateForFunctionPointer(
-                            thisMethod.ml_meth,
-                            typeof(dgt_ptr_ptrptrptr));
+                        binder = varargsKwargsBinder;
+                        dgtType = typeof(dgt_ptr_ptrptrptr);
                         break;
 
                     default:
@@ -129,9 +122,19 @@ namespace Ironclad
 
                 if (!unsupportedFlags)
                 {
-                    code.Append(String.Format(template,
-                        name, thisMethod.ml_doc, tablePrefix));
-                    methodTable[tablePrefix + name] = dgt;
+                    CallableBinding binding = new CallableBinding(
+                        dispatcher, binders[binder], tablePrefix + name, thisMethod.ml_meth, dgtType,
+                        name, thisMethod.ml_doc ?? "", module);
+                    // special methods are looked up by IronPython in ways a descriptor can't
+                    // intercept, so they're always created up front
+                    if (lazy && !(name.StartsWith("__") && name.EndsWith("__")))
+                    {
+                        target[name] = PythonCalls.Call(binders["_ironclad_lazy_method"], name, binding);
+                    }
+                    else
+                    {
+                        target[name] = binding.Create();
+                    }
                 }
                 else
                 {
@@ -143,4 +146,39 @@ namespace Ironclad
             }
         }
     }
-}
\ No newline at end of file
+
+    public class CallableBinding
+    {
+        // Everything needed to wrap one PyMethodDef; nothing is marshalled until
+        // Create is called, which for methods is the first time they're looked up.
+        private Dispatcher dispatcher;
+        private object binder;
+        private string key;
+        private IntPtr meth;
+        private Type dgtType;
+        private string name;
+        private string doc;
+        private string module;
+
+        public CallableBinding(Dispatcher dispatcher, object binder, string key, IntPtr meth, Type dgtType,
+                               string name, string doc, string module)
+        {
+            this.dispatcher = dispatcher;
+            this.binder = binder;
+            this.key = key;
+            this.meth = meth;
+            this.dgtType = dgtType;
+            this.name = name;
+            this.doc = doc;
+            this.module = module;
+        }
+
+        public object
+        Create()
+        {
+            Delegate dgt = Marshal.GetDelegateForFunctionPointer(this.meth, this.dgtType);
+            this.dispatcher.table[this.key] = dgt;
+            return PythonCalls.Call(this.binder, this.dispatcher, this.key, dgt, this.name, this.doc, this.module);
+        }
+    }
+}
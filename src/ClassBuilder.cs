@@ -1,8 +1,8 @@
 using System;
-using System.Text;
 using System.Runtime.InteropServices;
 
 using IronPython.Runtime;
+using IronPython.Runtime.Operations;
 
 using Ironclad.Structs;
 
@@ -10,15 +10,21 @@ namespace Ironclad
 {
     internal class ClassBuilder
     {
-        public StringBuilder code = new StringBuilder();
-        public PythonDictionary methodTable = new PythonDictionary();
+        // Builds the attributes of a class from a PyTypeObject, by calling the binders in
+        // CALLABLE_BINDERS_CODE; nothing is compiled per type.
+        public PythonDictionary attrs = new PythonDictionary();
+        public PythonDictionary methodTable = null;
 
         public IntPtr ptr = IntPtr.Zero;
         public string tablePrefix = null;
         public string __name__ = null;
         public string __module__ = null;
+        public string __doc__ = null;
         public string tp_name = null;
 
+        private Dispatcher dispatcher;
+        private PythonDictionary binders;
+
         private readonly string[] EASY_TYPE_FIELDS = new string[] { 
             "tp_init", "tp_call", "tp_repr", "tp_str", "tp_compare", "tp_hash", 
             "tp_getattr", "tp_iter", "tp_iternext"
@@ -42,12 +48,28 @@ namespace Ironclad
             "nb_power", "nb_inplace_power",
         };
 
-        public ClassBuilder(IntPtr typePtr)
+        public ClassBuilder(IntPtr typePtr, Dispatcher dispatcher, PythonDictionary binders)
         {
             this.ptr = typePtr;
+            this.dispatcher = dispatcher;
+            this.methodTable = dispatcher.table;
+            this.binders = binders;
             this.Build();
         }
 
+        public object
+        CreateClass(object metaclass, PythonTuple bases)
+        {
+            return this.Bind("_ironclad_create_class",
+                metaclass, this.__name__, bases, this.attrs, this.__doc__, this.__module__);
+        }
+
+        private object
+        Bind(string binder, params object[] args)
+        {
+            return PythonCalls.Call(this.binders[binder], args);
+        }
+
         private void
         Build()
         {
@@ -58,8 +80,6 @@ namespace Ironclad
             this.GenerateMagicMethods(); // } This order of calls effectively treats all methods as having the
             this.GenerateMethods();      // } COEXIST flag set; swap would be equivalent to it never being set.
             this.GenerateClass();
-            
-            this.code.Append(CodeSnippets.CLASS_STUB_CODE);
         }
 
         private void
@@ -68,21 +88,22 @@ namespace Ironclad
             this.tp_name = CPyMarshal.ReadCStringField(this.ptr, typeof(PyTypeObject), "tp_name");
             CallableBuilder.ExtractNameModule(this.tp_name, ref this.__name__, ref this.__module__);
             this.tablePrefix = this.__name__ + ".";
-            this.code.Append("_ironclad_class_attrs = dict()");
+            this.__doc__ = CPyMarshal.ReadCStringField(this.ptr, typeof(PyTypeObject), "tp_doc");
         }
 
         private void
         GenerateClass()
         {
-            string __doc__ = CPyMarshal.ReadCStringField(this.ptr, typeof(PyTypeObject), "tp_doc").Replace("\\", "\\\\");
-            this.code.Append(String.Format(CodeSnippets.CLASS_TEMPLATE, this.__name__, this.__module__, __doc__));
-            this.ConnectTypeField("tp_new", typeof(dgt_ptr_ptrptrptr));
+            string key = this.tablePrefix + "tp_new";
+            this.attrs["__new__"] = this.Bind("_ironclad_new_method",
+                this.dispatcher, key, this.ConnectTypeField("tp_new", typeof(dgt_ptr_ptrptrptr)));
+            this.attrs["__del__"] = this.Bind("_ironclad_del_method", this.__name__);
         }
 
         private void
         GenerateProperties()
         {
-            IntPtr getsetPtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), "tp_getset");
+            IntPtr getsetPtr = PyTypeObjectFields.ReadGetset(this.ptr);
             if (getsetPtr == IntPtr.Zero)
             {
                 return;
@@ -98,7 +119,7 @@ namespace Ironclad
         private void
         GenerateMembers()
         {
-            IntPtr memberPtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), "tp_members");
+            IntPtr memberPtr = PyTypeObjectFields.ReadMembers(this.ptr);
             if (memberPtr == IntPtr.Zero)
             {
                 return;
@@ -114,8 +135,8 @@ namespace Ironclad
         private void
         GenerateMethods()
         {
-            IntPtr methodsPtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), "tp_methods");
-            CallableBuilder.GenerateMethods(this.code, methodsPtr, this.methodTable, this.tablePrefix);
+            IntPtr methodsPtr = PyTypeObjectFields.ReadMethods(this.ptr);
+            CallableBuilder.GenerateMethods(this.attrs, methodsPtr, this.dispatcher, this.binders, this.tablePrefix);
         }
 
         private void
@@ -132,34 +153,33 @@ namespace Ironclad
         private void
         GenerateProperty(IntPtr getsetPtr)
         {
-            string getname = "None";
-            string setname = "None";
-            this.code.Append(CodeSnippets.CLEAR_GETTER_SETTER_CODE);
+            object getter = null;
+            object setter = null;
             PyGetSetDef getset = (PyGetSetDef)Marshal.PtrToStructure(getsetPtr, typeof(PyGetSetDef));
         
             if (getset.get != IntPtr.Zero)
             {
-                getname = String.Format("__get_{0}", getset.name);
-                this.code.Append(String.Format(CodeSnippets.GETTER_METHOD_TEMPLATE, getname, this.tablePrefix, getset.closure));
-
+                string getname = String.Format("__get_{0}", getset.name);
                 dgt_ptr_ptrptr dgt = (dgt_ptr_ptrptr)
                     Marshal.GetDelegateForFunctionPointer(
                         getset.get, typeof(dgt_ptr_ptrptr));
                 this.methodTable[this.tablePrefix + getname] = dgt;
+                getter = this.Bind("_ironclad_getter", this.dispatcher, this.tablePrefix + getname, dgt, getset.closure);
+                this.attrs[getname] = getter;
             }
 
             if (getset.set != IntPtr.Zero)
             {
-                setname = String.Format("__set_{0}", getset.name);
-                this.code.Append(String.Format(CodeSnippets.SETTER_METHOD_TEMPLATE, setname, this.tablePrefix, getset.closure));
-
+                string setname = String.Format("__set_{0}", getset.name);
                 dgt_int_ptrptrptr dgt = (dgt_int_ptrptrptr)
                     Marshal.GetDelegateForFunctionPointer(
                         getset.set, typeof(dgt_int_ptrptrptr));
                 this.methodTable[this.tablePrefix + setname] = dgt;
+                setter = this.Bind("_ironclad_setter", this.dispatcher, this.tablePrefix + setname, dgt, getset.closure);
+                this.attrs[setname] = setter;
             }
 
-            this.code.Append(String.Format(CodeSnippets.PROPERTY_CODE, getset.name, getset.doc));
+            this.attrs[getset.name] = this.Bind("_ironclad_property", getter, setter, getset.doc ?? "");
         }
 
         private static bool
@@ -205,21 +225,21 @@ namespace Ironclad
             PyMemberDef member = (PyMemberDef)Marshal.PtrToStructure(
                 memberPtr, typeof(PyMemberDef));
 
-            this.code.Append(CodeSnippets.CLEAR_GETTER_SETTER_CODE);
-
             string infix = null;
             if (TryGetMemberMethodInfix((MemberT)member.type, ref infix))
             {
                 string getname = String.Format("__get_{0}", member.name);
-                this.code.Append(String.Format(CodeSnippets.MEMBER_GETTER_TEMPLATE, getname, member.offset, infix));
+                object getter = this.Bind("_ironclad_member_getter", this.dispatcher, infix, member.offset);
+                this.attrs[getname] = getter;
 
-                string setname = "None";
+                object setter = null;
                 if ((member.flags & 1) == 0 && (MemberT)member.type != MemberT.STRING)
                 {
-                    setname = String.Format("__set_{0}", member.name);
-                    this.code.Append(String.Format(CodeSnippets.MEMBER_SETTER_TEMPLATE, setname, member.offset, infix));
+                    string setname = String.Format("__set_{0}", member.name);
+                    setter = this.Bind("_ironclad_member_setter", this.dispatcher, infix, member.offset);
+                    this.attrs[setname] = setter;
                 }
-                this.code.Append(String.Format(CodeSnippets.PROPERTY_CODE, member.name, member.doc));
+                this.attrs[member.name] = this.Bind("_ironclad_property", getter, setter, member.doc ?? "");
             }
             else
             {
@@ -247,30 +267,38 @@ namespace Ironclad
                 if (CPyMarshal.ReadPtrField(protocolPtr, protocol, field) != IntPtr.Zero)
                 {
                     string name;
-                    string template;
+                    string functype;
+                    string binder;
                     Type dgtType;
                     bool needGetSwappedInfo;
-                    MagicMethods.GetInfo(field, out name, out template, out dgtType, out needGetSwappedInfo);
-                    this.methodTable[this.tablePrefix + name] = CPyMarshal.ReadFunctionPtrField(protocolPtr, protocol, field, dgtType);
-                    this.code.Append(String.Format(template, name, "", this.tablePrefix));
+                    MagicMethods.GetInfo(field, out name, out functype, out binder, out dgtType, out needGetSwappedInfo);
+                    this.GenerateMagicMethod(protocolPtr, protocol, field, name, functype, binder, dgtType);
 
                     if (needGetSwappedInfo)
                     {
-                        MagicMethods.GetSwappedInfo(field, out name, out template, out dgtType);
-                        this.methodTable[this.tablePrefix + name] = CPyMarshal.ReadFunctionPtrField(protocolPtr, protocol, field, dgtType); ;
-                        this.code.Append(String.Format(template, name, "", this.tablePrefix));
+                        MagicMethods.GetSwappedInfo(field, out name, out functype, out binder, out dgtType);
+                        this.GenerateMagicMethod(protocolPtr, protocol, field, name, functype, binder, dgtType);
                     }
                 }
             }
         }
 
+        private void
+        GenerateMagicMethod(IntPtr protocolPtr, Type protocol, string field, string name, string functype, string binder, Type dgtType)
+        {
+            string key = this.tablePrefix + name;
+            Delegate dgt = CPyMarshal.ReadFunctionPtrField(protocolPtr, protocol, field, dgtType);
+            this.methodTable[key] = dgt;
+            this.attrs[name] = this.Bind(binder, this.dispatcher, functype, key, dgt, name);
+        }
+
         private void
         GenerateRichcmpMethods()
         {
-            if (CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), "tp_richcompare") != IntPtr.Zero)
+            if (PyTypeObjectFields.ReadRichcompare(this.ptr) != IntPtr.Zero)
             {
-                this.code.Append(String.Format(CodeSnippets.RICHCMP_METHOD_TEMPLATE, tablePrefix));
-                this.ConnectTypeField("tp_richcompare", typeof(dgt_ptr_ptrptrint));
+                Delegate dgt = this.ConnectTypeField("tp_richcompare", typeof(dgt_ptr_ptrptrint));
+                this.Bind("_ironclad_richcmp_methods", this.dispatcher, this.tablePrefix + "tp_richcompare", dgt, this.attrs);
             }
         }
         
@@ -281,19 +309,21 @@ namespace Ironclad
             if (this.methodTable.has_key(this.tablePrefix + "__get_real") &&
                 this.methodTable.has_key(this.tablePrefix + "__get_imag"))
             {
-                this.code.Append(CodeSnippets.COMPLEX_HACK_CODE);
+                this.attrs["__complex__"] = this.Bind("_ironclad_complex_method");
             }
         }
 
 
-        private void
+        private Delegate
         ConnectTypeField(string fieldName, Type dgtType)
         {
-            if (CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), fieldName) != IntPtr.Zero)
+            if (CPyMarshal.ReadPtrField(this.ptr, typeof(PyTypeObject), fieldName) == IntPtr.Zero)
             {
-                Delegate dgt = CPyMarshal.ReadFunctionPtrField(this.ptr, typeof(PyTypeObject), fieldName, dgtType);
-                this.methodTable[this.tablePrefix + fieldName] = dgt;
+                return null;
             }
+            Delegate dgt = CPyMarshal.ReadFunctionPtrField(this.ptr, typeof(PyTypeObject), fieldName, dgtType);
+            this.methodTable[this.tablePrefix + fieldName] = dgt;
+            return dgt;
         }
     }
 }
@@ -0,0 +1,46 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+
+namespace Ironclad
+{
+    public class DelegateCache
+    {
+        // Marshal.GetDelegateForFunctionPointer builds a new marshalling stub on every
+        // call, which is far too slow for things like tp_dealloc and tp_free; function
+        // pointers don't move, so we only need to build one delegate per ptr and type.
+        private Dictionary<KeyValuePair<IntPtr, Type>, Delegate> delegates = 
+            new Dictionary<KeyValuePair<IntPtr, Type>, Delegate>();
+
+        public int
+        Count
+        {
+            get { return this.delegates.Count; }
+        }
+
+        public Delegate
+        Get(IntPtr funcPtr, Type dgtType)
+        {
+            KeyValuePair<IntPtr, Type> key = new KeyValuePair<IntPtr, Type>(funcPtr, dgtType);
+            lock (this)
+            {
+                Delegate dgt;
+                if (!this.delegates.TryGetValue(key, out dgt))
+                {
+                    dgt = Marshal.GetDelegateForFunctionPointer(funcPtr, dgtType);
+                    this.delegates[key] = dgt;
+                }
+                return dgt;
+            }
+        }
+
+        public void
+        Clear()
+        {
+            lock (this)
+            {
+                this.delegates.Clear();
+            }
+        }
+    }
+}
@@ -109,14 +109,13 @@ namespace Ironclad
                 {
                     Console.WriteLine("unexpected refcount {0} when deleting object id {1} at {2}", refcnt, Builtin.id(arg0), ptr0.ToString("x"));
                 }
+                this.mapper.ForgetInstance(arg0);
                 this.mapper.DecRef(ptr0);
                 this.mapper.DecRef(ptr0);
                 this.mapper.Unmap(ptr0);
-                PythonExceptions.BaseException error = (PythonExceptions.BaseException)this.mapper.LastException;
-                if (error != null)
+                if (this.mapper.ErrorOccurred)
                 {
-                    this.mapper.LastException = null;
-                    throw error.clsException;
+                    throw this.mapper.TakeException();
                 }
             }
             catch (Exception e)
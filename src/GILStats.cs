@@ -0,0 +1,107 @@
+using System;
+using System.Diagnostics;
+
+namespace Ironclad
+{
+    public class GILStats
+    {
+        // One per thread which has taken the GIL; only ever updated by its own thread,
+        // while that thread holds the GIL. Times are kept in Stopwatch ticks, and the
+        // histograms count waits and holds by duration: bucket 0 is under 1us, bucket
+        // n is [2**(n-1), 2**n) us, and the last bucket catches everything longer.
+        public const int HISTOGRAM_BUCKETS = 32;
+
+        private int threadId;
+        private string threadName;
+        private long acquisitions = 0;
+        private long saveThreadReleases = 0;
+        private long totalWaitTicks = 0;
+        private long maxWaitTicks = 0;
+        private long totalHoldTicks = 0;
+        private long maxHoldTicks = 0;
+        private long holdStart = 0;
+        private long[] waitHistogram = new long[HISTOGRAM_BUCKETS];
+        private long[] holdHistogram = new long[HISTOGRAM_BUCKETS];
+
+        public GILStats(int threadId, string threadName)
+        {
+            this.threadId = threadId;
+            this.threadName = threadName;
+        }
+
+        public int ThreadId { get { return this.threadId; } }
+        public string ThreadName { get { return this.threadName; } }
+        public long Acquisitions { get { return this.acquisitions; } }
+        public long SaveThreadReleases { get { return this.saveThreadReleases; } }
+        public double TotalWait { get { return TicksToSeconds(this.totalWaitTicks); } }
+        public double MaxWait { get { return TicksToSeconds(this.maxWaitTicks); } }
+        public double TotalHold { get { return TicksToSeconds(this.totalHoldTicks); } }
+        public double MaxHold { get { return TicksToSeconds(this.maxHoldTicks); } }
+        public long[] WaitHistogram { get { return (long[])this.waitHistogram.Clone(); } }
+        public long[] HoldHistogram { get { return (long[])this.holdHistogram.Clone(); } }
+
+        public void
+        RecordAcquire(long waitStart, long now)
+        {
+            long waited = now - waitStart;
+            this.acquisitions += 1;
+            this.totalWaitTicks += waited;
+            this.maxWaitTicks = Math.Max(this.maxWaitTicks, waited);
+            this.waitHistogram[Bucket(waited)] += 1;
+            this.holdStart = now;
+        }
+
+        public void
+        RecordRelease(long now)
+        {
+            if (this.holdStart == 0)
+            {
+                // we weren't recording when the GIL was acquired
+                return;
+            }
+            long held = now - this.holdStart;
+            this.totalHoldTicks += held;
+            this.maxHoldTicks = Math.Max(this.maxHoldTicks, held);
+            this.holdHistogram[Bucket(held)] += 1;
+            this.holdStart = 0;
+        }
+
+        public void
+        RecordSaveThread()
+        {
+            this.saveThreadReleases += 1;
+        }
+
+        public void
+        Reset()
+        {
+            this.acquisitions = 0;
+            this.saveThreadReleases = 0;
+            this.totalWaitTicks = 0;
+            this.maxWaitTicks = 0;
+            this.totalHoldTicks = 0;
+            this.maxHoldTicks = 0;
+            Array.Clear(this.waitHistogram, 0, HISTOGRAM_BUCKETS);
+            Array.Clear(this.holdHistogram, 0, HISTOGRAM_BUCKETS);
+        }
+
+        public static double
+        TicksToSeconds(long ticks)
+        {
+            return (double)ticks / Stopwatch.Frequency;
+        }
+
+        public static int
+        Bucket(long ticks)
+        {
+            long micros = ticks * 1000000 / Stopwatch.Frequency;
+            int bucket = 0;
+            while (micros > 0 && bucket < HISTOGRAM_BUCKETS - 1)
+            {
+                micros >>= 1;
+                bucket += 1;
+            }
+            return bucket;
+        }
+    }
+}
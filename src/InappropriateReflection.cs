@@ -31,11 +31,13 @@ namespace Ironclad
             return (PythonType)_typeField.GetValue(proxy);
         }
         
+        // errors get set all the time, so don't look this up every time
+        private static MethodInfo _toPythonMethod = typeof(PythonExceptions).GetMethod(
+            "ToPython", BindingFlags.NonPublic | BindingFlags.Static);
+
         public static object
         GetPythonException(System.Exception clrException)
         {
-            MethodInfo _toPythonMethod = typeof(PythonExceptions).GetMethod(
-                "ToPython", BindingFlags.NonPublic | BindingFlags.Static);
             try
             {
                 return _toPythonMethod.Invoke(null, new object[] { clrException });
@@ -21,57 +21,330 @@ namespace Ironclad
     
     public delegate void PtrFunc(IntPtr ptr);
     
+    internal struct MapEntry
+    {
+        // simple mappings: obj always set, wref null
+        // bridge mappings: wref always set, obj set only while strongly reffed
+        public IntPtr ptr;
+        public long id;
+        public object obj;
+        public WeakReference wref;
+        public bool dirty;
+        public bool owned; // true while idIndex points at this entry
+    }
+
     public class InterestingPtrMap
     {
-        private Dictionary<IntPtr, long> ptr2id = new Dictionary<IntPtr, long>();
-        private Dictionary<long, IntPtr> id2ptr = new Dictionary<long, IntPtr>();
-        private Dictionary<long, object> id2obj = new Dictionary<long, object>();
+        // Every mapping lives in a single MapEntry; ptrIndex and idIndex are open-addressed
+        // tables of (slot + 1) which read their keys back out of the entries, so each
+        // lookup is one probe sequence and each mapping costs one entry plus two ints.
+        private const int INITIAL_BITS = 8;
+        private const int EMPTY = 0;
+        private const int DELETED = -1;
 
-        private Dictionary<long, WeakReference> id2wref = new Dictionary<long, WeakReference>();
-        private Dictionary<long, object> id2sref = new Dictionary<long, object>();
+        private MapEntry[] entries = new MapEntry[1 << (INITIAL_BITS - 1)];
+        private int used = 0;
+        private Stack<int> freeSlots = new Stack<int>();
         
-        private int cbpCount = 0;
+        private int[] ptrIndex = new int[1 << INITIAL_BITS];
+        private int[] idIndex = new int[1 << INITIAL_BITS];
+        private int indexBits = INITIAL_BITS;
+        private int ptrCount = 0;
+        private int idCount = 0;
+        private int ptrDeleted = 0;
+        private int idDeleted = 0;
+
+        private int bridgeCount = 0;
         private int cbpRegulator = 50000;
+        private int sweepBudget = 1000;
+        private int fallbackSweepInterval = 100;
+        private int sweepCursor = 0;
+        private List<int> dirtySlots = new List<int>();
+
+        private int
+        Bucket(long key)
+        {
+            return (int)(((ulong)key * 0x9E3779B97F4A7C15UL) >> (64 - this.indexBits));
+        }
+
+        private bool
+        KeyMatches(int slot, long key, bool byPtr)
+        {
+            if (byPtr)
+            {
+                return this.entries[slot].ptr.ToInt64() == key;
+            }
+            return this.entries[slot].id == key;
+        }
+
+        private int
+        FindBucket(int[] index, long key, bool byPtr)
+        {
+            int mask = index.Length - 1;
+            int i = this.Bucket(key);
+            while (true)
+            {
+                int value = index[i];
+                if (value == EMPTY)
+                {
+                    return -1;
+                }
+                if (value != DELETED && this.KeyMatches(value - 1, key, byPtr))
+                {
+                    return i;
+                }
+                i = (i + 1) & mask;
+            }
+        }
+
+        private int
+        FindSlot(int[] index, long key, bool byPtr)
+        {
+            int bucket = this.FindBucket(index, key, byPtr);
+            if (bucket == -1)
+            {
+                return -1;
+            }
+            return index[bucket] - 1;
+        }
+
+        private bool
+        IndexSlot(int[] index, long key, bool byPtr, int slot)
+        {
+            // returns true if a bucket was newly occupied
+            int existing = this.FindBucket(index, key, byPtr);
+            if (existing != -1)
+            {
+                index[existing] = slot + 1;
+                return false;
+            }
+            int mask = index.Length - 1;
+            int i = this.Bucket(key);
+            while (index[i] != EMPTY && index[i] != DELETED)
+            {
+                i = (i + 1) & mask;
+            }
+            if (index[i] == DELETED)
+            {
+                if (byPtr) { this.ptrDeleted -= 1; } else { this.idDeleted -= 1; }
+            }
+            index[i] = slot + 1;
+            return true;
+        }
+
+        private void
+        UnindexSlot(int[] index, long key, bool byPtr, int slot)
+        {
+            int bucket = this.FindBucket(index, key, byPtr);
+            if (bucket == -1 || index[bucket] != slot + 1)
+            {
+                return;
+            }
+            index[bucket] = DELETED;
+            if (byPtr)
+            {
+                this.ptrCount -= 1;
+                this.ptrDeleted += 1;
+            }
+            else
+            {
+                this.idCount -= 1;
+                this.idDeleted += 1;
+            }
+        }
+
+        private void
+        ReserveIndexSpace()
+        {
+            // keep both tables at most half full, counting tombstones
+            int capacity = this.ptrIndex.Length;
+            int load = Math.Max(this.ptrCount + this.ptrDeleted, this.idCount + this.idDeleted) + 1;
+            if (load * 2 <= capacity)
+            {
+                return;
+            }
+            int live = Math.Max(this.ptrCount, this.idCount) + 1;
+            if (live * 4 > capacity)
+            {
+                this.indexBits += 1;
+            }
+            this.RebuildIndexes();
+        }
+
+        private void
+        RebuildIndexes()
+        {
+            this.ptrIndex = new int[1 << this.indexBits];
+            this.idIndex = new int[1 << this.indexBits];
+            this.ptrCount = this.idCount = this.ptrDeleted = this.idDeleted = 0;
+            for (int slot = 0; slot < this.used; slot++)
+            {
+                if (this.entries[slot].ptr == IntPtr.Zero)
+                {
+                    continue;
+                }
+                this.IndexSlot(this.ptrIndex, this.entries[slot].ptr.ToInt64(), true, slot);
+                this.ptrCount += 1;
+
+                // when one object is mapped at several ptrs, only the most recent Associate
+                // is found by id; if that mapping was released, none is, so a rebuild never
+                // brings an older ptr back
+                if (!this.entries[slot].owned)
+                {
+                    continue;
+                }
+                if (this.IndexSlot(this.idIndex, this.entries[slot].id, false, slot))
+                {
+                    this.idCount += 1;
+                }
+            }
+        }
+
+        private int
+        NewSlot(IntPtr ptr, object obj)
+        {
+            this.ReserveIndexSpace();
+            long id = PythonOps.Id(obj);
+            int slot = this.FindSlot(this.ptrIndex, ptr.ToInt64(), true);
+            if (slot != -1)
+            {
+                // remapping a live ptr; forget whatever it used to mean
+                this.ClearSlot(slot);
+            }
+            else
+            {
+                if (this.freeSlots.Count > 0)
+                {
+                    slot = this.freeSlots.Pop();
+                }
+                else
+                {
+                    if (this.used == this.entries.Length)
+                    {
+                        Array.Resize(ref this.entries, this.entries.Length * 2);
+                    }
+                    slot = this.used++;
+                }
+                this.entries[slot].ptr = ptr;
+                this.IndexSlot(this.ptrIndex, ptr.ToInt64(), true, slot);
+                this.ptrCount += 1;
+            }
+
+            this.entries[slot].id = id;
+            this.entries[slot].obj = obj;
+            int previous = this.FindSlot(this.idIndex, id, false);
+            if (previous != -1)
+            {
+                this.entries[previous].owned = false;
+            }
+            this.entries[slot].owned = true;
+            if (this.IndexSlot(this.idIndex, id, false, slot))
+            {
+                this.idCount += 1;
+            }
+            return slot;
+        }
+
+        private void
+        ClearSlot(int slot)
+        {
+            this.UnindexSlot(this.idIndex, this.entries[slot].id, false, slot);
+            if (this.entries[slot].wref != null)
+            {
+                this.bridgeCount -= 1;
+            }
+            this.entries[slot].id = 0;
+            this.entries[slot].obj = null;
+            this.entries[slot].wref = null;
+            this.entries[slot].dirty = false;
+            this.entries[slot].owned = false;
+        }
+
+        private int
+        GetSlot(IntPtr ptr, string caller)
+        {
+            int slot = this.FindSlot(this.ptrIndex, ptr.ToInt64(), true);
+            if (slot == -1)
+            {
+                throw new BadMappingException(String.Format("{0}: No ptr-to-obj mapping for {1}", caller, ptr.ToString("x")));
+            }
+            return slot;
+        }
     
         public void
         Associate(IntPtr ptr, object obj)
         {
-            long id = PythonOps.Id(obj);
-            this.ptr2id[ptr] = id;
-            this.id2ptr[id] = ptr;
-            this.id2obj[id] = obj;
+            this.NewSlot(ptr, obj);
         }
         
         public void
         BridgeAssociate(IntPtr ptr, object obj)
         {
-            long id = PythonOps.Id(obj);
-            this.ptr2id[ptr] = id;
-            this.id2ptr[id] = ptr;
-            
-            WeakReference wref = new WeakReference(obj);
-            this.id2wref[id] = wref;
-            this.id2sref[id] = obj;
+            int slot = this.NewSlot(ptr, obj);
+            this.entries[slot].wref = new WeakReference(obj);
+            this.bridgeCount += 1;
         }
         
         public void
         UpdateStrength(IntPtr ptr)
         {
-            long id = this.ptr2id[ptr];
-            if (!this.id2wref.ContainsKey(id))
+            this.UpdateSlotStrength(this.GetSlot(ptr, "UpdateStrength"));
+        }
+
+        public void
+        MarkDirty(IntPtr ptr)
+        {
+            // the ptr's refcount may be about to change (or have changed) without our
+            // knowledge; make sure the next CheckBridgePtrs looks at it
+            int slot = this.FindSlot(this.ptrIndex, ptr.ToInt64(), true);
+            if (slot == -1 || this.entries[slot].wref == null || this.entries[slot].dirty)
+            {
+                return;
+            }
+            this.entries[slot].dirty = true;
+            this.dirtySlots.Add(slot);
+        }
+
+        public int
+        DirtyCount
+        {
+            get { return this.dirtySlots.Count; }
+        }
+
+        private void
+        UpdateDirtySlots()
+        {
+            foreach (int slot in this.dirtySlots)
+            {
+                if (this.entries[slot].dirty)
+                {
+                    this.entries[slot].dirty = false;
+                    this.UpdateSlotStrength(slot);
+                }
+            }
+            this.dirtySlots.Clear();
+        }
+
+        private void
+        UpdateSlotStrength(int index)
+        {
+            WeakReference wref = this.entries[index].wref;
+            if (wref == null)
             {
                 return;
             }
             
-            object obj = this.id2wref[id].Target;
-            int refcnt = CPyMarshal.ReadInt(ptr);
+            int refcnt = CPyMarshal.ReadInt(this.entries[index].ptr);
             if (refcnt > 1)
             {
-                this.Strengthen(obj);
+                if (this.entries[index].obj == null)
+                {
+                    this.entries[index].obj = wref.Target;
+                }
             }
             else
             {
-                this.Weaken(obj);
+                this.entries[index].obj = null;
             }
         }
         
@@ -80,21 +353,22 @@ namespace Ironclad
         LogMappingInfo(object id_)
         {
             long id = (long)id_;
-            if (this.id2ptr.ContainsKey(id))
+            int index = this.FindSlot(this.idIndex, id, false);
+            if (index != -1)
             {
-                IntPtr ptr = this.id2ptr[id];
+                IntPtr ptr = this.entries[index].ptr;
                 Console.WriteLine("object for id {0} is stored at {1}; refcount is {2}", 
                     id, ptr.ToString("x"), CPyMarshal.ReadInt(ptr));
-                if (this.id2obj.ContainsKey(id))
+                if (this.entries[index].wref == null)
                 {
                     Console.WriteLine("object is simply mapped");
-                    Console.WriteLine(PythonCalls.Call(Builtin.str, new object[] { this.id2obj[id] }));
+                    Console.WriteLine(PythonCalls.Call(Builtin.str, new object[] { this.entries[index].obj }));
                 }
-                else if (this.id2wref.ContainsKey(id))
+                else
                 {
-                    this.UpdateStrength(ptr);
+                    this.UpdateSlotStrength(index);
                     Console.WriteLine("object is cleverly mapped");
-                    if (this.id2sref.ContainsKey(id))
+                    if (this.entries[index].obj != null)
                     {
                         Console.WriteLine("object is being kept alive");
                     }
@@ -103,10 +377,6 @@ namespace Ironclad
                         Console.WriteLine("object is at GC's mercy");
                     }
                 }
-                else
-                {
-                    Console.WriteLine("hm, object has been lost somewhere");
-                }
             }
             else
             {
@@ -122,15 +392,20 @@ namespace Ironclad
             Dictionary<object, int> scounts = new Dictionary<object, int>();
             Dictionary<object, int> wcounts = new Dictionary<object, int>();
             wcounts["ZOMBIE"] = 0;
-            foreach (long id in this.id2wref.Keys)
+            for (int i = 0; i < this.used; i++)
             {
-                if (!this.id2sref.ContainsKey(id))
+                WeakReference wref = this.entries[i].wref;
+                if (wref == null)
+                {
+                    continue;
+                }
+                if (this.entries[i].obj == null)
                 {
                     wtotal += 1;
-                    WeakReference wref = this.id2wref[id];
-                    if (wref.IsAlive)
+                    object target = wref.Target;
+                    if (target != null)
                     {
-                        object type_ = PythonCalls.Call(Builtin.type, new object[] { wref.Target });
+                        object type_ = PythonCalls.Call(Builtin.type, new object[] { target });
                         if (!wcounts.ContainsKey(type_))
                         {
                             wcounts[type_] = 0;
@@ -145,7 +420,7 @@ namespace Ironclad
                 else
                 {
                     stotal += 1;
-                    object type_ = PythonCalls.Call(Builtin.type, new object[] { this.id2sref[id] });
+                    object type_ = PythonCalls.Call(Builtin.type, new object[] { this.entries[i].obj });
                     if (!scounts.ContainsKey(type_))
                     {
                         scounts[type_] = 0;
@@ -174,159 +449,210 @@ namespace Ironclad
             set { this.cbpRegulator = value; }
         }
         
+        public int
+        SweepBudget
+        {
+            get { return this.sweepBudget; }
+            set { this.sweepBudget = value; }
+        }
+
+        public int
+        FallbackSweepInterval
+        {
+            get { return this.fallbackSweepInterval; }
+            set { this.fallbackSweepInterval = value; }
+        }
+
+        public int
+        Count
+        {
+            get { return this.ptrCount; }
+        }
+
+        public int
+        BridgeCount
+        {
+            get { return this.bridgeCount; }
+        }
+
         
         public void
         CheckBridgePtrs(bool force)
         {
-            if (!force)
+            // an unforced check updates every slot marked dirty since the last check,
+            // and then does one incremental step of a fallback sweep which is spread
+            // over cbpRegulator * fallbackSweepInterval calls and never examines more
+            // than sweepBudget slots at a time; a forced check (or a regulator of 0)
+            // sweeps everything now
+            if (force || this.cbpRegulator <= 0)
+            {
+                for (int i = 0; i < this.used; i++)
+                {
+                    this.entries[i].dirty = false;
+                    this.UpdateSlotStrength(i);
+                }
+                this.dirtySlots.Clear();
+                this.sweepCursor = 0;
+                return;
+            }
+
+            this.UpdateDirtySlots();
+
+            long period = (long)this.cbpRegulator * Math.Max(1, this.fallbackSweepInterval);
+            int step = (int)((this.used + period - 1) / period);
+            if (this.sweepBudget > 0 && step > this.sweepBudget)
+            {
+                step = this.sweepBudget;
+            }
+            this.SweepBridgePtrs(step);
+        }
+
+        public void
+        SweepBridgePtrs(int count)
+        {
+            count = Math.Min(count, this.used);
+            for (int i = 0; i < count; i++)
             {
-                // throttling and forced GC not tested; couldn't work out how
-                this.cbpCount += 1;
-                if (this.cbpCount < this.cbpRegulator)
+                if (this.sweepCursor >= this.used)
                 {
-                    return;
+                    this.sweepCursor = 0;
                 }
-                this.cbpCount = 0;
+                this.UpdateSlotStrength(this.sweepCursor++);
             }
-            this.MapOverBridgePtrs(new PtrFunc(this.UpdateStrength));
         }
         
         public void
         MapOverBridgePtrs(PtrFunc f)
         {
-            long[] keys = new long[this.id2wref.Count];
-            this.id2wref.Keys.CopyTo(keys, 0);
-            foreach (long id in keys)
+            // f may well release mappings, so work from a snapshot
+            IntPtr[] ptrs = new IntPtr[this.bridgeCount];
+            int count = 0;
+            for (int i = 0; i < this.used; i++)
             {
-                f(this.id2ptr[id]);
+                if (this.entries[i].wref != null)
+                {
+                    ptrs[count++] = this.entries[i].ptr;
+                }
+            }
+            for (int i = 0; i < count; i++)
+            {
+                f(ptrs[i]);
             }
-            return;
         }
         
         public void
         Strengthen(object obj)
         {
-            long id = PythonOps.Id(obj);
-            if (this.id2wref.ContainsKey(id))
+            int index = this.FindSlot(this.idIndex, PythonOps.Id(obj), false);
+            if (index != -1)
             {
-                if (this.id2sref.ContainsKey(id))
+                if (this.entries[index].wref != null)
                 {
-                    // already strongly reffed
-                    return; 
+                    this.entries[index].obj = obj;
                 }
-                this.id2sref[id] = obj;
             }
         }
         
         public void
         Weaken(object obj)
         {
-            long id = PythonOps.Id(obj);
-            if (this.id2wref.ContainsKey(id))
+            int index = this.FindSlot(this.idIndex, PythonOps.Id(obj), false);
+            if (index != -1)
             {
-                if (!this.id2sref.ContainsKey(id))
+                if (this.entries[index].wref != null)
                 {
-                    // already weakly reffed
-                    return; 
+                    this.entries[index].obj = null;
                 }
-                this.id2sref.Remove(id);
             }
         }
         
         public void
         Release(IntPtr ptr)
         {
-            if (!this.ptr2id.ContainsKey(ptr))
+            int index = this.FindSlot(this.ptrIndex, ptr.ToInt64(), true);
+            if (index == -1)
             {
                 throw new BadMappingException(String.Format("Release: tried to release unmapped ptr {0}", ptr.ToString("x")));
             }
 
-            long id = this.ptr2id[ptr];
-            this.ptr2id.Remove(ptr);
-            this.id2ptr.Remove(id);
-
-            if (this.id2obj.ContainsKey(id))
-            {
-                this.id2obj.Remove(id);
-            }
-            else if (this.id2wref.ContainsKey(id))
-            {
-                this.id2wref.Remove(id);
-                if (this.id2sref.ContainsKey(id))
-                {
-                    this.id2sref.Remove(id);
-                }
-            }
-            else
-            {
-                throw new BadMappingException(String.Format("Release: mapping corrupt (ptr {0})", ptr.ToString("x")));
-            }
+            this.ClearSlot(index);
+            this.UnindexSlot(this.ptrIndex, ptr.ToInt64(), true, index);
+            this.entries[index].ptr = IntPtr.Zero;
+            this.freeSlots.Push(index);
         }
         
         public bool
         HasObj(object obj)
         {
-            if (this.id2ptr.ContainsKey(PythonOps.Id(obj)))
-            {
-                return true;
-            }
-            return false;
+            return this.FindSlot(this.idIndex, PythonOps.Id(obj), false) != -1;
         }
         
         public IntPtr
         GetPtr(object obj)
         {
-            long id = PythonOps.Id(obj);
-            if (!this.id2ptr.ContainsKey(id))
+            IntPtr ptr;
+            if (!this.TryGetPtr(obj, out ptr))
             {
                 throw new BadMappingException(String.Format("GetPtr: No obj-to-ptr mapping for {0}", obj));
             }
-            return this.id2ptr[id];
+            return ptr;
         }
-        
+
         public bool
-        HasPtr(IntPtr ptr)
+        TryGetPtr(object obj, out IntPtr ptr)
         {
-            if (this.ptr2id.ContainsKey(ptr))
+            int index = this.FindSlot(this.idIndex, PythonOps.Id(obj), false);
+            if (index != -1)
             {
+                ptr = this.entries[index].ptr;
                 return true;
             }
+            ptr = IntPtr.Zero;
             return false;
         }
         
-        public object
-        GetObj(IntPtr ptr)
+        public bool
+        HasPtr(IntPtr ptr)
         {
-            if (!this.ptr2id.ContainsKey(ptr))
-            {
-                throw new BadMappingException(String.Format("GetObj: No ptr-to-obj mapping for {0}", ptr.ToString("x")));
-            }
-
-            long id = this.ptr2id[ptr];
-            if (this.id2obj.ContainsKey(id))
+            return this.FindSlot(this.ptrIndex, ptr.ToInt64(), true) != -1;
+        }
+        
+        public bool
+        TryGetObj(IntPtr ptr, out object obj)
+        {
+            // false if ptr isn't mapped, or if it was weakly mapped and its object is gone
+            obj = null;
+            int slot = this.FindSlot(this.ptrIndex, ptr.ToInt64(), true);
+            if (slot == -1)
             {
-                return this.id2obj[id];
+                return false;
             }
-            else if (this.id2sref.ContainsKey(id))
+            obj = this.entries[slot].obj;
+            if (obj == null && this.entries[slot].wref != null)
             {
-                return this.id2sref[id];
+                obj = this.entries[slot].wref.Target;
             }
-            else if (this.id2wref.ContainsKey(id))
+            return obj != null;
+        }
+
+        public object
+        GetObj(IntPtr ptr)
+        {
+            int index = this.GetSlot(ptr, "GetObj");
+            object obj = this.entries[index].obj;
+            WeakReference wref = this.entries[index].wref;
+            if (obj != null || wref == null)
             {
-                WeakReference wref = this.id2wref[id];
-                if (wref.IsAlive)
-                {
-                    return wref.Target;
-                }
-                throw new NullReferenceException(
-                    String.Format("GetObj: Weakly mapped object for ptr {0} was GCed too soon", ptr.ToString("x")));
+                return obj;
             }
-            else
+
+            obj = wref.Target;
+            if (obj != null)
             {
-                throw new BadMappingException(String.Format("GetObj: mapping corrupt (ptr {0})", ptr.ToString("x")));
+                return obj;
             }
+            throw new NullReferenceException(
+                String.Format("GetObj: Weakly mapped object for ptr {0} was GCed too soon", ptr.ToString("x")));
         }
     }
 }
-
-
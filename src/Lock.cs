@@ -1,95 +1,130 @@
 using System;
+using System.Collections.Generic;
 using System.Threading;
 
 
 namespace Ironclad
 {
-    
+
     public class LockException : Exception
     {
         public LockException(string message): base(message)
         {
         }
     }
-    
+
     public class Lock
     {
-        private IntPtr hMutex;
-        private int count;
+        // A reentrant lock which never leaves user mode unless it's contended: the
+        // owning thread's id is swapped in with a single interlocked operation, and
+        // reentrant acquires/releases only touch the count. When we can't take it
+        // straight away, we spin briefly before falling back to a blocking wait.
+        //
+        // By default, whoever gets there first wins, so a thread which releases and
+        // re-acquires in a tight loop can starve everyone else. With a non-zero
+        // SwitchInterval, a thread which has waited that long asks for the lock to be
+        // dropped; the next release then hands it straight to the longest-waiting
+        // thread, much like the "new GIL" in CPython 3.
+        private const int FREE = 0;
+        private const int SPIN_COUNT = 100;
+        private const int SPIN_ITERATIONS = 20;
+
+        private class Waiter
+        {
+            public int id;
+            public bool granted = false;
+
+            public Waiter(int id)
+            {
+                this.id = id;
+            }
+        }
+
+        private object waitLock = new object();
+        private LinkedList<Waiter> queue = new LinkedList<Waiter>();
         private int owner;
-        
-        private const int INFINITE = -1;
-        private const int ABANDONED = 0x80;
-        private const int TIMEOUT = 0x102;
-        
+        private int count;
+        private int waiters;
+        private int dropRequested;
+        private int switchIntervalMs;
+
         public Lock()
         {
-            this.hMutex = Unmanaged.CreateMutex(IntPtr.Zero, 0, IntPtr.Zero);
+            this.owner = FREE;
             this.count = 0;
-            this.owner = -1;
-        }
-        
-        ~Lock()
-        {
-            this.Dispose(false);
+            this.waiters = 0;
+            this.dropRequested = 0;
+            this.switchIntervalMs = 0;
         }
-        
-        public void 
+
+        public void
         Dispose()
         {
-            GC.SuppressFinalize(this);
-            this.Dispose(true);
-        }
-        
-        protected virtual void 
-        Dispose(bool disposing)
-        {
-            if (this.hMutex == IntPtr.Zero)
+            while (this.IsAcquired)
             {
-                return;
+                this.Release();
             }
-            
-            while (this.count > 0)
+        }
+
+        public double
+        SwitchInterval
+        {
+            get { return this.switchIntervalMs / 1000.0; }
+            set
             {
-                this.Release();
+                if (value <= 0)
+                {
+                    this.switchIntervalMs = 0;
+                }
+                else
+                {
+                    this.switchIntervalMs = Math.Max(1, (int)Math.Round(value * 1000));
+                }
             }
-            Unmanaged.CloseHandle(this.hMutex);
-            
-            this.hMutex = IntPtr.Zero;
         }
-        
-    
+
+        public bool
+        DropRequested
+        {
+            get { return Thread.VolatileRead(ref this.dropRequested) != 0; }
+        }
+
         public int
         Acquire()
         {
-            if (Unmanaged.WaitForSingleObject(this.hMutex, INFINITE) == ABANDONED)
+            int me = Thread.CurrentThread.ManagedThreadId;
+            if (this.owner == me)
             {
-                Console.WriteLine("warning: mutex abandoned\n{0}", System.Environment.StackTrace);
+                this.count += 1;
+                return this.count;
             }
-            
-            this.owner = Thread.CurrentThread.ManagedThreadId;
-            this.count += 1;
+
+            if (Interlocked.CompareExchange(ref this.owner, me, FREE) != FREE)
+            {
+                this.AcquireContended(me);
+            }
+            this.count = 1;
             return this.count;
         }
-        
+
         public bool
         TryAcquire()
         {
-            int result = Unmanaged.WaitForSingleObject(this.hMutex, 0);
-            if (result == TIMEOUT)
+            int me = Thread.CurrentThread.ManagedThreadId;
+            if (this.owner == me)
             {
-                return false;
+                this.count += 1;
+                return true;
             }
-            if (result == ABANDONED)
+
+            if (Interlocked.CompareExchange(ref this.owner, me, FREE) != FREE)
             {
-                Console.WriteLine("warning: mutex abandoned\n{0}", System.Environment.StackTrace);
+                return false;
             }
-            
-            this.owner = Thread.CurrentThread.ManagedThreadId;
-            this.count += 1;
+            this.count = 1;
             return true;
         }
-        
+
         public bool
         IsAcquired
         {
@@ -98,7 +133,7 @@ namespace Ironclad
                 return (this.owner == Thread.CurrentThread.ManagedThreadId) && (this.count > 0);
             }
         }
-        
+
         public int
         CountAcquired
         {
@@ -111,7 +146,7 @@ namespace Ironclad
                 return 0;
             }
         }
-        
+
         public void
         Release()
         {
@@ -120,13 +155,132 @@ namespace Ironclad
                 throw new LockException("you can't release a lock you don't own");
             }
             this.count -= 1;
-            if (this.count == 0)
+            if (this.count > 0)
+            {
+                return;
+            }
+
+            if (this.DropRequested && this.HandOff())
+            {
+                return;
+            }
+
+            // the exchange is a full fence, so any thread which registered itself as a
+            // waiter before we let go will be visible here, and any thread which does so
+            // afterwards will see the lock free when it tries to take it
+            Interlocked.Exchange(ref this.owner, FREE);
+            if (Thread.VolatileRead(ref this.waiters) > 0)
+            {
+                lock (this.waitLock)
+                {
+                    Monitor.Pulse(this.waitLock);
+                }
+            }
+        }
+
+        public void
+        Yield()
+        {
+            // if another thread has asked for the lock, let it have it, and wait
+            // until we get it back (at the same count)
+            if (!this.IsAcquired || !this.DropRequested)
+            {
+                return;
+            }
+            int count = this.count;
+            this.count = 1;
+            this.Release();
+            this.Acquire();
+            this.count = count;
+        }
+
+        public int
+        ReleaseAll()
+        {
+            // lets go completely, however many times we've acquired; returns the count
+            // to pass to Reacquire
+            int count = this.count;
+            this.count = 1;
+            this.Release();
+            return count;
+        }
+
+        public void
+        Reacquire(int count)
+        {
+            this.Acquire();
+            this.count = count;
+        }
+
+        private bool
+        HandOff()
+        {
+            lock (this.waitLock)
+            {
+                this.dropRequested = 0;
+                if (this.queue.Count == 0)
+                {
+                    return false;
+                }
+                Waiter next = this.queue.First.Value;
+                this.queue.RemoveFirst();
+                next.granted = true;
+                Interlocked.Exchange(ref this.owner, next.id);
+                Monitor.PulseAll(this.waitLock);
+                return true;
+            }
+        }
+
+        private void
+        AcquireContended(int me)
+        {
+            for (int i = 0; i < SPIN_COUNT; i++)
             {
-                this.owner = -1;
+                Thread.SpinWait(SPIN_ITERATIONS);
+                if (this.owner == FREE && Interlocked.CompareExchange(ref this.owner, me, FREE) == FREE)
+                {
+                    return;
+                }
             }
-            if (Unmanaged.ReleaseMutex(this.hMutex) == 0)
+
+            lock (this.waitLock)
             {
-                throw new LockException("ReleaseMutex failed, even though we're pretty certain we do own this lock");
+                Waiter waiter = new Waiter(me);
+                LinkedListNode<Waiter> node = this.queue.AddLast(waiter);
+                Interlocked.Increment(ref this.waiters);
+                int joined = Environment.TickCount;
+                try
+                {
+                    while (!waiter.granted && Interlocked.CompareExchange(ref this.owner, me, FREE) != FREE)
+                    {
+                        int interval = this.switchIntervalMs;
+                        if (interval == 0)
+                        {
+                            Monitor.Wait(this.waitLock);
+                            continue;
+                        }
+
+                        // the interval runs from when we joined the queue, not from the last
+                        // time we were woken: an owner which keeps releasing and re-acquiring
+                        // will wake us every time, and we'd never get around to asking
+                        int remaining = interval - (Environment.TickCount - joined);
+                        if (remaining <= 0)
+                        {
+                            // waited long enough: ask the owner to let go
+                            Interlocked.Exchange(ref this.dropRequested, 1);
+                            remaining = interval;
+                        }
+                        Monitor.Wait(this.waitLock, remaining);
+                    }
+                }
+                finally
+                {
+                    if (!waiter.granted)
+                    {
+                        this.queue.Remove(node);
+                    }
+                    Interlocked.Decrement(ref this.waiters);
+                }
             }
         }
     }
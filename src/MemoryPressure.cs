@@ -0,0 +1,85 @@
+using System;
+
+namespace Ironclad
+{
+    public class MemoryPressure
+    {
+        // The GC can't see unmanaged memory, so a tiny managed object can keep megabytes
+        // alive without ever provoking a collection. We tell the GC about unmanaged bytes,
+        // but only once they've drifted by a whole chunk from what we last told it, so
+        // that small allocations don't each cost a call into the GC.
+        public const long DEFAULT_CHUNK = 1 << 20;
+
+        private long chunk;
+        private long tracked = 0;
+        private long reported = 0;
+
+        public MemoryPressure() : this(DEFAULT_CHUNK)
+        {
+        }
+
+        public MemoryPressure(long chunk)
+        {
+            this.chunk = chunk;
+        }
+
+        public long
+        Tracked
+        {
+            get { return this.tracked; }
+        }
+
+        public long
+        Reported
+        {
+            get { return this.reported; }
+        }
+
+        public void
+        Add(long bytes)
+        {
+            lock (this)
+            {
+                this.tracked += bytes;
+                this.Update();
+            }
+        }
+
+        public void
+        Remove(long bytes)
+        {
+            lock (this)
+            {
+                this.tracked -= bytes;
+                this.Update();
+            }
+        }
+
+        public void
+        Reset()
+        {
+            lock (this)
+            {
+                this.tracked = 0;
+                this.Update();
+            }
+        }
+
+        private void
+        Update()
+        {
+            long target = Math.Max(this.tracked, 0);
+            long delta = target - this.reported;
+            if (delta >= this.chunk)
+            {
+                GC.AddMemoryPressure(delta);
+                this.reported = target;
+            }
+            else if (delta < 0 && (-delta >= this.chunk || target == 0))
+            {
+                GC.RemoveMemoryPressure(-delta);
+                this.reported = target;
+            }
+        }
+    }
+}
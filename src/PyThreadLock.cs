@@ -0,0 +1,134 @@
+using System;
+using System.Threading;
+
+namespace Ironclad
+{
+    public static class PyThreadLock
+    {
+        // A PyThread_type_lock is a pointer to a pair of ints in unmanaged memory: the
+        // managed id of the thread which holds it (or FREE), and the number of threads
+        // blocked waiting for it. Nothing about it is stored in the mapper, so acquiring
+        // and releasing one is a single interlocked operation unless it's contended.
+        // Blocked threads wait on one of a few shared monitors, chosen by address.
+        //
+        // Like CPython's, these locks aren't reentrant, and any thread may release them.
+        public const int SIZE = 8;
+
+        private const int FREE = 0;
+        private const int WAITERS = 4;
+        private const int SPIN_COUNT = 100;
+        private const int SPIN_ITERATIONS = 20;
+        private const int WAIT_LOCKS = 16;
+
+        private static object[] waitLocks = CreateWaitLocks();
+
+        private static object[]
+        CreateWaitLocks()
+        {
+            object[] result = new object[WAIT_LOCKS];
+            for (int i = 0; i < WAIT_LOCKS; i++)
+            {
+                result[i] = new object();
+            }
+            return result;
+        }
+
+        private static object
+        WaitLockFor(IntPtr lockPtr)
+        {
+            return waitLocks[(lockPtr.ToInt64() >> 3) & (WAIT_LOCKS - 1)];
+        }
+
+        public static IntPtr
+        Alloc(IAllocator allocator)
+        {
+            IntPtr lockPtr = allocator.Alloc(SIZE);
+            CPyMarshal.Zero(lockPtr, SIZE);
+            return lockPtr;
+        }
+
+        public static void
+        Free(IAllocator allocator, IntPtr lockPtr)
+        {
+            allocator.Free(lockPtr);
+        }
+
+        public static bool
+        IsAcquired(IntPtr lockPtr)
+        {
+            return CPyMarshal.ReadInt(lockPtr) == Thread.CurrentThread.ManagedThreadId;
+        }
+
+        public static bool
+        IsLocked(IntPtr lockPtr)
+        {
+            return CPyMarshal.ReadInt(lockPtr) != FREE;
+        }
+
+        public static unsafe bool
+        TryAcquire(IntPtr lockPtr)
+        {
+            int* owner = (int*)lockPtr;
+            return Interlocked.CompareExchange(ref *owner, Thread.CurrentThread.ManagedThreadId, FREE) == FREE;
+        }
+
+        public static unsafe void
+        Acquire(IntPtr lockPtr)
+        {
+            int me = Thread.CurrentThread.ManagedThreadId;
+            int* owner = (int*)lockPtr;
+            if (Interlocked.CompareExchange(ref *owner, me, FREE) == FREE)
+            {
+                return;
+            }
+
+            for (int i = 0; i < SPIN_COUNT; i++)
+            {
+                Thread.SpinWait(SPIN_ITERATIONS);
+                if (*owner == FREE && Interlocked.CompareExchange(ref *owner, me, FREE) == FREE)
+                {
+                    return;
+                }
+            }
+
+            int* waiters = (int*)CPyMarshal.Offset(lockPtr, WAITERS);
+            object waitLock = WaitLockFor(lockPtr);
+            lock (waitLock)
+            {
+                Interlocked.Increment(ref *waiters);
+                try
+                {
+                    while (Interlocked.CompareExchange(ref *owner, me, FREE) != FREE)
+                    {
+                        Monitor.Wait(waitLock);
+                    }
+                }
+                finally
+                {
+                    Interlocked.Decrement(ref *waiters);
+                }
+            }
+        }
+
+        public static unsafe void
+        Release(IntPtr lockPtr)
+        {
+            int* owner = (int*)lockPtr;
+            int* waiters = (int*)CPyMarshal.Offset(lockPtr, WAITERS);
+            if (Interlocked.Exchange(ref *owner, FREE) == FREE)
+            {
+                throw new LockException("you can't release a lock which isn't locked");
+            }
+            // the exchange is a full fence; see Lock.Release
+            if (Thread.VolatileRead(ref *waiters) > 0)
+            {
+                object waitLock = WaitLockFor(lockPtr);
+                lock (waitLock)
+                {
+                    // other locks may share this monitor, so wake everyone
+                    Monitor.PulseAll(waitLock);
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,80 @@
+using System;
+
+namespace Ironclad
+{
+    internal class TempObjectScopes
+    {
+        // Each thread which calls into the mapper gets one of these; every EnsureGIL opens
+        // a scope, DecRefLater parks ptrs in the innermost scope, and ReleaseGIL closes it
+        // and decrefs its ptrs. All the scopes share one buffer, and a scope is just the
+        // index at which it started, so opening and closing scopes doesn't allocate.
+        private const int INITIAL_PTRS = 64;
+        private const int INITIAL_SCOPES = 16;
+
+        private IntPtr[] ptrs = new IntPtr[INITIAL_PTRS];
+        private int count = 0;
+        private int[] starts = new int[INITIAL_SCOPES];
+        private int depth = 0;
+
+        public int
+        Depth
+        {
+            get { return this.depth; }
+        }
+
+        public int
+        CurrentCount
+        {
+            get
+            {
+                if (this.depth == 0)
+                {
+                    return 0;
+                }
+                return this.count - this.starts[this.depth - 1];
+            }
+        }
+
+        public void
+        Push()
+        {
+            if (this.depth == this.starts.Length)
+            {
+                Array.Resize(ref this.starts, this.starts.Length * 2);
+            }
+            this.starts[this.depth++] = this.count;
+        }
+
+        public void
+        Add(IntPtr ptr)
+        {
+            if (this.depth == 0)
+            {
+                return;
+            }
+            if (this.count == this.ptrs.Length)
+            {
+                Array.Resize(ref this.ptrs, this.ptrs.Length * 2);
+            }
+            this.ptrs[this.count++] = ptr;
+        }
+
+        public void
+        Pop(PtrFunc decref)
+        {
+            if (this.depth == 0)
+            {
+                return;
+            }
+            int start = this.starts[--this.depth];
+            // decref may well end up adding more ptrs; they go on the end, and get
+            // handled here as well
+            while (this.count > start)
+            {
+                IntPtr ptr = this.ptrs[--this.count];
+                this.ptrs[this.count] = IntPtr.Zero;
+                decref(ptr);
+            }
+        }
+    }
+}
@@ -0,0 +1,26 @@
+using System;
+using System.Threading;
+
+namespace Ironclad
+{
+    internal class ThreadData
+    {
+        // everything a PythonMapper keeps for each thread which uses it
+        public PythonMapper mapper;
+        public Thread thread;
+        public Counter lockCount = new Counter();
+        public TempObjectScopes tempObjects = new TempObjectScopes();
+        public ThreadState threadState = null;
+        public GILStats gilStats = null;
+
+        // set while PyEval_SaveThread has let go of a batch's GIL
+        public int savedGILCount = 0;
+        public int savedGILBatchCount = 0;
+
+        public ThreadData(PythonMapper mapper, Thread thread)
+        {
+            this.mapper = mapper;
+            this.thread = thread;
+        }
+    }
+}
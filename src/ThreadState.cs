@@ -4,6 +4,7 @@ using System.Threading;
 
 using IronPython.Modules;
 using IronPython.Runtime;
+using IronPython.Runtime.Exceptions;
 using IronPython.Runtime.Operations;
 
 using Ironclad.Structs;
@@ -14,35 +15,73 @@ namespace Ironclad
     {
         private PythonMapper mapper;
         private IntPtr ptr;
+
+        // The error most recently set from managed code (and, if it was a .NET exception,
+        // the original exception object), along with the type and value we gave C. We
+        // hold extra references to those, so they can't be freed and their addresses
+        // reused; so, while C still has the same type and value set, the error hasn't
+        // changed, and we can hand back the original rather than building a new one.
+        private object error = null;
+        private Exception clrError = null;
+        private IntPtr errorType = IntPtr.Zero;
+        private IntPtr errorValue = IntPtr.Zero;
         
         public ThreadState(PythonMapper mapper)
         {
+            // not freed until the mapper is disposed; once the thread which used
+            // it is dead, the mapper hands it on to another thread
             this.mapper = mapper;
             uint size = (uint)Marshal.SizeOf(typeof(PyThreadState));
-            this.ptr = this.mapper.PyMem_Malloc(size); // leaka leaka leaka
+            this.ptr = this.mapper.PyMem_Malloc(size);
             CPyMarshal.Zero(this.ptr, size);
         }
         
+        public void
+        Reset()
+        {
+            this.LastException = null;
+            CPyMarshal.Zero(this.ptr, Marshal.SizeOf(typeof(PyThreadState)));
+        }
+        
         public IntPtr
         Ptr
         {
             get { return this.ptr; }
         }
         
+        public bool
+        ErrorOccurred
+        {
+            get { return PyThreadStateFields.ReadCurexcType(this.ptr) != IntPtr.Zero; }
+        }
+        
         public object LastException
         {
             get
             {
-                IntPtr typePtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyThreadState), "curexc_type");
+                object error = this.CachedError;
+                if (error != null)
+                {
+                    return error;
+                }
+                
+                IntPtr typePtr = PyThreadStateFields.ReadCurexcType(this.ptr);
                 if (typePtr != IntPtr.Zero)
                 {
+                    object type_ = this.mapper.Retrieve(typePtr);
                     object[] args = new object[0];
-                    IntPtr valuePtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyThreadState), "curexc_value");
+                    IntPtr valuePtr = PyThreadStateFields.ReadCurexcValue(this.ptr);
                     if (valuePtr != IntPtr.Zero)
                     {
-                        args = new object[] { this.mapper.Retrieve(valuePtr) };
+                        object value = this.mapper.Retrieve(valuePtr);
+                        if (PythonCalls.Call(Builtin.type, new object[] { value }) == type_)
+                        {
+                            // already an instance; no need to make another
+                            return value;
+                        }
+                        args = new object[] { value };
                     }
-                    return PythonCalls.Call(this.mapper.Retrieve(typePtr), args);
+                    return PythonCalls.Call(type_, args);
                 }
                 else
                 {
@@ -51,43 +90,115 @@ namespace Ironclad
             }
             set
             {
-                if ((value as Exception) != null)
+                Exception clrError = value as Exception;
+                if (clrError != null)
                 {
-                    value = InappropriateReflection.GetPythonException((Exception)value);
+                    value = InappropriateReflection.GetPythonException(clrError);
                 }
+                this.ForgetError();
                 
-                IntPtr typePtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyThreadState), "curexc_type");
+                IntPtr typePtr = PyThreadStateFields.ReadCurexcType(this.ptr);
                 if (typePtr != IntPtr.Zero)
                 {
                     this.mapper.DecRef(typePtr);
                 }
-                IntPtr valuePtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyThreadState), "curexc_value");
+                IntPtr valuePtr = PyThreadStateFields.ReadCurexcValue(this.ptr);
                 if (valuePtr != IntPtr.Zero)
                 {
                     this.mapper.DecRef(valuePtr);
                 }
-                IntPtr tracebackPtr = CPyMarshal.ReadPtrField(this.ptr, typeof(PyThreadState), "curexc_traceback");
+                IntPtr tracebackPtr = PyThreadStateFields.ReadCurexcTraceback(this.ptr);
                 if (tracebackPtr != IntPtr.Zero)
                 {
                     this.mapper.DecRef(tracebackPtr);
                 }
                 
                 // traceback almost completely ignored in ironclad
-                CPyMarshal.WritePtrField(this.ptr, typeof(PyThreadState), "curexc_traceback", IntPtr.Zero);
+                PyThreadStateFields.WriteCurexcTraceback(this.ptr, IntPtr.Zero);
                 if (value == null)
                 {
-                    CPyMarshal.WritePtrField(this.ptr, typeof(PyThreadState), "curexc_type", IntPtr.Zero);
-                    CPyMarshal.WritePtrField(this.ptr, typeof(PyThreadState), "curexc_value", IntPtr.Zero);
+                    PyThreadStateFields.WriteCurexcType(this.ptr, IntPtr.Zero);
+                    PyThreadStateFields.WriteCurexcValue(this.ptr, IntPtr.Zero);
                 }
                 else
                 {
+                    // C sees the type and the message, as it would after PyErr_SetString.
+                    // Both are built here, because C reads curexc_* directly; but managed
+                    // code which reads the error back gets the original object (above)
                     object excType = PythonCalls.Call(Builtin.type, new object[] { value });
-                    CPyMarshal.WritePtrField(this.ptr, typeof(PyThreadState), "curexc_type", this.mapper.Store(excType));
-                    CPyMarshal.WritePtrField(this.ptr, typeof(PyThreadState), "curexc_value", this.mapper.Store(value.ToString()));
+                    typePtr = this.mapper.Store(excType);
+                    valuePtr = this.mapper.Store(value.ToString());
+                    PyThreadStateFields.WriteCurexcType(this.ptr, typePtr);
+                    PyThreadStateFields.WriteCurexcValue(this.ptr, valuePtr);
+                    this.RememberError(value, clrError, typePtr, valuePtr);
                 }
             }
         }
-
-
+        
+        public Exception
+        TakeException()
+        {
+            // returns the current error as something to throw, and clears it
+            Exception result = null;
+            if (this.CachedError != null && this.clrError != null)
+            {
+                result = this.clrError;
+            }
+            else
+            {
+                PythonExceptions.BaseException error = (PythonExceptions.BaseException)this.LastException;
+                if (error != null)
+                {
+                    result = error.clsException;
+                }
+            }
+            this.LastException = null;
+            return result;
+        }
+        
+        private object
+        CachedError
+        {
+            get
+            {
+                if (this.error == null)
+                {
+                    return null;
+                }
+                if (PyThreadStateFields.ReadCurexcType(this.ptr) == this.errorType &&
+                    PyThreadStateFields.ReadCurexcValue(this.ptr) == this.errorValue)
+                {
+                    return this.error;
+                }
+                this.ForgetError();
+                return null;
+            }
+        }
+        
+        private void
+        RememberError(object error, Exception clrError, IntPtr typePtr, IntPtr valuePtr)
+        {
+            this.mapper.IncRef(typePtr);
+            this.mapper.IncRef(valuePtr);
+            this.error = error;
+            this.clrError = clrError;
+            this.errorType = typePtr;
+            this.errorValue = valuePtr;
+        }
+        
+        private void
+        ForgetError()
+        {
+            if (this.error == null)
+            {
+                return;
+            }
+            this.error = null;
+            this.clrError = null;
+            this.mapper.DecRef(this.errorType);
+            this.mapper.DecRef(this.errorValue);
+            this.errorType = IntPtr.Zero;
+            this.errorValue = IntPtr.Zero;
+        }
     }
 }
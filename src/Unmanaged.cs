@@ -21,18 +21,6 @@ namespace Ironclad
         public static extern uint GetLastError();
         
 
-        [DllImport("kernel32.dll")]
-        public static extern IntPtr CreateMutex(IntPtr lpMutexAttributes, int bInitialOwner, IntPtr lpName);
-        
-        [DllImport("kernel32.dll")]
-        public static extern int WaitForSingleObject(IntPtr hHandle, int dwMilliseconds);
-        
-        [DllImport("kernel32.dll")]
-        public static extern int ReleaseMutex(IntPtr hMutex);
-        
-        [DllImport("kernel32.dll")]
-        public static extern int CloseHandle(IntPtr hObject);
-        
         [DllImport("kernel32.dll")]
         public static extern void DebugBreak();
         
@@ -0,0 +1,75 @@
+using System;
+using System.Collections.Generic;
+
+namespace Ironclad
+{
+    internal class ValueCache<TKey>
+    {
+        // bounded LRU mapping immutable values to the unmanaged objects which represent
+        // them; callers are responsible for the references held on the cached ptrs
+        private int capacity;
+        private Dictionary<TKey, LinkedListNode<KeyValuePair<TKey, IntPtr>>> index =
+            new Dictionary<TKey, LinkedListNode<KeyValuePair<TKey, IntPtr>>>();
+        private LinkedList<KeyValuePair<TKey, IntPtr>> order = new LinkedList<KeyValuePair<TKey, IntPtr>>();
+
+        public ValueCache(int capacity)
+        {
+            this.capacity = capacity;
+        }
+
+        public int
+        Count
+        {
+            get { return this.index.Count; }
+        }
+
+        public bool
+        TryGet(TKey key, out IntPtr ptr)
+        {
+            LinkedListNode<KeyValuePair<TKey, IntPtr>> node;
+            if (this.index.TryGetValue(key, out node))
+            {
+                this.order.Remove(node);
+                this.order.AddFirst(node);
+                ptr = node.Value.Value;
+                return true;
+            }
+            ptr = IntPtr.Zero;
+            return false;
+        }
+
+        public IntPtr
+        Add(TKey key, IntPtr ptr)
+        {
+            // returns the evicted ptr, if any
+            this.index[key] = this.order.AddFirst(new KeyValuePair<TKey, IntPtr>(key, ptr));
+            if (this.index.Count > this.capacity)
+            {
+                return this.RemoveLast();
+            }
+            return IntPtr.Zero;
+        }
+
+        public List<IntPtr>
+        Resize(int capacity)
+        {
+            // returns all evicted ptrs
+            this.capacity = capacity;
+            List<IntPtr> evicted = new List<IntPtr>();
+            while (this.index.Count > this.capacity)
+            {
+                evicted.Add(this.RemoveLast());
+            }
+            return evicted;
+        }
+
+        private IntPtr
+        RemoveLast()
+        {
+            KeyValuePair<TKey, IntPtr> last = this.order.Last.Value;
+            this.order.RemoveLast();
+            this.index.Remove(last.Key);
+            return last.Value;
+        }
+    }
+}
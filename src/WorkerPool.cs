@@ -0,0 +1,224 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.ExceptionServices;
+using System.Threading;
+
+using IronPython.Runtime.Operations;
+
+namespace Ironclad
+{
+    public class Future
+    {
+        // The eventual result of a call submitted to a WorkerPool: either the value it
+        // returned, or the exception it raised.
+        private object waitLock = new object();
+        private bool done = false;
+        private object result = null;
+        private Exception exception = null;
+        private ExceptionDispatchInfo exceptionInfo = null;
+
+        public bool
+        Done
+        {
+            get
+            {
+                lock (this.waitLock)
+                {
+                    return this.done;
+                }
+            }
+        }
+
+        public bool
+        Wait(double timeout)
+        {
+            // a negative timeout waits forever
+            lock (this.waitLock)
+            {
+                if (timeout < 0)
+                {
+                    while (!this.done)
+                    {
+                        Monitor.Wait(this.waitLock);
+                    }
+                    return true;
+                }
+
+                DateTime deadline = DateTime.UtcNow.AddSeconds(timeout);
+                while (!this.done)
+                {
+                    TimeSpan remaining = deadline - DateTime.UtcNow;
+                    if (remaining <= TimeSpan.Zero)
+                    {
+                        return false;
+                    }
+                    Monitor.Wait(this.waitLock, remaining);
+                }
+                return true;
+            }
+        }
+
+        public object
+        Result
+        {
+            get
+            {
+                this.Wait(-1);
+                if (this.exceptionInfo != null)
+                {
+                    // keeps the stack trace from the worker thread
+                    this.exceptionInfo.Throw();
+                }
+                return this.result;
+            }
+        }
+
+        public Exception
+        Exception
+        {
+            get
+            {
+                this.Wait(-1);
+                return this.exception;
+            }
+        }
+
+        internal void
+        Complete(object result, Exception exception)
+        {
+            lock (this.waitLock)
+            {
+                this.result = result;
+                this.exception = exception;
+                if (exception != null)
+                {
+                    this.exceptionInfo = ExceptionDispatchInfo.Capture(exception);
+                }
+                this.done = true;
+                Monitor.PulseAll(this.waitLock);
+            }
+        }
+    }
+
+
+    public class WorkerPool : IDisposable
+    {
+        // A fixed set of background threads which call Python callables and hand back
+        // Futures. Nothing here touches the GIL: calls into C extensions take it as usual
+        // to marshal their arguments and results, and extensions which release it (with
+        // Py_BEGIN_ALLOW_THREADS) then run concurrently. The threads live as long as the
+        // pool, so the mapper's per-thread state gets reused rather than rebuilt per call.
+        private class WorkItem
+        {
+            public object callable;
+            public object[] args;
+            public Future future = new Future();
+
+            public WorkItem(object callable, object[] args)
+            {
+                this.callable = callable;
+                this.args = args;
+            }
+        }
+
+        private Queue<WorkItem> queue = new Queue<WorkItem>();
+        private Thread[] threads;
+        private bool shutdown = false;
+
+        public WorkerPool(int workers)
+        {
+            if (workers < 1)
+            {
+                throw new ArgumentOutOfRangeException("workers", "a WorkerPool needs at least one worker");
+            }
+            this.threads = new Thread[workers];
+            for (int i = 0; i < workers; i++)
+            {
+                Thread thread = new Thread(this.Work);
+                thread.IsBackground = true;
+                thread.Name = String.Format("ironclad worker {0}", i);
+                this.threads[i] = thread;
+                thread.Start();
+            }
+        }
+
+        public int
+        Workers
+        {
+            get { return this.threads.Length; }
+        }
+
+        public Future
+        Submit(object callable, object[] args)
+        {
+            WorkItem item = new WorkItem(callable, args);
+            lock (this.queue)
+            {
+                if (this.shutdown)
+                {
+                    throw new InvalidOperationException("can't submit work to a WorkerPool which has been shut down");
+                }
+                this.queue.Enqueue(item);
+                Monitor.Pulse(this.queue);
+            }
+            return item.future;
+        }
+
+        public void
+        Shutdown(bool wait)
+        {
+            // work already submitted still gets done
+            lock (this.queue)
+            {
+                this.shutdown = true;
+                Monitor.PulseAll(this.queue);
+            }
+            if (wait)
+            {
+                foreach (Thread thread in this.threads)
+                {
+                    if (thread != Thread.CurrentThread)
+                    {
+                        thread.Join();
+                    }
+                }
+            }
+        }
+
+        public void
+        Dispose()
+        {
+            this.Shutdown(true);
+        }
+
+        private void
+        Work()
+        {
+            while (true)
+            {
+                WorkItem item;
+                lock (this.queue)
+                {
+                    while (this.queue.Count == 0)
+                    {
+                        if (this.shutdown)
+                        {
+                            return;
+                        }
+                        Monitor.Wait(this.queue);
+                    }
+                    item = this.queue.Dequeue();
+                }
+
+                try
+                {
+                    item.future.Complete(PythonCalls.Call(item.callable, item.args), null);
+                }
+                catch (Exception e)
+                {
+                    item.future.Complete(null, e);
+                }
+            }
+        }
+    }
+}
@@ -2,6 +2,7 @@ using System;
 using System.IO;
 using System.Collections.Generic;
 using System.Reflection;
+using System.Runtime.CompilerServices;
 using System.Runtime.InteropServices;
 using System.Threading;
 
@@ -62,18 +63,20 @@ namespace Ironclad
         private bool logErrors = false;
         
         private InterestingPtrMap map = new InterestingPtrMap();
+        private MemoryPressure memoryPressure = new MemoryPressure();
+        private DelegateCache delegates = new DelegateCache();
         private Dictionary<IntPtr, ActualiseDelegate> actualisableTypes = new Dictionary<IntPtr, ActualiseDelegate>();
         private Dictionary<IntPtr, object> classStubs = new Dictionary<IntPtr, object>();
+        private ConditionalWeakTable<object, StrongBox<IntPtr>> instancePtrs = new ConditionalWeakTable<object, StrongBox<IntPtr>>();
         private Dictionary<IntPtr, UnmanagedDataMarker> incompleteObjects = new Dictionary<IntPtr, UnmanagedDataMarker>();
         private Dictionary<IntPtr, List> listsBeingActualised = new Dictionary<IntPtr, List>();
         private Dictionary<string, IntPtr> internedStrings = new Dictionary<string, IntPtr>();
         private Dictionary<IntPtr, IntPtr> FILEs = new Dictionary<IntPtr, IntPtr>();
         private Stack<dgt_void_void> exitfuncs = new Stack<dgt_void_void>();
 
-        private LocalDataStoreSlot _lockCount = Thread.AllocateDataSlot();
-        private LocalDataStoreSlot _threadState = Thread.AllocateDataSlot();
-
-        public Stack<List<IntPtr>> tempObjects = new Stack<List<IntPtr>>();
+        [ThreadStatic] private static ThreadData currentThreadData;
+        private Dictionary<Thread, ThreadData> threadDatas = new Dictionary<Thread, ThreadData>();
+        private Stack<ThreadState> threadStatePool = new Stack<ThreadState>();
 
         // TODO: must be a better way to handle imports...
         // public to allow manipulation from test code
@@ -82,12 +85,12 @@ namespace Ironclad
         
         
         public PythonMapper(CodeContext context): 
-          this(context, null, new HGlobalAllocator())
+          this(context, null, new ArenaAllocator())
         {
         }
         
         public PythonMapper(CodeContext context, string stubPath): 
-          this(context, stubPath, new HGlobalAllocator())
+          this(context, stubPath, new ArenaAllocator())
         {
         }
         
@@ -118,6 +121,7 @@ namespace Ironclad
         private void Init(PythonContext inPython, string stubPath, IAllocator inAllocator)
         {
             this.GIL = new Lock();
+            this.decRefTemp = new PtrFunc(this.DecRef);
             this.python = inPython;
             this.allocator = inAllocator;
             
@@ -159,22 +163,21 @@ namespace Ironclad
             
             try
             {
-                IntPtr typePtr = CPyMarshal.ReadPtrField(ptr, typeof(PyObject), "ob_type");
+                IntPtr typePtr = PyObjectFields.ReadType(ptr);
                 if (typePtr == IntPtr.Zero)
                 {
                     // no type
                     return;
                 }
                 
-                if (CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_dealloc") == IntPtr.Zero)
+                if (PyTypeObjectFields.ReadDealloc(typePtr) == IntPtr.Zero)
                 {
                     // no dealloc function
                     return;
                 }
                 
                 dgt_void_ptr dealloc = (dgt_void_ptr)
-                    CPyMarshal.ReadFunctionPtrField(
-                        typePtr, typeof(PyTypeObject), "tp_dealloc", typeof(dgt_void_ptr));
+                    this.delegates.Get(PyTypeObjectFields.ReadDealloc(typePtr), typeof(dgt_void_ptr));
                 dealloc(ptr);
             }
             
@@ -221,7 +224,11 @@ namespace Ironclad
                 this.map.MapOverBridgePtrs(new PtrFunc(this.DumpPtr));
             }
             
+            this.ForgetValueCache();
+            this.ForgetFreeLists();
+            this.ForgetArgsTuples();
             this.allocator.FreeAll();
+            this.memoryPressure.Reset();
             foreach (IntPtr FILE in this.FILEs.Values)
             {
                 Unmanaged.fclose(FILE);
@@ -241,6 +248,7 @@ namespace Ironclad
                 this.importer.Dispose();
                 this.stub.Dispose();
             }
+            this.delegates.Clear();
         }
         
         public void 
@@ -271,6 +279,32 @@ namespace Ironclad
             set { this.map.GCThreshold = value; }
         }
         
+        public int
+        SweepBudget
+        {
+            get { return this.map.SweepBudget; }
+            set { this.map.SweepBudget = value; }
+        }
+        
+        public int
+        FallbackSweepInterval
+        {
+            get { return this.map.FallbackSweepInterval; }
+            set { this.map.FallbackSweepInterval = value; }
+        }
+        
+        public void
+        AddMemoryPressure(long bytes)
+        {
+            this.memoryPressure.Add(bytes);
+        }
+        
+        public void
+        RemoveMemoryPressure(long bytes)
+        {
+            this.memoryPressure.Remove(bytes);
+        }
+        
         public bool
         LogErrors
         {
@@ -326,15 +360,35 @@ namespace Ironclad
                 return this._Py_NoneStruct;
             }
             
-            if (this.map.HasObj(obj))
+            IntPtr ptr;
+            StrongBox<IntPtr> instancePtr;
+            if (this.instancePtrs.TryGetValue(obj, out instancePtr) && instancePtr.Value != IntPtr.Zero)
+            {
+                // instances of unmanaged types know their own ptrs, and are always
+                // bridge-mapped, so we can bump the refcount directly; only when C
+                // gets its first reference does the instance need strengthening now,
+                // because the next CheckBridgePtrs could be a whole batch away
+                ptr = instancePtr.Value;
+                int count = PyObjectFields.ReadRefcnt(ptr);
+                PyObjectFields.WriteRefcnt(ptr, count + 1);
+                if (count == 1)
+                {
+                    this.map.UpdateStrength(ptr);
+                }
+            }
+            else if (this.map.TryGetPtr(obj, out ptr))
             {
-                IntPtr ptr = this.map.GetPtr(obj);
                 this.IncRef(ptr);
                 GC.KeepAlive(obj); // please test me, if you can work out how to
-                return ptr;
+            }
+            else
+            {
+                ptr = this.StoreDispatch(obj);
             }
             
-            return this.StoreDispatch(obj);
+            // unmanaged code may well change the refcount behind our back
+            this.map.MarkDirty(ptr);
+            return ptr;
         }
         
         
@@ -342,8 +396,8 @@ namespace Ironclad
         StoreObject(object obj)
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.PyBaseObject_Type);
+            PyObjectFields.WriteRefcnt(ptr, 1);
+            PyObjectFields.WriteType(ptr, this.PyBaseObject_Type);
             this.map.Associate(ptr, obj);
             return ptr;
         }
@@ -355,6 +409,34 @@ namespace Ironclad
             this.map.BridgeAssociate(ptr, obj);
         }
         
+        private void
+        StoreInstance(IntPtr ptr, object obj)
+        {
+            this.StoreBridge(ptr, obj);
+            this.instancePtrs.Add(obj, new StrongBox<IntPtr>(ptr));
+        }
+        
+        public void
+        ForgetInstance(object obj)
+        {
+            StrongBox<IntPtr> instancePtr;
+            if (this.instancePtrs.TryGetValue(obj, out instancePtr))
+            {
+                instancePtr.Value = IntPtr.Zero;
+                this.instancePtrs.Remove(obj);
+            }
+        }
+        
+        private void
+        ForgetInstancePtr(object obj, IntPtr ptr)
+        {
+            StrongBox<IntPtr> instancePtr;
+            if (this.instancePtrs.TryGetValue(obj, out instancePtr) && instancePtr.Value == ptr)
+            {
+                this.ForgetInstance(obj);
+            }
+        }
+        
         
         public bool
         HasPtr(IntPtr ptr)
@@ -386,7 +468,7 @@ namespace Ironclad
                 throw new CannotInterpretException("cannot map IntPtr.Zero");
             }
 
-            IntPtr typePtr = CPyMarshal.ReadPtrField(ptr, typeof(PyTypeObject), "ob_type");
+            IntPtr typePtr = PyTypeObjectFields.ReadType(ptr);
             this.AttemptToMap(typePtr);
 
             if (!this.actualisableTypes.ContainsKey(typePtr))
@@ -431,6 +513,8 @@ namespace Ironclad
                 }
             }
             
+            // unmanaged code may have changed the refcount behind our back
+            this.map.MarkDirty(ptr);
             return this.map.GetObj(ptr);
         }
 
@@ -450,7 +534,7 @@ namespace Ironclad
                 this.map.UpdateStrength(ptr);
             }
             
-            return CPyMarshal.ReadIntField(ptr, typeof(PyObject), "ob_refcnt");
+            return PyObjectFields.ReadRefcnt(ptr);
         }
         
         public void 
@@ -464,8 +548,8 @@ namespace Ironclad
                     "IncRef: missing key in pointer map: {0}", ptr.ToString("x")));
             }
             
-            int count = CPyMarshal.ReadIntField(ptr, typeof(PyObject), "ob_refcnt");
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", count + 1);
+            int count = PyObjectFields.ReadRefcnt(ptr);
+            PyObjectFields.WriteRefcnt(ptr, count + 1);
             
             if (this.map.HasPtr(ptr))
             {
@@ -484,33 +568,33 @@ namespace Ironclad
                     "DecRef: missing key in pointer map: {0}", ptr.ToString("x")));
             }
             
-            int count = CPyMarshal.ReadIntField(ptr, typeof(PyObject), "ob_refcnt");
+            int count = PyObjectFields.ReadRefcnt(ptr);
             if (count == 0)
             {
                 throw new BadRefCountException("Trying to DecRef an object with ref count 0");
             }
             else if (count == 1)
             {
-                IntPtr typePtr = CPyMarshal.ReadPtrField(ptr, typeof(PyObject), "ob_type");
+                IntPtr typePtr = PyObjectFields.ReadType(ptr);
                 if (typePtr == IntPtr.Zero)
                 {
                     throw new CannotInterpretException(String.Format(
                         "Cannot destroy object at {0}: null type", ptr.ToString("x")));
                 }
                 
-                if (CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_dealloc") == IntPtr.Zero)
+                if (PyTypeObjectFields.ReadDealloc(typePtr) == IntPtr.Zero)
                 {
                     throw new CannotInterpretException(String.Format(
                         "Cannot destroy object at {0} with type at {1}: no dealloc function", ptr.ToString("x"), typePtr.ToString("x")));
                 }
 
-                dgt_void_ptr deallocDgt = (dgt_void_ptr)CPyMarshal.ReadFunctionPtrField(
-                    typePtr, typeof(PyTypeObject), "tp_dealloc", typeof(dgt_void_ptr));
+                dgt_void_ptr deallocDgt = (dgt_void_ptr)this.delegates.Get(
+                    PyTypeObjectFields.ReadDealloc(typePtr), typeof(dgt_void_ptr));
                 deallocDgt(ptr);
             }
             else
             {
-                CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", count - 1);
+                PyObjectFields.WriteRefcnt(ptr, count - 1);
                 if (this.map.HasPtr(ptr))
                 {
                     this.map.UpdateStrength(ptr);
@@ -570,6 +654,12 @@ namespace Ironclad
             // TODO: very badly tested (things break fast if this isn't here, but...)
             if (this.map.HasPtr(ptr))
             {
+                // however the ptr is freed, Store must never write through it again
+                object obj;
+                if (this.map.TryGetObj(ptr, out obj))
+                {
+                    this.ForgetInstancePtr(obj, ptr);
+                }
                 this.map.Release(ptr);
             }
             if (this.incompleteObjects.ContainsKey(ptr))
@@ -580,11 +670,7 @@ namespace Ironclad
 
         public void DecRefLater(IntPtr ptr)
         {
-            if (this.tempObjects.Count > 0) {
-                if (this.tempObjects.Peek() != null) {
-                    this.tempObjects.Peek().Add(ptr);
-                }
-            }
+            this.tempObjects.Add(ptr);
         }
 
         public override int
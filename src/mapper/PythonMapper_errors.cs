@@ -39,9 +39,9 @@ namespace Ironclad
         StoreTyped(PythonExceptions.BaseException exc)
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 1);
+            PyObjectFields.WriteRefcnt(ptr, 1);
             object type_ = PythonCalls.Call(Builtin.type, new object[] { exc });
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.Store(type_));
+            PyObjectFields.WriteType(ptr, this.Store(type_));
             this.map.Associate(ptr, exc);
             return ptr;
         }
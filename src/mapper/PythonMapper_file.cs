@@ -101,11 +101,11 @@ namespace Ironclad
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyFileObject)));
             CPyMarshal.Zero(ptr, Marshal.SizeOf(typeof(PyFileObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.PyFile_Type);
-            CPyMarshal.WriteIntField(ptr, typeof(PyFileObject), "f_fp", -2);
-            CPyMarshal.WritePtrField(ptr, typeof(PyFileObject), "f_name", this.Store(obj.name));
-            CPyMarshal.WritePtrField(ptr, typeof(PyFileObject), "f_mode", this.Store(obj.mode));
+            PyObjectFields.WriteRefcnt(ptr, 1);
+            PyObjectFields.WriteType(ptr, this.PyFile_Type);
+            PyFileObjectFields.WriteFp(ptr, (IntPtr)(-2));
+            PyFileObjectFields.WriteName(ptr, this.Store(obj.name));
+            PyFileObjectFields.WriteMode(ptr, this.Store(obj.mode));
             this.map.Associate(ptr, obj);
             return ptr;
         }
@@ -118,10 +118,9 @@ namespace Ironclad
                 Unmanaged.fclose(this.FILEs[ptr]);
                 this.FILEs.Remove(ptr);
             }
-            IntPtr _type = CPyMarshal.ReadPtrField(ptr, typeof(PyObject), "ob_type");
+            IntPtr _type = PyObjectFields.ReadType(ptr);
             dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    _type, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
+                this.delegates.Get(PyTypeObjectFields.ReadFree(_type), typeof(dgt_void_ptr));
             freeDgt(ptr);
         }
         
@@ -0,0 +1,179 @@
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+
+using Ironclad.Structs;
+
+namespace Ironclad
+{
+    public partial class PythonMapper : PythonApi
+    {
+        // Like CPython's free lists: small tuples, ints, floats and bound methods are
+        // created and destroyed constantly, so we keep up to freeListLimit deallocated
+        // objects of each kind (and of each tuple length) around for reuse, rather than
+        // going back to the allocator every time. Objects are only recycled when their
+        // type's tp_free is still our own PyObject_Free.
+        public const int MAX_FREE_TUPLE_LENGTH = 20;
+
+        private int freeListLimit = 0;
+        private Stack<IntPtr>[] tupleFreeLists = new Stack<IntPtr>[MAX_FREE_TUPLE_LENGTH + 1];
+        private Stack<IntPtr> intFreeList = new Stack<IntPtr>();
+        private Stack<IntPtr> floatFreeList = new Stack<IntPtr>();
+        private Stack<IntPtr> methodFreeList = new Stack<IntPtr>();
+        private IntPtr pyObjectFreePtr = IntPtr.Zero;
+
+        public int
+        FreeListLimit
+        {
+            get { return this.freeListLimit; }
+            set
+            {
+                this.GIL.Acquire();
+                try
+                {
+                    this.freeListLimit = Math.Max(value, 0);
+                    foreach (Stack<IntPtr> freeList in this.AllFreeLists())
+                    {
+                        this.TrimFreeList(freeList, this.freeListLimit);
+                    }
+                }
+                finally
+                {
+                    this.GIL.Release();
+                }
+            }
+        }
+
+        public int
+        FreeListCount
+        {
+            get
+            {
+                int count = 0;
+                foreach (Stack<IntPtr> freeList in this.AllFreeLists())
+                {
+                    count += freeList.Count;
+                }
+                return count;
+            }
+        }
+
+        private IEnumerable<Stack<IntPtr>>
+        AllFreeLists()
+        {
+            foreach (Stack<IntPtr> freeList in this.tupleFreeLists)
+            {
+                if (freeList != null)
+                {
+                    yield return freeList;
+                }
+            }
+            yield return this.intFreeList;
+            yield return this.floatFreeList;
+            yield return this.methodFreeList;
+        }
+
+        private void
+        TrimFreeList(Stack<IntPtr> freeList, int limit)
+        {
+            while (freeList.Count > limit)
+            {
+                this.allocator.Free(freeList.Pop());
+            }
+        }
+
+        private void
+        ForgetFreeLists()
+        {
+            // the memory is about to go away anyway; don't touch it
+            foreach (Stack<IntPtr> freeList in this.AllFreeLists())
+            {
+                freeList.Clear();
+            }
+        }
+
+        private IntPtr
+        AllocFromFreeList(Stack<IntPtr> freeList, uint size)
+        {
+            if (freeList != null && freeList.Count > 0)
+            {
+                return freeList.Pop();
+            }
+            return this.allocator.Alloc(size);
+        }
+
+        private Stack<IntPtr>
+        TupleFreeList(int length)
+        {
+            if (length < 0 || length > MAX_FREE_TUPLE_LENGTH)
+            {
+                return null;
+            }
+            if (this.tupleFreeLists[length] == null)
+            {
+                this.tupleFreeLists[length] = new Stack<IntPtr>();
+            }
+            return this.tupleFreeLists[length];
+        }
+
+        private Stack<IntPtr>
+        FreeListFor(IntPtr objPtr, IntPtr typePtr)
+        {
+            if (typePtr == this.PyTuple_Type)
+            {
+                return this.TupleFreeList(PyTupleObjectFields.ReadSize(objPtr));
+            }
+            if (typePtr == this.PyInt_Type)
+            {
+                return this.intFreeList;
+            }
+            if (typePtr == this.PyFloat_Type)
+            {
+                return this.floatFreeList;
+            }
+            if (typePtr == this.PyMethod_Type)
+            {
+                return this.methodFreeList;
+            }
+            return null;
+        }
+
+        private bool
+        TryRecycle(IntPtr objPtr, IntPtr typePtr)
+        {
+            if (this.freeListLimit == 0)
+            {
+                return false;
+            }
+            if (this.pyObjectFreePtr == IntPtr.Zero)
+            {
+                this.pyObjectFreePtr = this.GetFuncPtr("PyObject_Free");
+            }
+            if (PyTypeObjectFields.ReadFree(typePtr) != this.pyObjectFreePtr)
+            {
+                return false;
+            }
+
+            Stack<IntPtr> freeList = this.FreeListFor(objPtr, typePtr);
+            if (freeList == null || freeList.Count >= this.freeListLimit)
+            {
+                return false;
+            }
+            this.Unmap(objPtr);
+            freeList.Push(objPtr);
+            return true;
+        }
+
+        private void
+        FreeObject(IntPtr objPtr, IntPtr typePtr)
+        {
+            if (this.TryRecycle(objPtr, typePtr))
+            {
+                return;
+            }
+            dgt_void_ptr freeDgt = (dgt_void_ptr)
+                this.delegates.Get(PyTypeObjectFields.ReadFree(typePtr), typeof(dgt_void_ptr));
+            freeDgt(objPtr);
+        }
+    }
+}
@@ -15,8 +15,8 @@ namespace Ironclad
             uint size = (uint)Marshal.SizeOf(typeof(PyFunctionObject));
             IntPtr ptr = this.allocator.Alloc(size);
             CPyMarshal.Zero(ptr, size);
-            CPyMarshal.WriteIntField(ptr, typeof(PyIntObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyIntObject), "ob_type", this.PyFunction_Type);
+            PyIntObjectFields.WriteRefcnt(ptr, 1);
+            PyIntObjectFields.WriteType(ptr, this.PyFunction_Type);
             this.map.Associate(ptr, func);
             return ptr;
         }
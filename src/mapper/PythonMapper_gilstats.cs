@@ -0,0 +1,107 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Threading;
+
+namespace Ironclad
+{
+    public partial class PythonMapper : PythonApi
+    {
+        // When enabled, every outermost EnsureGIL/ReleaseGIL records how long the thread
+        // waited for the GIL and how long it held it, in that thread's GILStats. All the
+        // bookkeeping happens while the GIL is held, so no further locking is needed.
+        private bool recordGILStats = false;
+        private List<GILStats> allGILStats = new List<GILStats>();
+
+        public bool
+        RecordGILStats
+        {
+            get { return this.recordGILStats; }
+            set { this.recordGILStats = value; }
+        }
+
+        public GILStats[]
+        GetGILStats()
+        {
+            this.GIL.Acquire();
+            try
+            {
+                return this.allGILStats.ToArray();
+            }
+            finally
+            {
+                this.GIL.Release();
+            }
+        }
+
+        public void
+        ResetGILStats()
+        {
+            this.GIL.Acquire();
+            try
+            {
+                foreach (GILStats stats in this.allGILStats)
+                {
+                    stats.Reset();
+                }
+            }
+            finally
+            {
+                this.GIL.Release();
+            }
+        }
+
+        private GILStats
+        gilStats
+        {
+            get
+            {
+                ThreadData threadData = this.threadData;
+                if (threadData.gilStats == null)
+                {
+                    Thread thread = threadData.thread;
+                    threadData.gilStats = new GILStats(thread.ManagedThreadId, thread.Name);
+                    this.allGILStats.Add(threadData.gilStats);
+                }
+                return threadData.gilStats;
+            }
+        }
+
+        private long
+        GILWaitStart()
+        {
+            if (this.recordGILStats)
+            {
+                return Stopwatch.GetTimestamp();
+            }
+            return 0;
+        }
+
+        private void
+        RecordGILAcquired(long waitStart)
+        {
+            if (waitStart != 0)
+            {
+                this.gilStats.RecordAcquire(waitStart, Stopwatch.GetTimestamp());
+            }
+        }
+
+        private void
+        RecordGILReleased()
+        {
+            if (this.recordGILStats)
+            {
+                this.gilStats.RecordRelease(Stopwatch.GetTimestamp());
+            }
+        }
+
+        private void
+        RecordGILSaveThread()
+        {
+            if (this.recordGILStats)
+            {
+                this.gilStats.RecordSaveThread();
+            }
+        }
+    }
+}
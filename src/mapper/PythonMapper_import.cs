@@ -4,6 +4,7 @@ using System.Reflection;
 using System.Collections.Generic;
 
 using IronPython.Hosting;
+using IronPython.Modules;
 using IronPython.Runtime;
 using IronPython.Runtime.Operations;
 using IronPython.Runtime.Types;
@@ -74,9 +75,9 @@ namespace Ironclad
             this.importNames.Push(name);
             try
             {
-                // TODO: there must be a better way to do this
-                return (PythonModule)this.CreateFromSnippet(
-                    String.Format(CodeSnippets.IMPORT_TEMPLATE, name), "_ironclad_module");
+                // __import__ returns the top-level package; we want the module itself
+                Builtin.__import__(this.scratchContext, name, null, null, null, -1);
+                return this.GetModule(name);
             }
             finally
             {
@@ -32,8 +32,7 @@ namespace Ironclad
                 this.allocator.Free(listStruct.ob_item);
             }
             dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    this.PyList_Type, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
+                this.delegates.Get(PyTypeObjectFields.ReadFree(this.PyList_Type), typeof(dgt_void_ptr));
             freeDgt(listPtr);
         }
         
@@ -167,21 +166,21 @@ namespace Ironclad
                 this.DecRef(itemPtr);
                 return -1;
             }
-            IntPtr typePtr = CPyMarshal.ReadPtrField(listPtr, typeof(PyObject), "ob_type");
+            IntPtr typePtr = PyObjectFields.ReadType(listPtr);
             if (typePtr != this.PyList_Type)
             {
                 this.DecRef(itemPtr);
                 return -1;
             }
             
-            uint length = CPyMarshal.ReadUIntField(listPtr, typeof(PyListObject), "ob_size");
+            uint length = (uint)PyListObjectFields.ReadSize(listPtr);
             if (index < 0 || index >= length)
             {
                 this.DecRef(itemPtr);
                 return -1;
             }
             
-            IntPtr dataPtr = CPyMarshal.ReadPtrField(listPtr, typeof(PyListObject), "ob_item");
+            IntPtr dataPtr = PyListObjectFields.ReadItem(listPtr);
             IntPtr oldItemPtrPtr = CPyMarshal.Offset(dataPtr, (int)(index * CPyMarshal.PtrSize));
             IntPtr oldItemPtr = CPyMarshal.ReadPtr(oldItemPtrPtr);
             if (oldItemPtr != IntPtr.Zero)
@@ -260,10 +259,10 @@ namespace Ironclad
             List newList = new List();
             this.listsBeingActualised[ptr] = newList;
             
-            int length = CPyMarshal.ReadIntField(ptr, typeof(PyListObject), "ob_size");
+            int length = PyListObjectFields.ReadSize(ptr);
             if (length != 0)
             {
-                IntPtr itemPtrPtr = CPyMarshal.ReadPtrField(ptr, typeof(PyListObject), "ob_item");
+                IntPtr itemPtrPtr = PyListObjectFields.ReadItem(ptr);
                 for (int i = 0; i < length; i++)
                 {
                     IntPtr itemPtr = CPyMarshal.ReadPtr(itemPtrPtr);
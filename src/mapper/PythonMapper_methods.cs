@@ -35,14 +35,14 @@ namespace Ironclad
         StoreTyped(Method meth)
         {
             uint size = (uint)Marshal.SizeOf(typeof(PyMethodObject));
-            IntPtr methPtr = this.allocator.Alloc(size);
+            IntPtr methPtr = this.AllocFromFreeList(this.methodFreeList, size);
             CPyMarshal.Zero(methPtr, size);
             
-            CPyMarshal.WriteIntField(methPtr, typeof(PyMethodObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(methPtr, typeof(PyMethodObject), "ob_type", this.PyMethod_Type);
-            CPyMarshal.WritePtrField(methPtr, typeof(PyMethodObject), "im_func", this.Store(meth.im_func));
-            CPyMarshal.WritePtrField(methPtr, typeof(PyMethodObject), "im_self", this.Store(meth.im_self));
-            CPyMarshal.WritePtrField(methPtr, typeof(PyMethodObject), "im_class", this.Store(meth.im_class));
+            PyMethodObjectFields.WriteRefcnt(methPtr, 1);
+            PyMethodObjectFields.WriteType(methPtr, this.PyMethod_Type);
+            PyMethodObjectFields.WriteFunc(methPtr, this.Store(meth.im_func));
+            PyMethodObjectFields.WriteSelf(methPtr, this.Store(meth.im_self));
+            PyMethodObjectFields.WriteClass(methPtr, this.Store(meth.im_class));
             
             this.map.Associate(methPtr, meth);
             return methPtr;
@@ -51,15 +51,12 @@ namespace Ironclad
         public override void
         IC_PyMethod_Dealloc(IntPtr objPtr)
         {
-            this.DecRef(CPyMarshal.ReadPtrField(objPtr, typeof(PyMethodObject), "im_func"));
-            this.DecRef(CPyMarshal.ReadPtrField(objPtr, typeof(PyMethodObject), "im_self"));
-            this.DecRef(CPyMarshal.ReadPtrField(objPtr, typeof(PyMethodObject), "im_class"));
+            this.DecRef(PyMethodObjectFields.ReadFunc(objPtr));
+            this.DecRef(PyMethodObjectFields.ReadSelf(objPtr));
+            this.DecRef(PyMethodObjectFields.ReadClass(objPtr));
             
-            IntPtr objType = CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type");
-            dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    objType, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
-            freeDgt(objPtr);
+            IntPtr objType = PyObjectFields.ReadType(objPtr);
+            this.FreeObject(objPtr, objType);
         }
     }
 }
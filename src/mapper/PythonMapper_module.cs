@@ -112,12 +112,10 @@ namespace Ironclad
                 __path__.append(Path.GetDirectoryName(__file__));
             }
             __dict__["__path__"] = __path__;
-            __dict__["_dispatcher"] = new Dispatcher(this, methodTable, selfPtr);
+            Dispatcher dispatcher = new Dispatcher(this, methodTable, selfPtr);
+            __dict__["_dispatcher"] = dispatcher;
 
-            StringBuilder moduleCode = new StringBuilder();
-            moduleCode.Append(CodeSnippets.USEFUL_IMPORTS);
-            CallableBuilder.GenerateFunctions(moduleCode, methodsPtr, methodTable);
-            this.ExecInModule(moduleCode.ToString(), module);
+            CallableBuilder.GenerateFunctions(__dict__, methodsPtr, dispatcher, this.scratchModule.Get__dict__(), name);
             
             return this.Store(module);
         }
@@ -195,6 +193,12 @@ namespace Ironclad
             return this.IC_PyModule_Add(modulePtr, name, value);
         }
 
+        private object
+        CreateClassStub(object metaclass, PythonTuple bases)
+        {
+            return PythonCalls.Call(this.scratchModule.Get__dict__()["_ironclad_create_class_stub"], metaclass, bases);
+        }
+
         private void
         ExecInModule(string code, PythonModule module)
         {
@@ -278,6 +282,7 @@ namespace Ironclad
             this.scratchModule.Get__dict__()["_mapper"] = this;
 
             this.ExecInModule(CodeSnippets.USEFUL_IMPORTS, this.scratchModule);
+            this.ExecInModule(CodeSnippets.CALLABLE_BINDERS_CODE, this.scratchModule);
             this.scratchContext = new ModuleContext(this.scratchModule.Get__dict__(), this.python).GlobalContext;
         }
     }
@@ -239,11 +239,17 @@ namespace Ironclad
         private IntPtr
         StoreTyped(int value)
         {
-            IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyIntObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyIntObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyIntObject), "ob_type", this.PyInt_Type);
-            CPyMarshal.WriteIntField(ptr, typeof(PyIntObject), "ob_ival", value);
+            IntPtr ptr;
+            if (this.TryGetCachedInt(value, out ptr))
+            {
+                return ptr;
+            }
+            ptr = this.AllocFromFreeList(this.intFreeList, (uint)Marshal.SizeOf(typeof(PyIntObject)));
+            PyIntObjectFields.WriteRefcnt(ptr, 1);
+            PyIntObjectFields.WriteType(ptr, this.PyInt_Type);
+            PyIntObjectFields.WriteIval(ptr, value);
             this.map.Associate(ptr, value);
+            this.CacheInt(value, ptr);
             return ptr;
         }
 
@@ -261,8 +267,8 @@ namespace Ironclad
         StoreTyped(BigInteger value)
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.PyLong_Type);
+            PyObjectFields.WriteRefcnt(ptr, 1);
+            PyObjectFields.WriteType(ptr, this.PyLong_Type);
             this.map.Associate(ptr, value);
             return ptr;
         }
@@ -270,11 +276,17 @@ namespace Ironclad
         private IntPtr
         StoreTyped(double value)
         {
-            IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyFloatObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyFloatObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyFloatObject), "ob_type", this.PyFloat_Type);
-            CPyMarshal.WriteDoubleField(ptr, typeof(PyFloatObject), "ob_fval", value);
+            IntPtr ptr;
+            if (this.TryGetCachedFloat(value, out ptr))
+            {
+                return ptr;
+            }
+            ptr = this.AllocFromFreeList(this.floatFreeList, (uint)Marshal.SizeOf(typeof(PyFloatObject)));
+            PyFloatObjectFields.WriteRefcnt(ptr, 1);
+            PyFloatObjectFields.WriteType(ptr, this.PyFloat_Type);
+            PyFloatObjectFields.WriteFval(ptr, value);
             this.map.Associate(ptr, value);
+            this.CacheFloat(value, ptr);
             return ptr;
         }
 
@@ -282,11 +294,11 @@ namespace Ironclad
         StoreTyped(Complex value)
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PyComplexObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PyComplexObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyComplexObject), "ob_type", this.PyComplex_Type);
-            IntPtr cpxptr = CPyMarshal.GetField(ptr, typeof(PyComplexObject), "cval");
-            CPyMarshal.WriteDoubleField(cpxptr, typeof(Py_complex), "real", value.Real);
-            CPyMarshal.WriteDoubleField(cpxptr, typeof(Py_complex), "imag", value.Imaginary);
+            PyComplexObjectFields.WriteRefcnt(ptr, 1);
+            PyComplexObjectFields.WriteType(ptr, this.PyComplex_Type);
+            IntPtr cpxptr = CPyMarshal.Offset(ptr, PyComplexObjectFields.cval);
+            Py_complexFields.WriteReal(cpxptr, value.Real);
+            Py_complexFields.WriteImag(cpxptr, value.Imaginary);
             this.map.Associate(ptr, value);
             return ptr;
         }
@@ -19,7 +19,7 @@ namespace Ironclad
         public override IntPtr
         _PyObject_New(IntPtr typePtr)
         {
-            uint tp_basicsize = CPyMarshal.ReadUIntField(typePtr, typeof(PyTypeObject), "tp_basicsize");
+            uint tp_basicsize = (uint)PyTypeObjectFields.ReadBasicsize(typePtr);
             IntPtr objPtr = this.allocator.Alloc(tp_basicsize);
             CPyMarshal.Zero(objPtr, tp_basicsize);
             return this.PyObject_Init(objPtr, typePtr);
@@ -28,8 +28,8 @@ namespace Ironclad
         public override IntPtr
         _PyObject_NewVar(IntPtr typePtr, int nitems)
         {
-            int tp_basicsize = CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_basicsize");
-            int tp_itemsize = CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_itemsize");
+            int tp_basicsize = PyTypeObjectFields.ReadBasicsize(typePtr);
+            int tp_itemsize = PyTypeObjectFields.ReadItemsize(typePtr);
             uint size = (uint)(tp_basicsize + nitems * tp_itemsize);
             IntPtr objPtr = this.allocator.Alloc(size);
             CPyMarshal.Zero(objPtr, size);
@@ -39,8 +39,8 @@ namespace Ironclad
         public override IntPtr
         PyObject_Init(IntPtr objPtr, IntPtr typePtr)
         {
-            CPyMarshal.WriteIntField(objPtr, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(objPtr, typeof(PyObject), "ob_type", typePtr);
+            PyObjectFields.WriteRefcnt(objPtr, 1);
+            PyObjectFields.WriteType(objPtr, typePtr);
             return objPtr;
         }
         
@@ -53,26 +53,22 @@ namespace Ironclad
         public override void 
         IC_PyBaseObject_Dealloc(IntPtr objPtr)
         {
-            IntPtr objType = CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type");
-            dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    objType, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
-            freeDgt(objPtr);
+            IntPtr objType = PyObjectFields.ReadType(objPtr);
+            this.FreeObject(objPtr, objType);
         }
         
         public override void
         IC_PyInstance_Dealloc(IntPtr objPtr)
         {
-            IntPtr dictPtr = CPyMarshal.ReadPtrField(objPtr, typeof(PyInstanceObject), "in_dict");
+            IntPtr dictPtr = PyInstanceObjectFields.ReadDict(objPtr);
             if (dictPtr != IntPtr.Zero)
             {
                 this.DecRef(dictPtr);
             }
             
-            IntPtr objType = CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type");
+            IntPtr objType = PyObjectFields.ReadType(objPtr);
             dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    objType, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
+                this.delegates.Get(PyTypeObjectFields.ReadFree(objType), typeof(dgt_void_ptr));
             freeDgt(objPtr);
         }
         
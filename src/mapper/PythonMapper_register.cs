@@ -87,7 +87,7 @@ namespace Ironclad
             // not quite trivial to autogenerate
             // (but surely there's a better way to get the Ellipsis object...)
             CPyMarshal.Zero(address, Marshal.SizeOf(typeof(PyTypeObject)));
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "ob_refcnt", 1);
+            PyTypeObjectFields.WriteRefcnt(address, 1);
             CPyMarshal.WriteCStringField(address, typeof(PyTypeObject), "tp_name", "ellipsis");
             object ellipsisType = PythonCalls.Call(Builtin.type, new object[] { PythonOps.Ellipsis });
             this.map.Associate(address, ellipsisType);
@@ -99,7 +99,7 @@ namespace Ironclad
             // not quite trivial to autogenerate
             // (but surely there's a better way to get the NotImplemented object...)
             CPyMarshal.Zero(address, Marshal.SizeOf(typeof(PyTypeObject)));
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "ob_refcnt", 1);
+            PyTypeObjectFields.WriteRefcnt(address, 1);
             CPyMarshal.WriteCStringField(address, typeof(PyTypeObject), "tp_name", "NotImplementedType");
             object notImplementedType = PythonCalls.Call(Builtin.type, new object[] { PythonOps.NotImplemented });
             this.map.Associate(address, notImplementedType);
@@ -110,8 +110,8 @@ namespace Ironclad
         {
             // not quite trivial to autogenerate
             CPyMarshal.Zero(address, Marshal.SizeOf(typeof(PyTypeObject)));
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(address, typeof(PyTypeObject), "tp_base", this.PyInt_Type);
+            PyTypeObjectFields.WriteRefcnt(address, 1);
+            PyTypeObjectFields.WriteBase(address, this.PyInt_Type);
             CPyMarshal.WriteCStringField(address, typeof(PyTypeObject), "tp_name", "bool");
             this.map.Associate(address, TypeCache.Boolean);
         }
@@ -121,29 +121,29 @@ namespace Ironclad
         {
             // not quite trivial to autogenerate
             CPyMarshal.Zero(address, Marshal.SizeOf(typeof(PyTypeObject)));
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "ob_refcnt", 1);
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "tp_basicsize", Marshal.SizeOf(typeof(PyStringObject)) - 1);
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "tp_itemsize", 1);
+            PyTypeObjectFields.WriteRefcnt(address, 1);
+            PyTypeObjectFields.WriteBasicsize(address, Marshal.SizeOf(typeof(PyStringObject)) - 1);
+            PyTypeObjectFields.WriteItemsize(address, 1);
             CPyMarshal.WriteCStringField(address, typeof(PyTypeObject), "tp_name", "str");
-            CPyMarshal.WritePtrField(address, typeof(PyTypeObject), "tp_str", this.GetFuncPtr("IC_PyString_Str"));
-            CPyMarshal.WritePtrField(address, typeof(PyTypeObject), "tp_repr", this.GetFuncPtr("PyObject_Repr"));
+            PyTypeObjectFields.WriteStr(address, this.GetFuncPtr("IC_PyString_Str"));
+            PyTypeObjectFields.WriteRepr(address, this.GetFuncPtr("PyObject_Repr"));
 
             uint sqSize = (uint)Marshal.SizeOf(typeof(PySequenceMethods));
             IntPtr sqPtr = this.allocator.Alloc(sqSize);
             CPyMarshal.Zero(sqPtr, sqSize);
-            CPyMarshal.WritePtrField(sqPtr, typeof(PySequenceMethods), "sq_concat", this.GetFuncPtr("IC_PyString_Concat_Core"));
-            CPyMarshal.WritePtrField(address, typeof(PyTypeObject), "tp_as_sequence", sqPtr);
+            PySequenceMethodsFields.WriteConcat(sqPtr, this.GetFuncPtr("IC_PyString_Concat_Core"));
+            PyTypeObjectFields.WriteAsSequence(address, sqPtr);
 
             uint bfSize = (uint)Marshal.SizeOf(typeof(PyBufferProcs));
             IntPtr bfPtr = this.allocator.Alloc(bfSize);
             CPyMarshal.Zero(bfPtr, bfSize);
-            CPyMarshal.WritePtrField(bfPtr, typeof(PyBufferProcs), "bf_getreadbuffer", this.GetFuncPtr("IC_str_getreadbuffer"));
-            CPyMarshal.WritePtrField(bfPtr, typeof(PyBufferProcs), "bf_getwritebuffer", this.GetFuncPtr("IC_str_getwritebuffer"));
-            CPyMarshal.WritePtrField(bfPtr, typeof(PyBufferProcs), "bf_getsegcount", this.GetFuncPtr("IC_str_getsegcount"));
-            CPyMarshal.WritePtrField(bfPtr, typeof(PyBufferProcs), "bf_getcharbuffer", this.GetFuncPtr("IC_str_getreadbuffer"));
-            CPyMarshal.WritePtrField(address, typeof(PyTypeObject), "tp_as_buffer", bfPtr);
+            PyBufferProcsFields.WriteGetreadbuffer(bfPtr, this.GetFuncPtr("IC_str_getreadbuffer"));
+            PyBufferProcsFields.WriteGetwritebuffer(bfPtr, this.GetFuncPtr("IC_str_getwritebuffer"));
+            PyBufferProcsFields.WriteGetsegcount(bfPtr, this.GetFuncPtr("IC_str_getsegcount"));
+            PyBufferProcsFields.WriteGetcharbuffer(bfPtr, this.GetFuncPtr("IC_str_getreadbuffer"));
+            PyTypeObjectFields.WriteAsBuffer(address, bfPtr);
 
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "tp_flags", (Int32)Py_TPFLAGS.HAVE_GETCHARBUFFER);
+            PyTypeObjectFields.WriteFlags(address, (Int32)Py_TPFLAGS.HAVE_GETCHARBUFFER);
 
             this.map.Associate(address, TypeCache.String);
         }
@@ -154,7 +154,7 @@ namespace Ironclad
             // not worth autogenerating
             // we're using the cpy file type by default, with methods patched in C
             // to redirect into C# when ipy files turn up
-            CPyMarshal.WriteIntField(address, typeof(PyTypeObject), "ob_refcnt", 1);
+            PyTypeObjectFields.WriteRefcnt(address, 1);
             CPyMarshal.WriteCStringField(address, typeof(PyTypeObject), "tp_name", "file");
             this.map.Associate(address, TypeCache.PythonFile);
         }
@@ -166,24 +166,24 @@ namespace Ironclad
             IntPtr nmPtr = this.allocator.Alloc(nmSize);
             CPyMarshal.Zero(nmPtr, nmSize);
 
-            CPyMarshal.WritePtrField(nmPtr, typeof(PyNumberMethods), "nb_int", this.GetFuncPtr("PyNumber_Int"));
-            CPyMarshal.WritePtrField(nmPtr, typeof(PyNumberMethods), "nb_long", this.GetFuncPtr("PyNumber_Long"));
-            CPyMarshal.WritePtrField(nmPtr, typeof(PyNumberMethods), "nb_float", this.GetFuncPtr("PyNumber_Float"));
-            CPyMarshal.WritePtrField(nmPtr, typeof(PyNumberMethods), "nb_multiply", this.GetFuncPtr("PyNumber_Multiply"));
+            PyNumberMethodsFields.WriteInt(nmPtr, this.GetFuncPtr("PyNumber_Int"));
+            PyNumberMethodsFields.WriteLong(nmPtr, this.GetFuncPtr("PyNumber_Long"));
+            PyNumberMethodsFields.WriteFloat(nmPtr, this.GetFuncPtr("PyNumber_Float"));
+            PyNumberMethodsFields.WriteMultiply(nmPtr, this.GetFuncPtr("PyNumber_Multiply"));
 
-            CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_as_number", nmPtr);
+            PyTypeObjectFields.WriteAsNumber(typePtr, nmPtr);
         }
 
         private void
         AddNumberMethodsWithIndex(IntPtr typePtr)
         {
             this.AddNumberMethodsWithoutIndex(typePtr);
-            IntPtr nmPtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_as_number");
-            CPyMarshal.WritePtrField(nmPtr, typeof(PyNumberMethods), "nb_index", this.GetFuncPtr("PyNumber_Index"));
+            IntPtr nmPtr = PyTypeObjectFields.ReadAsNumber(typePtr);
+            PyNumberMethodsFields.WriteIndex(nmPtr, this.GetFuncPtr("PyNumber_Index"));
 
-            Py_TPFLAGS flags = (Py_TPFLAGS)CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_flags");
+            Py_TPFLAGS flags = (Py_TPFLAGS)PyTypeObjectFields.ReadFlags(typePtr);
             flags |= Py_TPFLAGS.HAVE_INDEX;
-            CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), "tp_flags", (Int32)flags);
+            PyTypeObjectFields.WriteFlags(typePtr, (Int32)flags);
         }
     }
 }
\ No newline at end of file
@@ -22,27 +22,23 @@ namespace Ironclad
         private object
         GenerateClass(IntPtr typePtr)
         {
-            ClassBuilder cb = new ClassBuilder(typePtr);
+            Dispatcher dispatcher = new Dispatcher(this, new PythonDictionary());
+            ClassBuilder cb = new ClassBuilder(typePtr, dispatcher, this.scratchModule.Get__dict__());
             PythonTuple tp_bases = this.ExtractBases(typePtr);
             foreach (object _base in tp_bases)
             {
                 this.UpdateMethodTableObj(cb.methodTable, _base);
             }
 
-            IntPtr ob_typePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyObject), "ob_type");
+            IntPtr ob_typePtr = PyObjectFields.ReadType(typePtr);
             this.IncRef(ob_typePtr);
             object ob_type = this.Retrieve(ob_typePtr);
 
-            this.scratchModule.Get__dict__()["_ironclad_metaclass"] = ob_type;
-            this.scratchModule.Get__dict__()["_ironclad_bases"] = tp_bases;
-            this.ExecInModule(cb.code.ToString(), this.scratchModule);
-            object klass = this.scratchModule.Get__dict__()["_ironclad_class"];
-            object klass_stub = this.scratchModule.Get__dict__()["_ironclad_class_stub"];
-
-            this.classStubs[typePtr] = klass_stub;
-            Builtin.setattr(this.scratchContext, klass, "_dispatcher", new Dispatcher(this, cb.methodTable));
+            object klass = cb.CreateClass(ob_type, tp_bases);
+            this.classStubs[typePtr] = this.CreateClassStub(ob_type, tp_bases);
+            Builtin.setattr(this.scratchContext, klass, "_dispatcher", dispatcher);
             object typeDict = Builtin.getattr(this.scratchContext, klass, "__dict__");
-            CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_dict", this.Store(typeDict));
+            PyTypeObjectFields.WriteDict(typePtr, this.Store(typeDict));
             return klass;
         }
         
@@ -50,14 +46,14 @@ namespace Ironclad
         ExtractBases(IntPtr typePtr)
         {
             PythonTuple tp_bases = null;
-            IntPtr tp_basesPtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_bases");
+            IntPtr tp_basesPtr = PyTypeObjectFields.ReadBases(typePtr);
             if (tp_basesPtr != IntPtr.Zero)
             {
                 tp_bases = (PythonTuple)this.Retrieve(tp_basesPtr);
             }
             if (tp_bases == null)
             {
-                IntPtr tp_basePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_base");
+                IntPtr tp_basePtr = PyTypeObjectFields.ReadBase(typePtr);
                 tp_bases = new PythonTuple(new object[] { this.Retrieve(tp_basePtr) });
             }
             return tp_bases;
@@ -58,10 +58,10 @@ namespace Ironclad
         {
             try
             {
-                if (CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type") == this.PyTuple_Type)
+                if (PyObjectFields.ReadType(objPtr) == this.PyTuple_Type)
                 {
-                    IntPtr storagePtr = CPyMarshal.Offset(objPtr, Marshal.OffsetOf(typeof(PyTupleObject), "ob_item"));
-                    int size = CPyMarshal.ReadIntField(objPtr, typeof(PyTupleObject), "ob_size");
+                    IntPtr storagePtr = CPyMarshal.Offset(objPtr, PyTupleObjectFields.ob_item);
+                    int size = PyTupleObjectFields.ReadSize(objPtr);
                     if (idx >= size)
                     {
                         throw PythonOps.IndexError("PySequence_GetItem: tuple index {0} out of range", idx);
@@ -69,8 +69,8 @@ namespace Ironclad
                     
                     IntPtr slotPtr = CPyMarshal.Offset(storagePtr, idx * CPyMarshal.PtrSize);
                     IntPtr itemPtr =  CPyMarshal.ReadPtr(slotPtr);
-                    uint refcnt = CPyMarshal.ReadUIntField(itemPtr, typeof(PyObject), "ob_refcnt");
-                    CPyMarshal.WriteUIntField(itemPtr, typeof(PyObject), "ob_refcnt", refcnt + 1);
+                    int refcnt = PyObjectFields.ReadRefcnt(itemPtr);
+                    PyObjectFields.WriteRefcnt(itemPtr, refcnt + 1);
                     return itemPtr;
                 }
             
@@ -94,11 +94,11 @@ namespace Ironclad
         {
             try
             {
-                IntPtr typePtr = CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type");
+                IntPtr typePtr = PyObjectFields.ReadType(objPtr);
                 if (typePtr == this.PyList_Type)
                 {
                     int newIdx = idx;
-                    int length = CPyMarshal.ReadIntField(objPtr, typeof(PyListObject), "ob_size");
+                    int length = PyListObjectFields.ReadSize(objPtr);
                     if (newIdx < 0)
                     {
                         newIdx += length;
@@ -152,15 +152,14 @@ namespace Ironclad
         {
             try
             {
-                IntPtr typePtr = CPyMarshal.ReadPtrField(objPtr, typeof(PyObject), "ob_type");
-                IntPtr seqPtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_as_sequence");
+                IntPtr typePtr = PyObjectFields.ReadType(objPtr);
+                IntPtr seqPtr = PyTypeObjectFields.ReadAsSequence(typePtr);
                 if (seqPtr != IntPtr.Zero)
                 {
-                    IntPtr sq_repeat = CPyMarshal.ReadPtrField(seqPtr, typeof(PySequenceMethods), "sq_repeat");
+                    IntPtr sq_repeat = PySequenceMethodsFields.ReadRepeat(seqPtr);
                     if(sq_repeat != IntPtr.Zero)
                     {
-                        dgt_ptr_ptrint dgt = (dgt_ptr_ptrint)CPyMarshal.ReadFunctionPtrField(
-                            seqPtr, typeof(PySequenceMethods), "sq_repeat", typeof(dgt_ptr_ptrint));
+                        dgt_ptr_ptrint dgt = (dgt_ptr_ptrint)this.delegates.Get(sq_repeat, typeof(dgt_ptr_ptrint));
                         return dgt(objPtr, count);
                     }
                 }
@@ -218,7 +217,7 @@ namespace Ironclad
         {
             try
             {
-                if (CPyMarshal.ReadPtrField(seqPtr, typeof(PyObject), "ob_type") == this.PyTuple_Type)
+                if (PyObjectFields.ReadType(seqPtr) == this.PyTuple_Type)
                 {
                     this.IncRef(seqPtr);
                     return seqPtr;
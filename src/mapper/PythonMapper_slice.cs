@@ -13,11 +13,11 @@ namespace Ironclad
         StoreTyped(Slice slice)
         {
             IntPtr ptr = this.allocator.Alloc((uint)Marshal.SizeOf(typeof(PySliceObject)));
-            CPyMarshal.WriteIntField(ptr, typeof(PySliceObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PySliceObject), "ob_type", this.PySlice_Type);
-            CPyMarshal.WritePtrField(ptr, typeof(PySliceObject), "start", this.Store(slice.start));
-            CPyMarshal.WritePtrField(ptr, typeof(PySliceObject), "stop", this.Store(slice.stop));
-            CPyMarshal.WritePtrField(ptr, typeof(PySliceObject), "step", this.Store(slice.step));
+            PySliceObjectFields.WriteRefcnt(ptr, 1);
+            PySliceObjectFields.WriteType(ptr, this.PySlice_Type);
+            PySliceObjectFields.WriteStart(ptr, this.Store(slice.start));
+            PySliceObjectFields.WriteStop(ptr, this.Store(slice.stop));
+            PySliceObjectFields.WriteStep(ptr, this.Store(slice.step));
             this.map.Associate(ptr, slice);
             return ptr;
         }
@@ -25,13 +25,12 @@ namespace Ironclad
         public override void
         IC_PySlice_Dealloc(IntPtr slicePtr)
         {
-            this.DecRef(CPyMarshal.ReadPtrField(slicePtr, typeof(PySliceObject), "start"));
-            this.DecRef(CPyMarshal.ReadPtrField(slicePtr, typeof(PySliceObject), "stop"));
-            this.DecRef(CPyMarshal.ReadPtrField(slicePtr, typeof(PySliceObject), "step"));
+            this.DecRef(PySliceObjectFields.ReadStart(slicePtr));
+            this.DecRef(PySliceObjectFields.ReadStop(slicePtr));
+            this.DecRef(PySliceObjectFields.ReadStep(slicePtr));
 
             dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    this.PySlice_Type, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
+                this.delegates.Get(PyTypeObjectFields.ReadFree(this.PySlice_Type), typeof(dgt_void_ptr));
             freeDgt(slicePtr);
         }
 
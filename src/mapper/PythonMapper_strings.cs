@@ -70,10 +70,7 @@ namespace Ironclad
             }
             byte[] bytes = new byte[bytesList.Count];
             bytesList.CopyTo(bytes);
-            // note: NOT Associate
-            // couldn't figure out to test this directly
-            // without this, h5py tests get horribly screwy in PHIL contextmanager
-            return this.Store(this.StringFromBytes(bytes));
+            return this.StoreFreshString(bytes);
         }
         
         public override IntPtr
@@ -89,10 +86,7 @@ namespace Ironclad
             {
                 byte[] bytes = new byte[length];
                 Marshal.Copy(stringData, bytes, 0, length);
-                // note: NOT Associate
-                // couldn't figure out to test this directly
-                // without this, h5py tests get horribly screwy in PHIL contextmanager
-                return this.Store(this.StringFromBytes(bytes));
+                return this.StoreFreshString(bytes);
             }
         }
 
@@ -135,11 +129,11 @@ namespace Ironclad
         {
             try
             {
-                if (CPyMarshal.ReadPtrField(strPtr, typeof(PyObject), "ob_type") != this.PyString_Type)
+                if (PyObjectFields.ReadType(strPtr) != this.PyString_Type)
                 {
                     throw PythonOps.TypeError("PyString_AsString: not a string");
                 }
-                return CPyMarshal.Offset(strPtr, Marshal.OffsetOf(typeof(PyStringObject), "ob_sval"));
+                return CPyMarshal.Offset(strPtr, PyStringObjectFields.ob_sval);
             }
             catch (Exception e)
             {
@@ -153,15 +147,15 @@ namespace Ironclad
         {
             try
             {
-                if (CPyMarshal.ReadPtrField(strPtr, typeof(PyObject), "ob_type") != this.PyString_Type)
+                if (PyObjectFields.ReadType(strPtr) != this.PyString_Type)
                 {
                     throw PythonOps.TypeError("PyString_AsStringAndSize: not a string");
                 }
                 
-                IntPtr dataPtr = CPyMarshal.GetField(strPtr, typeof(PyStringObject), "ob_sval");
+                IntPtr dataPtr = CPyMarshal.Offset(strPtr, PyStringObjectFields.ob_sval);
                 CPyMarshal.WritePtr(dataPtrPtr, dataPtr);
                 
-                int length = CPyMarshal.ReadIntField(strPtr, typeof(PyStringObject), "ob_size");
+                int length = PyStringObjectFields.ReadSize(strPtr);
                 if (sizePtr == IntPtr.Zero)
                 {
                     for (int i = 0; i < length; ++i)
@@ -224,9 +218,9 @@ namespace Ironclad
         private int
         IC__PyString_Resize_NoGrow(IntPtr strPtr, int newSize)
         {
-            CPyMarshal.WriteIntField(strPtr, typeof(PyStringObject), "ob_size", newSize);
+            PyStringObjectFields.WriteSize(strPtr, newSize);
             IntPtr bufPtr = CPyMarshal.Offset(
-                strPtr, Marshal.OffsetOf(typeof(PyStringObject), "ob_sval"));
+                strPtr, PyStringObjectFields.ob_sval);
             IntPtr terminatorPtr = CPyMarshal.Offset(
                 bufPtr, newSize);
             CPyMarshal.WriteByte(terminatorPtr, 0);
@@ -238,7 +232,22 @@ namespace Ironclad
         _PyString_Resize(IntPtr strPtrPtr, int newSize)
         {
             IntPtr strPtr = CPyMarshal.ReadPtr(strPtrPtr);
-            int size = CPyMarshal.ReadIntField(strPtr, typeof(PyStringObject), "ob_size");
+            if (PyObjectFields.ReadRefcnt(strPtr) != 1)
+            {
+                // someone else can see this string, so it mustn't change under them
+                CPyMarshal.WritePtr(strPtrPtr, IntPtr.Zero);
+                this.DecRef(strPtr);
+                this.LastException = PythonOps.SystemError("_PyString_Resize: string is shared");
+                return -1;
+            }
+            if (!this.incompleteObjects.ContainsKey(strPtr))
+            {
+                // the managed string no longer matches; read it again from the resized data
+                this.Unmap(strPtr);
+                this.incompleteObjects[strPtr] = UnmanagedDataMarker.PyStringObject;
+            }
+            
+            int size = PyStringObjectFields.ReadSize(strPtr);
             if (size < newSize)
             {
                 return this.IC__PyString_Resize_Grow(strPtrPtr, newSize);
@@ -252,7 +261,7 @@ namespace Ironclad
         public override int
         PyString_Size(IntPtr strPtr)
         {
-            return CPyMarshal.ReadIntField(strPtr, typeof(PyStringObject), "ob_size");
+            return PyStringObjectFields.ReadSize(strPtr);
         }
         
         private IntPtr 
@@ -300,32 +309,48 @@ namespace Ironclad
         {
             IntPtr strPtr = this.AllocPyString(bytes.Length);
             IntPtr bufPtr = CPyMarshal.Offset(
-                strPtr, Marshal.OffsetOf(typeof(PyStringObject), "ob_sval"));
+                strPtr, PyStringObjectFields.ob_sval);
             Marshal.Copy(bytes, 0, bufPtr, bytes.Length);
             return strPtr;
         }
         
+        private IntPtr
+        StoreFreshString(byte[] bytes)
+        {
+            // C may resize whatever it creates, so it always gets a new object,
+            // never one from the value cache
+            IntPtr strPtr = this.CreatePyStringWithBytes(bytes);
+            this.map.Associate(strPtr, this.StringFromBytes(bytes));
+            return strPtr;
+        }
+        
         private IntPtr
         StoreTyped(string str)
         {
+            IntPtr strPtr;
+            if (this.TryGetCachedString(str, out strPtr))
+            {
+                return strPtr;
+            }
             char[] chars = str.ToCharArray();
             byte[] bytes = Array.ConvertAll<char, byte>(
                 chars, new Converter<char, byte>(ByteFromChar));
-            IntPtr strPtr = this.CreatePyStringWithBytes(bytes);
+            strPtr = this.CreatePyStringWithBytes(bytes);
             this.map.Associate(strPtr, str);
+            this.CacheString(str, strPtr);
             return strPtr;
         }
 
         private string
         ReadPyString(IntPtr ptr)
         {
-            IntPtr typePtr = CPyMarshal.ReadPtrField(ptr, typeof(PyObject), "ob_type");
+            IntPtr typePtr = PyObjectFields.ReadType(ptr);
             if (PyType_IsSubtype(typePtr, this.PyString_Type) == 0)
             {
                 throw new ArgumentTypeException("ReadPyString: Expected a str, or subclass thereof");
             }
-            IntPtr buffer = CPyMarshal.Offset(ptr, Marshal.OffsetOf(typeof(PyStringObject), "ob_sval"));
-            int length = CPyMarshal.ReadIntField(ptr, typeof(PyStringObject), "ob_size");
+            IntPtr buffer = CPyMarshal.Offset(ptr, PyStringObjectFields.ob_sval);
+            int length = PyStringObjectFields.ReadSize(ptr);
             byte[] bytes = new byte[length];
             Marshal.Copy(buffer, bytes, 0, length);
             char[] chars = Array.ConvertAll<byte, char>(
@@ -365,7 +390,7 @@ namespace Ironclad
                 return -1;
             }
             
-            IntPtr bufPtr = CPyMarshal.GetField(strPtr, typeof(PyStringObject), "ob_sval");
+            IntPtr bufPtr = CPyMarshal.Offset(strPtr, PyStringObjectFields.ob_sval);
             CPyMarshal.WritePtr(bufPtrPtr, bufPtr);
             
             return this.PyString_Size(strPtr);
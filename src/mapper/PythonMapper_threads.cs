@@ -10,33 +10,141 @@ namespace Ironclad
 {
     public partial class PythonMapper : PythonApi
     {
+        public const int GIL_BATCH_TEMP_LIMIT = 1000;
+
+        // GIL.CountAcquired at the start of the outermost batch, or 0
+        private int gilBatchCount = 0;
+        private PtrFunc decRefTemp;
+
+        private ThreadData
+        threadData
+        {
+            get
+            {
+                // most of the time, the current thread only ever talks to one mapper
+                ThreadData threadData = currentThreadData;
+                if (threadData == null || threadData.mapper != this)
+                {
+                    threadData = this.GetThreadData();
+                    currentThreadData = threadData;
+                }
+                return threadData;
+            }
+        }
+
+        private ThreadData
+        GetThreadData()
+        {
+            Thread thread = Thread.CurrentThread;
+            lock (this.threadDatas)
+            {
+                ThreadData threadData;
+                if (!this.threadDatas.TryGetValue(thread, out threadData))
+                {
+                    threadData = new ThreadData(this, thread);
+                    this.threadDatas[thread] = threadData;
+                }
+                return threadData;
+            }
+        }
+
         private Counter
         lockCount
+        {
+            get { return this.threadData.lockCount; }
+        }
+
+        private TempObjectScopes
+        tempObjects
+        {
+            get { return this.threadData.tempObjects; }
+        }
+
+        private ThreadState
+        threadState
         {
             get
             {
-                Counter lockCount = (Counter)Thread.GetData(this._lockCount);
-                if (lockCount == null)
+                ThreadData threadData = this.threadData;
+                if (threadData.threadState == null)
                 {
-                    lockCount = new Counter();
-                    Thread.SetData(this._lockCount, lockCount);
+                    threadData.threadState = this.AllocThreadState();
                 }
-                return lockCount;
+                return threadData.threadState;
             }
         }
 
         private ThreadState
-        threadState
+        AllocThreadState()
+        {
+            if (this.GIL.IsAcquired)
+            {
+                // we can only clean up after dead threads while we hold the GIL
+                this.ReapDeadThreads();
+            }
+            lock (this.threadDatas)
+            {
+                if (this.threadStatePool.Count > 0)
+                {
+                    return this.threadStatePool.Pop();
+                }
+            }
+            return new ThreadState(this);
+        }
+
+        private void
+        ReapDeadThreads()
+        {
+            List<ThreadData> dead = new List<ThreadData>();
+            lock (this.threadDatas)
+            {
+                foreach (ThreadData threadData in this.threadDatas.Values)
+                {
+                    if (!threadData.thread.IsAlive)
+                    {
+                        dead.Add(threadData);
+                    }
+                }
+                foreach (ThreadData threadData in dead)
+                {
+                    this.threadDatas.Remove(threadData.thread);
+                }
+            }
+            
+            foreach (ThreadData threadData in dead)
+            {
+                if (threadData.gilStats != null)
+                {
+                    this.allGILStats.Remove(threadData.gilStats);
+                }
+                if (threadData.threadState != null)
+                {
+                    threadData.threadState.Reset();
+                    lock (this.threadDatas)
+                    {
+                        this.threadStatePool.Push(threadData.threadState);
+                    }
+                }
+            }
+        }
+
+        public int
+        ThreadStateCount
         {
             get
             {
-                ThreadState threadState = (ThreadState)Thread.GetData(this._threadState);
-                if (threadState == null)
+                lock (this.threadDatas)
                 {
-                    threadState = new ThreadState(this);
-                    Thread.SetData(this._threadState, threadState);
+                    int count = this.threadStatePool.Count;
+                    foreach (ThreadData threadData in this.threadDatas.Values)
+                    {
+                        if (threadData.threadState != null)
+                        {
+                            count += 1;
+                        }
+                    }
+                    return count;
                 }
-                return threadState;
             }
         }
         
@@ -60,37 +168,60 @@ namespace Ironclad
             }
         }
 
+        public bool
+        ErrorOccurred
+        {
+            get
+            {
+                // while we hold the GIL, _PyThreadState_Current is our own thread state,
+                // so we can skip looking it up
+                IntPtr tstate = IntPtr.Zero;
+                if (this.GIL.IsAcquired)
+                {
+                    tstate = CPyMarshal.ReadPtr(this._PyThreadState_Current);
+                }
+                if (tstate == IntPtr.Zero)
+                {
+                    return this.threadState.ErrorOccurred;
+                }
+                return PyThreadStateFields.ReadCurexcType(tstate) != IntPtr.Zero;
+            }
+        }
+
+        public Exception
+        TakeException()
+        {
+            return this.threadState.TakeException();
+        }
+
         public override IntPtr 
         PyThread_allocate_lock()
         {
-            return this.Store(new Lock());
+            return PyThreadLock.Alloc(this.allocator);
         }
 
         public override void 
         PyThread_free_lock(IntPtr lockPtr)
         {
-            Lock lock_ = (Lock)this.Retrieve(lockPtr);
-            lock_.Dispose();
-            this.Unmap(lockPtr);
+            PyThreadLock.Free(this.allocator, lockPtr);
         }
 
         public override int 
         PyThread_acquire_lock(IntPtr lockPtr, int flags)
         {
-            Lock lock_ = (Lock)this.Retrieve(lockPtr);
-            if (lock_.IsAcquired)
+            if (PyThreadLock.IsAcquired(lockPtr))
             {
                 return 0;
             }
             
             if (flags == 1)
             {
-                lock_.Acquire();
+                PyThreadLock.Acquire(lockPtr);
                 return 1;
             }
             else
             {
-                if (lock_.TryAcquire())
+                if (PyThreadLock.TryAcquire(lockPtr))
                 {
                     return 1;
                 }
@@ -101,8 +232,7 @@ namespace Ironclad
         public override void 
         PyThread_release_lock(IntPtr lockPtr)
         {
-            Lock lock_ = (Lock)this.Retrieve(lockPtr);
-            lock_.Release();
+            PyThreadLock.Release(lockPtr);
         }
 
         public override void
@@ -116,7 +246,15 @@ namespace Ironclad
             this.lockCount.Increment();
             if (lockCount.Value == 1)
             {
-                this.ReleaseGIL();
+                this.RecordGILSaveThread();
+                if (this.InGILBatch)
+                {
+                    this.SuspendGIL();
+                }
+                else
+                {
+                    this.ReleaseGIL();
+                }
                 return new IntPtr(1);
             }
             return IntPtr.Zero;
@@ -133,8 +271,51 @@ namespace Ironclad
             if (token != IntPtr.Zero || lockCount.Value == 0)
             {
                 lockCount.Reset();
-                this.EnsureGIL();
+                if (this.threadData.savedGILCount != 0)
+                {
+                    this.ResumeGIL();
+                }
+                else
+                {
+                    this.EnsureGIL();
+                }
+            }
+        }
+
+        // Inside a batch, a release only drops one reentrant count; but C code which
+        // releases the GIL around some slow work expects other threads to get it. So
+        // PyEval_SaveThread lets go of the GIL completely, just as YieldGIL does, and
+        // PyEval_RestoreThread takes it back at the same count; temp objects stay put
+        // until the calls which made them finish. Managed code which needs to block on
+        // other threads (such as ironclad.Future) does the same thing.
+        public bool
+        SuspendGIL()
+        {
+            // returns false, and does nothing, if this thread doesn't hold the GIL
+            if (!this.GIL.IsAcquired)
+            {
+                return false;
             }
+            ThreadData threadData = this.threadData;
+            threadData.savedGILBatchCount = this.gilBatchCount;
+            this.gilBatchCount = 0;
+            CPyMarshal.WritePtr(this._PyThreadState_Current, IntPtr.Zero);
+            this.RecordGILReleased();
+            threadData.savedGILCount = this.GIL.ReleaseAll();
+            return true;
+        }
+
+        public void
+        ResumeGIL()
+        {
+            ThreadData threadData = this.threadData;
+            long waitStart = this.GILWaitStart();
+            this.GIL.Reacquire(threadData.savedGILCount);
+            CPyMarshal.WritePtr(this._PyThreadState_Current, this.threadState.Ptr);
+            this.RecordGILAcquired(waitStart);
+            this.gilBatchCount = threadData.savedGILBatchCount;
+            threadData.savedGILCount = 0;
+            threadData.savedGILBatchCount = 0;
         }
 
         // I can only assume that an enum is near-enough the same as an int, and I choose
@@ -157,32 +338,106 @@ namespace Ironclad
         public void
         EnsureGIL()
         {
-            this.tempObjects.Push(new List<IntPtr>());
-            if (this.GIL.Acquire() == 1)
+            long waitStart = this.GILWaitStart();
+            int count = this.GIL.Acquire();
+            if (count == 1)
             {
                 CPyMarshal.WritePtr(this._PyThreadState_Current, this.threadState.Ptr);
+                this.RecordGILAcquired(waitStart);
+            }
+            if (this.gilBatchCount == 0 || count <= this.gilBatchCount)
+            {
+                this.tempObjects.Push();
             }
         }
         
         public void
         ReleaseGIL()
         {
-            if (this.tempObjects.Count > 0) {
-                List<IntPtr> safeTemps = this.tempObjects.Pop();
-                if (safeTemps != null) {
-                    foreach (IntPtr ptr in safeTemps)
-                    {
-                        this.DecRef(ptr);
-                    }
+            int count = this.GIL.CountAcquired;
+            if (this.gilBatchCount != 0 && count > this.gilBatchCount)
+            {
+                // inside a batch: temp objects and bridge ptrs wait until the batch
+                // ends, unless an outermost call finds too many temps piling up
+                TempObjectScopes tempObjects = this.tempObjects;
+                if (count == this.gilBatchCount + 1 && tempObjects.CurrentCount > GIL_BATCH_TEMP_LIMIT)
+                {
+                    tempObjects.Pop(this.decRefTemp);
+                    tempObjects.Push();
+                }
+                this.GIL.Release();
+                if (count == this.gilBatchCount + 1 && this.GIL.DropRequested)
+                {
+                    this.YieldGIL();
                 }
+                return;
             }
+            
+            this.tempObjects.Pop(this.decRefTemp);
             this.map.CheckBridgePtrs(false);
 
-            if (this.GIL.CountAcquired == 1)
+            if (count == 1)
             {
                 CPyMarshal.WritePtr(this._PyThreadState_Current, IntPtr.Zero);
+                this.RecordGILReleased();
             }
             this.GIL.Release();
         }
+        
+
+        // Outermost releases hand the GIL straight to a thread which has been waiting
+        // for longer than the switch interval; a batch never makes an outermost release,
+        // so it checks between calls instead, and yields the GIL if asked.
+        public double
+        SwitchInterval
+        {
+            get { return this.GIL.SwitchInterval; }
+            set { this.GIL.SwitchInterval = value; }
+        }
+
+        private void
+        YieldGIL()
+        {
+            int batchCount = this.gilBatchCount;
+            this.gilBatchCount = 0;
+            CPyMarshal.WritePtr(this._PyThreadState_Current, IntPtr.Zero);
+            this.RecordGILReleased();
+
+            long waitStart = this.GILWaitStart();
+            this.GIL.Yield();
+
+            CPyMarshal.WritePtr(this._PyThreadState_Current, this.threadState.Ptr);
+            this.RecordGILAcquired(waitStart);
+            this.gilBatchCount = batchCount;
+        }
+
+        // A batch holds the GIL across many calls into C. Calls made inside the batch
+        // still acquire and release the GIL, but only reentrantly; their temp objects
+        // are kept until the batch ends, and so is the bridge ptr bookkeeping.
+        public void
+        EnterGILBatch()
+        {
+            this.EnsureGIL();
+            if (this.gilBatchCount == 0)
+            {
+                this.gilBatchCount = this.GIL.CountAcquired;
+            }
+        }
+        
+        public void
+        ExitGILBatch()
+        {
+            if (this.GIL.CountAcquired == this.gilBatchCount)
+            {
+                this.gilBatchCount = 0;
+            }
+            this.ReleaseGIL();
+        }
+        
+        public bool
+        InGILBatch
+        {
+            get { return this.gilBatchCount != 0 && this.GIL.IsAcquired; }
+        }
     }
 }
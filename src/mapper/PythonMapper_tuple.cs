@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Runtime.InteropServices;
 
 using IronPython.Runtime;
@@ -10,6 +11,117 @@ namespace Ironclad
 {
     public partial class PythonMapper : PythonApi
     {
+        // METH_VARARGS functions get their arguments in a fresh tuple on every call, which
+        // nearly always dies as soon as the call returns. For small argument counts, we keep
+        // a few of those tuples around and refill them, rather than allocating, mapping and
+        // deallocating a new one each time. A tuple only goes back on the shelf if nobody
+        // else took a reference to it during the call.
+        public const int MAX_ARGS_TUPLE_LENGTH = 4;
+        private const int ARGS_TUPLE_CACHE_DEPTH = 4;
+
+        private Stack<IntPtr>[] argsTuples = new Stack<IntPtr>[MAX_ARGS_TUPLE_LENGTH + 1];
+
+        public IntPtr
+        StoreArgs(object args)
+        {
+            PythonTuple tuple = args as PythonTuple;
+            if (tuple == null || args.GetType() != typeof(PythonTuple))
+            {
+                return this.Store(args);
+            }
+            int length = tuple.__len__();
+            Stack<IntPtr> cache = this.ArgsTupleCache(length);
+            if (cache == null)
+            {
+                return this.Store(args);
+            }
+
+            IntPtr tuplePtr = (cache.Count > 0) ? cache.Pop() : this.CreateTuple(length);
+            IntPtr itemPtr = CPyMarshal.Offset(tuplePtr, PyTupleObjectFields.ob_item);
+            for (int i = 0; i < length; i++)
+            {
+                CPyMarshal.WritePtr(itemPtr, this.Store(tuple[i]));
+                itemPtr = CPyMarshal.Offset(itemPtr, CPyMarshal.PtrSize);
+            }
+            // not associated with args: if anyone asks for it, it'll be actualised as usual
+            this.incompleteObjects[tuplePtr] = UnmanagedDataMarker.PyTupleObject;
+            return tuplePtr;
+        }
+
+        public void
+        ReleaseArgs(IntPtr tuplePtr)
+        {
+            Stack<IntPtr> cache = null;
+            if (PyObjectFields.ReadRefcnt(tuplePtr) == 1 && PyObjectFields.ReadType(tuplePtr) == this.PyTuple_Type)
+            {
+                cache = this.ArgsTupleCache(PyTupleObjectFields.ReadSize(tuplePtr));
+            }
+            if (cache == null || cache.Count >= ARGS_TUPLE_CACHE_DEPTH)
+            {
+                this.DecRef(tuplePtr);
+                return;
+            }
+
+            int length = PyTupleObjectFields.ReadSize(tuplePtr);
+            IntPtr itemPtr = CPyMarshal.Offset(tuplePtr, PyTupleObjectFields.ob_item);
+            for (int i = 0; i < length; i++)
+            {
+                IntPtr item = CPyMarshal.ReadPtr(itemPtr);
+                CPyMarshal.WritePtr(itemPtr, IntPtr.Zero);
+                if (item != IntPtr.Zero)
+                {
+                    this.DecRef(item);
+                }
+                itemPtr = CPyMarshal.Offset(itemPtr, CPyMarshal.PtrSize);
+            }
+            this.Unmap(tuplePtr);
+            cache.Push(tuplePtr);
+        }
+
+        public int
+        ArgsTupleCount
+        {
+            get
+            {
+                int count = 0;
+                foreach (Stack<IntPtr> cache in this.argsTuples)
+                {
+                    if (cache != null)
+                    {
+                        count += cache.Count;
+                    }
+                }
+                return count;
+            }
+        }
+
+        private Stack<IntPtr>
+        ArgsTupleCache(int length)
+        {
+            if (length > MAX_ARGS_TUPLE_LENGTH)
+            {
+                return null;
+            }
+            if (this.argsTuples[length] == null)
+            {
+                this.argsTuples[length] = new Stack<IntPtr>();
+            }
+            return this.argsTuples[length];
+        }
+
+        private void
+        ForgetArgsTuples()
+        {
+            // the memory is about to go away anyway; don't touch it
+            foreach (Stack<IntPtr> cache in this.argsTuples)
+            {
+                if (cache != null)
+                {
+                    cache.Clear();
+                }
+            }
+        }
+
         public override IntPtr
         PyTuple_New(int size)
         {
@@ -21,9 +133,9 @@ namespace Ironclad
         public override void 
         IC_PyTuple_Dealloc(IntPtr tuplePtr)
         {
-            int length = CPyMarshal.ReadIntField(tuplePtr, typeof(PyTupleObject), "ob_size");
+            int length = PyTupleObjectFields.ReadSize(tuplePtr);
             IntPtr itemsPtr = CPyMarshal.Offset(
-                tuplePtr, Marshal.OffsetOf(typeof(PyTupleObject), "ob_item"));
+                tuplePtr, PyTupleObjectFields.ob_item);
             for (int i = 0; i < length; i++)
             {
                 IntPtr itemPtr = CPyMarshal.ReadPtr(
@@ -34,10 +146,7 @@ namespace Ironclad
                     this.DecRef(itemPtr);
                 }
             }
-            dgt_void_ptr freeDgt = (dgt_void_ptr)
-                CPyMarshal.ReadFunctionPtrField(
-                    this.PyTuple_Type, typeof(PyTypeObject), "tp_free", typeof(dgt_void_ptr));
-            freeDgt(tuplePtr);
+            this.FreeObject(tuplePtr, this.PyTuple_Type);
         }
         
         public override int
@@ -51,7 +160,7 @@ namespace Ironclad
                 
                 uint newSize = (uint)Marshal.SizeOf(typeof(PyTupleObject)) + (uint)(CPyMarshal.PtrSize * (length - 1));
                 tuplePtr = this.allocator.Realloc(tuplePtr, newSize);
-                CPyMarshal.WriteIntField(tuplePtr, typeof(PyTupleObject), "ob_size", length);
+                PyTupleObjectFields.WriteSize(tuplePtr, length);
                 this.incompleteObjects[tuplePtr] = UnmanagedDataMarker.PyTupleObject;
                 CPyMarshal.WritePtr(tuplePtrPtr, tuplePtr);
                 return 0;
@@ -67,7 +176,7 @@ namespace Ironclad
         public override int
         PyTuple_Size(IntPtr tuplePtr)
         {
-            return CPyMarshal.ReadIntField(tuplePtr, typeof(PyTupleObject), "ob_size");
+            return PyTupleObjectFields.ReadSize(tuplePtr);
         }
         
         public override IntPtr
@@ -96,11 +205,11 @@ namespace Ironclad
 
             int baseSize = Marshal.SizeOf(typeof(PyTupleObject));
             int extraSize = (CPyMarshal.PtrSize * (size - 1));
-            IntPtr tuplePtr = this.allocator.Alloc((uint)(baseSize + extraSize));
+            IntPtr tuplePtr = this.AllocFromFreeList(this.TupleFreeList(size), (uint)(baseSize + extraSize));
             Marshal.StructureToPtr(tuple, tuplePtr, false);
 
             IntPtr itemsPtr = CPyMarshal.Offset(
-                tuplePtr, Marshal.OffsetOf(typeof(PyTupleObject), "ob_item"));
+                tuplePtr, PyTupleObjectFields.ob_item);
             CPyMarshal.Zero(itemsPtr, CPyMarshal.PtrSize * size);
             return tuplePtr;
         }
@@ -111,7 +220,7 @@ namespace Ironclad
             int length = tuple.__len__();
             IntPtr tuplePtr = this.CreateTuple(length);
             IntPtr itemPtr = CPyMarshal.Offset(
-                tuplePtr, Marshal.OffsetOf(typeof(PyTupleObject), "ob_item"));
+                tuplePtr, PyTupleObjectFields.ob_item);
             for (int i = 0; i < length; i++)
             {
                 CPyMarshal.WritePtr(itemPtr, this.Store(tuple[i]));
@@ -124,8 +233,8 @@ namespace Ironclad
         private void
         ActualiseTuple(IntPtr ptr)
         {
-            int itemCount = CPyMarshal.ReadIntField(ptr, typeof(PyTupleObject), "ob_size");
-            IntPtr itemAddressPtr = CPyMarshal.Offset(ptr, Marshal.OffsetOf(typeof(PyTupleObject), "ob_item"));
+            int itemCount = PyTupleObjectFields.ReadSize(ptr);
+            IntPtr itemAddressPtr = CPyMarshal.Offset(ptr, PyTupleObjectFields.ob_item);
 
             object[] items = new object[itemCount];
             for (int i = 0; i < itemCount; i++)
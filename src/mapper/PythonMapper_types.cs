@@ -20,29 +20,29 @@ namespace Ironclad
         public override IntPtr 
         PyType_GenericNew(IntPtr typePtr, IntPtr args, IntPtr kwargs)
         {
-            dgt_ptr_ptrint dgt = (dgt_ptr_ptrint)CPyMarshal.ReadFunctionPtrField(
-                typePtr, typeof(PyTypeObject), "tp_alloc", typeof(dgt_ptr_ptrint));
+            dgt_ptr_ptrint dgt = (dgt_ptr_ptrint)this.delegates.Get(
+                PyTypeObjectFields.ReadAlloc(typePtr), typeof(dgt_ptr_ptrint));
             return dgt(typePtr, 0);
         }
         
         public override IntPtr 
         PyType_GenericAlloc(IntPtr typePtr, int nItems)
         {
-            int size = CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_basicsize");
+            int size = PyTypeObjectFields.ReadBasicsize(typePtr);
             if (nItems > 0)
             {
-                int itemsize = CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_itemsize");
+                int itemsize = PyTypeObjectFields.ReadItemsize(typePtr);
                 size += (nItems * itemsize);
             }
             
             IntPtr newInstance = this.allocator.Alloc((uint)size);
             CPyMarshal.Zero(newInstance, size);
-            CPyMarshal.WriteUIntField(newInstance, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(newInstance, typeof(PyObject), "ob_type", typePtr);
+            PyObjectFields.WriteRefcnt(newInstance, 1);
+            PyObjectFields.WriteType(newInstance, typePtr);
 
             if (nItems > 0)
             {
-                CPyMarshal.WriteIntField(newInstance, typeof(PyVarObject), "ob_size", nItems);
+                PyVarObjectFields.WriteSize(newInstance, nItems);
             }
 
             return newInstance;
@@ -83,25 +83,25 @@ namespace Ironclad
             {
                 return -1;
             }
-            Py_TPFLAGS flags = (Py_TPFLAGS)CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_flags");
+            Py_TPFLAGS flags = (Py_TPFLAGS)PyTypeObjectFields.ReadFlags(typePtr);
             if ((Int32)(flags & (Py_TPFLAGS.READY | Py_TPFLAGS.READYING)) != 0)
             {
                 return 0;
             }
             flags |= Py_TPFLAGS.READYING;
-            CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), "tp_flags", (Int32)flags);
+            PyTypeObjectFields.WriteFlags(typePtr, (Int32)flags);
             
-            IntPtr typeTypePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "ob_type");
+            IntPtr typeTypePtr = PyTypeObjectFields.ReadType(typePtr);
             if ((typeTypePtr == IntPtr.Zero) && (typePtr != this.PyType_Type))
             {
-                CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "ob_type", this.PyType_Type);
+                PyTypeObjectFields.WriteType(typePtr, this.PyType_Type);
             }
 
-            IntPtr typeBasePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_base");
+            IntPtr typeBasePtr = PyTypeObjectFields.ReadBase(typePtr);
             if ((typeBasePtr == IntPtr.Zero) && (typePtr != this.PyBaseObject_Type))
             {
                 typeBasePtr = this.PyBaseObject_Type;
-                CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_base", typeBasePtr);
+                PyTypeObjectFields.WriteBase(typePtr, typeBasePtr);
             }
 
             PyType_Ready(typeBasePtr);
@@ -129,14 +129,14 @@ namespace Ironclad
                 if (Builtin.hasattr(this.scratchContext, klass, "__dict__"))
                 {
                     object typeDict = Builtin.getattr(this.scratchContext, klass, "__dict__");
-                    CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_dict", this.Store(typeDict));
+                    PyTypeObjectFields.WriteDict(typePtr, this.Store(typeDict));
                 }
             }
 
-            flags = (Py_TPFLAGS)CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_flags");
+            flags = (Py_TPFLAGS)PyTypeObjectFields.ReadFlags(typePtr);
             flags |= Py_TPFLAGS.READY | Py_TPFLAGS.HAVE_CLASS;
             flags &= ~Py_TPFLAGS.READYING;
-            CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), "tp_flags", (Int32)flags);
+            PyTypeObjectFields.WriteFlags(typePtr, (Int32)flags);
             return 0;
         }
 
@@ -221,7 +221,7 @@ namespace Ironclad
             IntPtr fieldPtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), name);
             if (fieldPtr == IntPtr.Zero)
             {
-                IntPtr basePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_base");
+                IntPtr basePtr = PyTypeObjectFields.ReadBase(typePtr);
                 if (basePtr != IntPtr.Zero)
                 {
                     CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), name, 
@@ -236,7 +236,7 @@ namespace Ironclad
             int fieldVal = CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), name);
             if (fieldVal == 0)
             {
-                IntPtr basePtr = CPyMarshal.ReadPtrField(typePtr, typeof(PyTypeObject), "tp_base");
+                IntPtr basePtr = PyTypeObjectFields.ReadBase(typePtr);
                 if (basePtr != IntPtr.Zero)
                 {
                     CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), name,
@@ -248,7 +248,7 @@ namespace Ironclad
         private void
         InheritSubclassFlags(IntPtr typePtr)
         {
-            Py_TPFLAGS flags = (Py_TPFLAGS)CPyMarshal.ReadIntField(typePtr, typeof(PyTypeObject), "tp_flags");
+            Py_TPFLAGS flags = (Py_TPFLAGS)PyTypeObjectFields.ReadFlags(typePtr);
             
             if (this.PyType_IsSubtype(typePtr, this.PyInt_Type) != 0) { flags |= Py_TPFLAGS.INT_SUBCLASS; }
             if (this.PyType_IsSubtype(typePtr, this.PyLong_Type) != 0) { flags |= Py_TPFLAGS.LONG_SUBCLASS; }
@@ -259,7 +259,7 @@ namespace Ironclad
             if (this.PyType_IsSubtype(typePtr, this.PyType_Type) != 0) { flags |= Py_TPFLAGS.TYPE_SUBCLASS; }
             // TODO: PyExc_BaseException is tedious
             
-            CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), "tp_flags", (Int32)flags);
+            PyTypeObjectFields.WriteFlags(typePtr, (Int32)flags);
         }
 
         private IntPtr
@@ -269,26 +269,23 @@ namespace Ironclad
             IntPtr typePtr = this.allocator.Alloc(typeSize);
             CPyMarshal.Zero(typePtr, typeSize);
             
-            CPyMarshal.WriteIntField(typePtr, typeof(PyTypeObject), "ob_refcnt", 2);
+            PyTypeObjectFields.WriteRefcnt(typePtr, 2);
 
             object ob_type = PythonCalls.Call(this.scratchContext, Builtin.type, new object[] { _type });
-            CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "ob_type", this.Store(ob_type));
+            PyTypeObjectFields.WriteType(typePtr, this.Store(ob_type));
             
             string tp_name = (string)_type.__getattribute__(this.scratchContext, "__name__");
-            CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_name", this.Store(tp_name));
+            PyTypeObjectFields.WriteName(typePtr, this.Store(tp_name));
             
             PythonTuple tp_bases = (PythonTuple)_type.__getattribute__(this.scratchContext, "__bases__");
             object tp_base = tp_bases[0];
-            CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_base", this.Store(tp_base));
+            PyTypeObjectFields.WriteBase(typePtr, this.Store(tp_base));
             if (tp_bases.__len__() > 1)
             {
-                CPyMarshal.WritePtrField(typePtr, typeof(PyTypeObject), "tp_bases", this.Store(tp_bases));
+                PyTypeObjectFields.WriteBases(typePtr, this.Store(tp_bases));
             }
 
-            this.scratchModule.Get__dict__()["_ironclad_bases"] = tp_bases;
-            this.scratchModule.Get__dict__()["_ironclad_metaclass"] = ob_type;
-            this.ExecInModule(CodeSnippets.CLASS_STUB_CODE, this.scratchModule);
-            this.classStubs[typePtr] = this.scratchModule.Get__dict__()["_ironclad_class_stub"];
+            this.classStubs[typePtr] = this.CreateClassStub(ob_type, tp_bases);
 
             this.actualisableTypes[typePtr] = new ActualiseDelegate(this.ActualiseArbitraryObject);
             this.map.Associate(typePtr, _type);
@@ -303,15 +300,12 @@ namespace Ironclad
             IntPtr ptr = this.allocator.Alloc(size);
             CPyMarshal.Zero(ptr, size);
             
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 2); // leak classes deliberately
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.PyClass_Type);
+            PyObjectFields.WriteRefcnt(ptr, 2); // leak classes deliberately
+            PyObjectFields.WriteType(ptr, this.PyClass_Type);
             
-            CPyMarshal.WritePtrField(ptr, typeof(PyClassObject), "cl_bases", 
-                this.Store(Builtin.getattr(this.scratchContext, cls, "__bases__")));
-            CPyMarshal.WritePtrField(ptr, typeof(PyClassObject), "cl_dict", 
-                this.Store(Builtin.getattr(this.scratchContext, cls, "__dict__")));
-            CPyMarshal.WritePtrField(ptr, typeof(PyClassObject), "cl_name", 
-                this.Store(Builtin.getattr(this.scratchContext, cls, "__name__")));
+            PyClassObjectFields.WriteBases(ptr, this.Store(Builtin.getattr(this.scratchContext, cls, "__bases__")));
+            PyClassObjectFields.WriteDict(ptr, this.Store(Builtin.getattr(this.scratchContext, cls, "__dict__")));
+            PyClassObjectFields.WriteName(ptr, this.Store(Builtin.getattr(this.scratchContext, cls, "__name__")));
             
             this.map.Associate(ptr, cls);
             return ptr;
@@ -324,13 +318,11 @@ namespace Ironclad
             IntPtr ptr = this.allocator.Alloc(size);
             CPyMarshal.Zero(ptr, size);
             
-            CPyMarshal.WriteIntField(ptr, typeof(PyObject), "ob_refcnt", 1);
-            CPyMarshal.WritePtrField(ptr, typeof(PyObject), "ob_type", this.PyInstance_Type);
+            PyObjectFields.WriteRefcnt(ptr, 1);
+            PyObjectFields.WriteType(ptr, this.PyInstance_Type);
 
-            CPyMarshal.WritePtrField(ptr, typeof(PyInstanceObject), "in_class", 
-                this.Store(Builtin.getattr(this.scratchContext, inst, "__class__")));
-            CPyMarshal.WritePtrField(ptr, typeof(PyInstanceObject), "in_dict", 
-                this.Store(Builtin.getattr(this.scratchContext, inst, "__dict__")));
+            PyInstanceObjectFields.WriteClass(ptr, this.Store(Builtin.getattr(this.scratchContext, inst, "__class__")));
+            PyInstanceObjectFields.WriteDict(ptr, this.Store(Builtin.getattr(this.scratchContext, inst, "__dict__")));
             
             this.map.Associate(ptr, inst);
             return ptr;
@@ -339,7 +331,7 @@ namespace Ironclad
         private void
         ActualiseFloat(IntPtr fptr)
         {
-            double value = CPyMarshal.ReadDoubleField(fptr, typeof(PyFloatObject), "ob_fval");
+            double value = PyFloatObjectFields.ReadFval(fptr);
             this.map.Associate(fptr, value);
         }
         
@@ -357,17 +349,17 @@ namespace Ironclad
         private void
         ActualiseArbitraryObject(IntPtr ptr)
         {
-            IntPtr typePtr = CPyMarshal.ReadPtrField(ptr, typeof(PyObject), "ob_type");
+            IntPtr typePtr = PyObjectFields.ReadType(ptr);
             PythonType type_ = (PythonType)this.Retrieve(typePtr);
             
             object[] args = new object[]{};
             if (Builtin.issubclass(this.scratchContext, type_, TypeCache.Int32))
             {
-                args = new object[] { CPyMarshal.ReadIntField(ptr, typeof(PyIntObject), "ob_ival") };
+                args = new object[] { PyIntObjectFields.ReadIval(ptr) };
             }
             if (Builtin.issubclass(this.scratchContext, type_, TypeCache.Double))
             {
-                args = new object[] { CPyMarshal.ReadDoubleField(ptr, typeof(PyFloatObject), "ob_fval") };
+                args = new object[] { PyFloatObjectFields.ReadFval(ptr) };
             }
             if (Builtin.issubclass(this.scratchContext, type_, TypeCache.String))
             {
@@ -382,7 +374,7 @@ namespace Ironclad
             
             object obj = PythonCalls.Call(this.classStubs[typePtr], args);
             Builtin.setattr(this.scratchContext, obj, "__class__", type_);
-            this.StoreBridge(ptr, obj);
+            this.StoreInstance(ptr, obj);
             this.IncRef(ptr);
             GC.KeepAlive(obj); // TODO: please test me, if you can work out how to
         }
@@ -0,0 +1,215 @@
+using System;
+using System.Collections.Generic;
+
+namespace Ironclad
+{
+    public partial class PythonMapper : PythonApi
+    {
+        // Store maps by identity, so equal ints, floats and strs normally get separate
+        // unmanaged objects; when the value cache is enabled, we keep a reference to
+        // recently-stored small values and hand out the existing objects instead.
+        public const int SMALL_INT_MIN = -5;
+        public const int SMALL_INT_MAX = 1024;
+        public const int MAX_CACHED_STRING_LENGTH = 32;
+
+        private int valueCacheSize = 0;
+        private IntPtr[] smallInts = null;
+        private ValueCache<string> stringCache = null;
+        private ValueCache<long> floatCache = null;
+        private long valueCacheHits = 0;
+        private long valueCacheMisses = 0;
+
+        public int
+        ValueCacheSize
+        {
+            get { return this.valueCacheSize; }
+            set
+            {
+                this.GIL.Acquire();
+                try
+                {
+                    this.ResizeValueCache(Math.Max(value, 0));
+                }
+                finally
+                {
+                    this.GIL.Release();
+                }
+            }
+        }
+
+        public long
+        ValueCacheHits
+        {
+            get { return this.valueCacheHits; }
+        }
+
+        public long
+        ValueCacheMisses
+        {
+            get { return this.valueCacheMisses; }
+        }
+
+        public int
+        ValueCacheCount
+        {
+            get
+            {
+                if (this.valueCacheSize == 0)
+                {
+                    return 0;
+                }
+                int count = this.stringCache.Count + this.floatCache.Count;
+                foreach (IntPtr ptr in this.smallInts)
+                {
+                    if (ptr != IntPtr.Zero)
+                    {
+                        count += 1;
+                    }
+                }
+                return count;
+            }
+        }
+
+        public void
+        ResetValueCacheStats()
+        {
+            this.valueCacheHits = 0;
+            this.valueCacheMisses = 0;
+        }
+
+        private void
+        ResizeValueCache(int size)
+        {
+            if (size == 0)
+            {
+                if (this.valueCacheSize != 0)
+                {
+                    this.DecRefAll(this.smallInts);
+                    this.DecRefAll(this.stringCache.Resize(0));
+                    this.DecRefAll(this.floatCache.Resize(0));
+                }
+                this.smallInts = null;
+                this.stringCache = null;
+                this.floatCache = null;
+            }
+            else if (this.valueCacheSize == 0)
+            {
+                this.smallInts = new IntPtr[SMALL_INT_MAX - SMALL_INT_MIN + 1];
+                this.stringCache = new ValueCache<string>(size);
+                this.floatCache = new ValueCache<long>(size);
+            }
+            else
+            {
+                this.DecRefAll(this.stringCache.Resize(size));
+                this.DecRefAll(this.floatCache.Resize(size));
+            }
+            this.valueCacheSize = size;
+        }
+
+        private void
+        DecRefAll(IEnumerable<IntPtr> ptrs)
+        {
+            foreach (IntPtr ptr in ptrs)
+            {
+                if (ptr != IntPtr.Zero)
+                {
+                    this.DecRef(ptr);
+                }
+            }
+        }
+
+        private void
+        ForgetValueCache()
+        {
+            // the memory is about to go away anyway; don't touch it
+            this.smallInts = null;
+            this.stringCache = null;
+            this.floatCache = null;
+            this.valueCacheSize = 0;
+        }
+
+        private bool
+        TryGetCachedInt(int value, out IntPtr ptr)
+        {
+            ptr = IntPtr.Zero;
+            if (this.valueCacheSize == 0 || value < SMALL_INT_MIN || value > SMALL_INT_MAX)
+            {
+                return false;
+            }
+            return this.CacheHit(this.smallInts[value - SMALL_INT_MIN], ref ptr);
+        }
+
+        private void
+        CacheInt(int value, IntPtr ptr)
+        {
+            if (this.valueCacheSize == 0 || value < SMALL_INT_MIN || value > SMALL_INT_MAX)
+            {
+                return;
+            }
+            this.IncRef(ptr);
+            this.smallInts[value - SMALL_INT_MIN] = ptr;
+        }
+
+        private bool
+        TryGetCachedFloat(double value, out IntPtr ptr)
+        {
+            ptr = IntPtr.Zero;
+            if (this.valueCacheSize == 0)
+            {
+                return false;
+            }
+            IntPtr cached;
+            this.floatCache.TryGet(BitConverter.DoubleToInt64Bits(value), out cached);
+            return this.CacheHit(cached, ref ptr);
+        }
+
+        private void
+        CacheFloat(double value, IntPtr ptr)
+        {
+            if (this.valueCacheSize == 0)
+            {
+                return;
+            }
+            this.IncRef(ptr);
+            this.DecRefAll(new IntPtr[] { this.floatCache.Add(BitConverter.DoubleToInt64Bits(value), ptr) });
+        }
+
+        private bool
+        TryGetCachedString(string value, out IntPtr ptr)
+        {
+            ptr = IntPtr.Zero;
+            if (this.valueCacheSize == 0 || value.Length > MAX_CACHED_STRING_LENGTH)
+            {
+                return false;
+            }
+            IntPtr cached;
+            this.stringCache.TryGet(value, out cached);
+            return this.CacheHit(cached, ref ptr);
+        }
+
+        private void
+        CacheString(string value, IntPtr ptr)
+        {
+            if (this.valueCacheSize == 0 || value.Length > MAX_CACHED_STRING_LENGTH)
+            {
+                return;
+            }
+            this.IncRef(ptr);
+            this.DecRefAll(new IntPtr[] { this.stringCache.Add(value, ptr) });
+        }
+
+        private bool
+        CacheHit(IntPtr cached, ref IntPtr ptr)
+        {
+            if (cached == IntPtr.Zero)
+            {
+                this.valueCacheMisses += 1;
+                return false;
+            }
+            this.valueCacheHits += 1;
+            this.IncRef(cached);
+            ptr = cached;
+            return true;
+        }
+    }
+}
@@ -70,3 +70,65 @@ int fstat(int fd, struct stat* buffer)
 	return _fstat32(fd, buffer);
 }
 
+
+
+// Fast paths for some very commonly-called functions (see _fast_path_symbols).
+// When the object is exactly the expected type we can read it directly; anything
+// else goes to the managed implementation, via its jumptable entry, which knows
+// about subclasses and produces the proper errors.
+
+Py_ssize_t IC_PyTuple_Size(PyObject *op);
+Py_ssize_t IC_PyString_Size(PyObject *op);
+char *IC_PyString_AsString(PyObject *op);
+long IC_PyInt_AsLong(PyObject *op);
+double IC_PyFloat_AsDouble(PyObject *op);
+
+Py_ssize_t
+PyTuple_Size(PyObject *op)
+{
+	if (op != NULL && Py_TYPE(op) == &PyTuple_Type)
+		return Py_SIZE(op);
+	return IC_PyTuple_Size(op);
+}
+
+Py_ssize_t
+PyString_Size(PyObject *op)
+{
+	if (op != NULL && Py_TYPE(op) == &PyString_Type)
+		return Py_SIZE(op);
+	return IC_PyString_Size(op);
+}
+
+char *
+PyString_AsString(PyObject *op)
+{
+	if (op != NULL && Py_TYPE(op) == &PyString_Type)
+		return ((PyStringObject *)op)->ob_sval;
+	return IC_PyString_AsString(op);
+}
+
+long
+PyInt_AsLong(PyObject *op)
+{
+	if (op != NULL && Py_TYPE(op) == &PyInt_Type)
+		return ((PyIntObject *)op)->ob_ival;
+	return IC_PyInt_AsLong(op);
+}
+
+double
+PyFloat_AsDouble(PyObject *op)
+{
+	if (op != NULL && Py_TYPE(op) == &PyFloat_Type)
+		return ((PyFloatObject *)op)->ob_fval;
+	return IC_PyFloat_AsDouble(op);
+}
+
+PyObject *
+PyBool_FromLong(long ok)
+{
+	// _Py_TrueStruct and _Py_ZeroStruct are static, so there's never anything
+	// for the managed side to do here
+	PyObject *result = ok ? Py_True : Py_False;
+	Py_INCREF(result);
+	return result;
+}
@@ -0,0 +1,127 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from System import IntPtr
+from Ironclad import ArenaAllocator, CPyMarshal
+
+
+SMALL_SIZE = 24
+LARGE_SIZE = 8192
+
+class ArenaAllocatorTest(TestCase):
+
+    def testAllocFreeSmall(self):
+        allocator = ArenaAllocator()
+        ptr = allocator.Alloc(SMALL_SIZE)
+        self.assertEquals(allocator.Contains(ptr), True)
+        self.assertEquals(allocator.Contains(IntPtr(ptr.ToInt64() + 8)), False)
+        CPyMarshal.WriteInt(ptr, 123)
+
+        allocator.Free(ptr)
+        self.assertEquals(allocator.Contains(ptr), False)
+        self.assertRaises(KeyError, allocator.Free, ptr)
+        allocator.FreeAll()
+
+
+    def testAllocFreeLarge(self):
+        allocator = ArenaAllocator()
+        ptr = allocator.Alloc(LARGE_SIZE)
+        self.assertEquals(allocator.Contains(ptr), True)
+        CPyMarshal.WriteInt(ptr, 123)
+        self.assertEquals(allocator.ArenaCount, 0)
+
+        allocator.Free(ptr)
+        self.assertEquals(allocator.Contains(ptr), False)
+        self.assertRaises(KeyError, allocator.Free, ptr)
+
+
+    def testTracksMemoryPressure(self):
+        allocator = ArenaAllocator()
+        ptr = allocator.Alloc(LARGE_SIZE)
+        self.assertEquals(allocator.Pressure.Tracked, LARGE_SIZE)
+        ptr = allocator.Realloc(ptr, LARGE_SIZE * 2)
+        self.assertEquals(allocator.Pressure.Tracked, LARGE_SIZE * 2)
+        allocator.Free(ptr)
+        self.assertEquals(allocator.Pressure.Tracked, 0)
+        
+        allocator.Alloc(SMALL_SIZE)
+        arenaSize = (ArenaAllocator.POOLS_PER_ARENA + 1) * ArenaAllocator.POOL_SIZE
+        self.assertEquals(allocator.Pressure.Tracked, arenaSize)
+        allocator.FreeAll()
+        self.assertEquals(allocator.Pressure.Tracked, 0)
+
+
+    def testFreedBlocksAreReused(self):
+        allocator = ArenaAllocator()
+        ptrs = [allocator.Alloc(SMALL_SIZE) for _ in range(10)]
+        self.assertEquals(len(set(ptrs)), 10)
+        allocator.Free(ptrs[3])
+        self.assertEquals(allocator.Alloc(SMALL_SIZE - 4), ptrs[3])
+        allocator.FreeAll()
+
+
+    def testManySizes(self):
+        allocator = ArenaAllocator()
+        ptrs = []
+        for size in range(0, 600, 7):
+            for _ in range(50):
+                ptr = allocator.Alloc(size)
+                CPyMarshal.Zero(ptr, size)
+                ptrs.append(ptr)
+        self.assertEquals(len(set(ptrs)), len(ptrs))
+        for ptr in ptrs[::2]:
+            allocator.Free(ptr)
+        for i, ptr in enumerate(ptrs):
+            self.assertEquals(allocator.Contains(ptr), i % 2 == 1)
+
+        allocator.FreeAll()
+        self.assertEquals(allocator.ArenaCount, 0)
+        for ptr in ptrs:
+            self.assertEquals(allocator.Contains(ptr), False)
+
+
+    def testAllocFreeAll(self):
+        allocator = ArenaAllocator()
+        ptr1 = allocator.Alloc(SMALL_SIZE)
+        ptr2 = allocator.Alloc(SMALL_SIZE)
+        ptr3 = allocator.Alloc(LARGE_SIZE)
+
+        allocator.Free(ptr1)
+        self.assertRaises(KeyError, allocator.Free, ptr1)
+
+        allocator.FreeAll()
+        self.assertEquals(allocator.Contains(ptr2), False)
+        self.assertEquals(allocator.Contains(ptr3), False)
+        self.assertRaises(KeyError, allocator.Free, ptr2)
+        self.assertRaises(KeyError, allocator.Free, ptr3)
+
+
+    def testRealloc(self):
+        allocator = ArenaAllocator()
+        ptr1 = allocator.Alloc(SMALL_SIZE)
+        CPyMarshal.WriteInt(ptr1, 12345)
+
+        self.assertEquals(allocator.Realloc(ptr1, SMALL_SIZE - 1), ptr1)
+
+        ptr2 = allocator.Realloc(ptr1, SMALL_SIZE * 4)
+        self.assertNotEquals(ptr2, ptr1)
+        self.assertEquals(allocator.Contains(ptr1), False)
+        self.assertEquals(CPyMarshal.ReadInt(ptr2), 12345)
+
+        ptr3 = allocator.Realloc(ptr2, LARGE_SIZE)
+        self.assertEquals(allocator.Contains(ptr2), False)
+        self.assertEquals(CPyMarshal.ReadInt(ptr3), 12345)
+
+        ptr4 = allocator.Realloc(ptr3, SMALL_SIZE)
+        self.assertEquals(allocator.Contains(ptr3), False)
+        self.assertEquals(allocator.Contains(ptr4), True)
+        self.assertEquals(CPyMarshal.ReadInt(ptr4), 12345)
+
+        allocator.FreeAll()
+        self.assertRaises(KeyError, allocator.Free, ptr4)
+
+
+suite = makesuite(ArenaAllocatorTest)
+
+if __name__ == '__main__':
+    run(suite)
@@ -0,0 +1,202 @@
+
+# compares InterestingPtrMap against the five-dictionary map it replaced;
+# run from the project root, after building, as:
+#   ipy tests/bench/interestingptrmapbench.py [count]
+
+import sys
+sys.path.append('build')
+
+import clr
+clr.AddReference('Ironclad')
+
+from System import GC, IntPtr
+from System.CodeDom.Compiler import CompilerParameters
+from System.Diagnostics import Stopwatch
+from System.Runtime.InteropServices import Marshal
+from Microsoft.CSharp import CSharpCodeProvider
+
+from Ironclad import InterestingPtrMap
+from IronPython.Runtime.Operations import PythonOps
+
+
+OLD_MAP_SOURCE = """
+using System;
+using System.Collections.Generic;
+using System.Runtime.InteropServices;
+using IronPython.Runtime.Operations;
+
+public class OldInterestingPtrMap
+{
+    private Dictionary<IntPtr, long> ptr2id = new Dictionary<IntPtr, long>();
+    private Dictionary<long, IntPtr> id2ptr = new Dictionary<long, IntPtr>();
+    private Dictionary<long, object> id2obj = new Dictionary<long, object>();
+    private Dictionary<long, WeakReference> id2wref = new Dictionary<long, WeakReference>();
+    private Dictionary<long, object> id2sref = new Dictionary<long, object>();
+
+    public void Associate(IntPtr ptr, object obj)
+    {
+        long id = PythonOps.Id(obj);
+        this.ptr2id[ptr] = id;
+        this.id2ptr[id] = ptr;
+        this.id2obj[id] = obj;
+    }
+
+    public void BridgeAssociate(IntPtr ptr, object obj)
+    {
+        long id = PythonOps.Id(obj);
+        this.ptr2id[ptr] = id;
+        this.id2ptr[id] = ptr;
+        this.id2wref[id] = new WeakReference(obj);
+        this.id2sref[id] = obj;
+    }
+
+    public void UpdateStrength(IntPtr ptr)
+    {
+        long id = this.ptr2id[ptr];
+        if (!this.id2wref.ContainsKey(id))
+        {
+            return;
+        }
+        object obj = this.id2wref[id].Target;
+        if (Marshal.ReadInt32(ptr) > 1)
+        {
+            this.id2sref[id] = obj;
+        }
+        else
+        {
+            this.id2sref.Remove(id);
+        }
+    }
+
+    public void Release(IntPtr ptr)
+    {
+        long id = this.ptr2id[ptr];
+        this.ptr2id.Remove(ptr);
+        this.id2ptr.Remove(id);
+        if (this.id2obj.ContainsKey(id))
+        {
+            this.id2obj.Remove(id);
+        }
+        else if (this.id2wref.ContainsKey(id))
+        {
+            this.id2wref.Remove(id);
+            if (this.id2sref.ContainsKey(id))
+            {
+                this.id2sref.Remove(id);
+            }
+        }
+    }
+
+    public bool HasObj(object obj)
+    {
+        return this.id2ptr.ContainsKey(PythonOps.Id(obj));
+    }
+
+    public IntPtr GetPtr(object obj)
+    {
+        return this.id2ptr[PythonOps.Id(obj)];
+    }
+
+    public object GetObj(IntPtr ptr)
+    {
+        long id = this.ptr2id[ptr];
+        if (this.id2obj.ContainsKey(id))
+        {
+            return this.id2obj[id];
+        }
+        if (this.id2sref.ContainsKey(id))
+        {
+            return this.id2sref[id];
+        }
+        return this.id2wref[id].Target;
+    }
+}
+"""
+
+
+def compile_old_map():
+    params = CompilerParameters()
+    params.GenerateInMemory = True
+    params.ReferencedAssemblies.Add('System.dll')
+    params.ReferencedAssemblies.Add(clr.GetClrType(PythonOps).Assembly.Location)
+    results = CSharpCodeProvider().CompileAssemblyFromSource(params, OLD_MAP_SOURCE)
+    if results.Errors.HasErrors:
+        raise Exception('\n'.join(str(e) for e in results.Errors))
+    return results.CompiledAssembly.GetType('OldInterestingPtrMap')
+
+
+def timed(name, f):
+    watch = Stopwatch.StartNew()
+    f()
+    watch.Stop()
+    return name, watch.Elapsed.TotalMilliseconds
+
+
+def bench(mapType, objs, ptrs):
+    results = []
+    GC.Collect()
+    GC.WaitForPendingFinalizers()
+    before = GC.GetTotalMemory(True)
+    map = mapType()
+    half = len(objs) / 2
+
+    def associate():
+        for i in xrange(half):
+            map.Associate(ptrs[i], objs[i])
+        for i in xrange(half, len(objs)):
+            map.BridgeAssociate(ptrs[i], objs[i])
+    results.append(timed('associate', associate))
+    used = GC.GetTotalMemory(True) - before
+
+    def getobj():
+        for ptr in ptrs:
+            map.GetObj(ptr)
+    results.append(timed('getobj', getobj))
+
+    def getptr():
+        for obj in objs:
+            if map.HasObj(obj):
+                map.GetPtr(obj)
+    results.append(timed('hasobj+getptr', getptr))
+
+    def updatestrength():
+        for ptr in ptrs[half:]:
+            map.UpdateStrength(ptr)
+    results.append(timed('updatestrength', updatestrength))
+
+    def release():
+        for ptr in ptrs:
+            map.Release(ptr)
+    results.append(timed('release', release))
+    return results, used
+
+
+def main(count):
+    objs = [object() for _ in xrange(count)]
+    ptrs = [Marshal.AllocHGlobal(4) for _ in xrange(count)]
+    for ptr in ptrs:
+        Marshal.WriteInt32(ptr, 2)
+    try:
+        oldMap = compile_old_map()
+        # warm up both before measuring
+        bench(oldMap, objs[:1000], ptrs[:1000])
+        bench(InterestingPtrMap, objs[:1000], ptrs[:1000])
+        oldResults, oldUsed = bench(oldMap, objs, ptrs)
+        newResults, newUsed = bench(InterestingPtrMap, objs, ptrs)
+    finally:
+        for ptr in ptrs:
+            Marshal.FreeHGlobal(ptr)
+
+    print '%d mappings (half simple, half bridge)' % count
+    print '%-16s %12s %12s' % ('', 'old', 'new')
+    for (name, old), (_, new) in zip(oldResults, newResults):
+        print '%-16s %10.1fms %10.1fms' % (name, old, new)
+    print '%-16s %10.1fkB %10.1fkB' % ('memory', oldUsed / 1024.0, newUsed / 1024.0)
+    print '%-16s %10.1fB  %10.1fB' % ('bytes/mapping', float(oldUsed) / count, float(newUsed) / count)
+
+
+if __name__ == '__main__':
+    count = 200000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    main(count)
@@ -9,6 +9,7 @@ from System.Runtime.InteropServices import Marshal
 
 from Ironclad import CPyMarshal, dgt_int_ptrptrptr, DoubleStruct
 from Ironclad.Structs import PyObject, PyFloatObject, PyIntObject, PyListObject, PyTypeObject
+from Ironclad.Structs import PyObjectFields, PyFloatObjectFields, PyTypeObjectFields
 
 
 class CPyMarshalTest_32(TestCase):
@@ -327,7 +328,51 @@ class CPyMarshalTest_32(TestCase):
 
 
 
-suite = makesuite(CPyMarshalTest_32)
+class GeneratedFieldsTest(TestCase):
+
+    def testOffsets(self):
+        self.assertEquals(PyObjectFields.ob_refcnt, Marshal.OffsetOf(PyObject, "ob_refcnt").ToInt32())
+        self.assertEquals(PyObjectFields.ob_type, Marshal.OffsetOf(PyObject, "ob_type").ToInt32())
+        self.assertEquals(PyFloatObjectFields.ob_fval, Marshal.OffsetOf(PyFloatObject, "ob_fval").ToInt32())
+        self.assertEquals(PyTypeObjectFields.tp_version_tag, Marshal.OffsetOf(PyTypeObject, "tp_version_tag").ToInt32())
+
+
+    def testAccessors(self):
+        data = Marshal.AllocHGlobal(Marshal.SizeOf(PyTypeObject()))
+        CPyMarshal.Zero(data, Marshal.SizeOf(PyTypeObject()))
+        
+        PyObjectFields.WriteRefcnt(data, 123)
+        self.assertEquals(CPyMarshal.ReadIntField(data, PyObject, "ob_refcnt"), 123)
+        PyTypeObjectFields.WriteDoc(data, IntPtr(12345))
+        self.assertEquals(CPyMarshal.ReadPtrField(data, PyTypeObject, "tp_doc"), IntPtr(12345))
+        PyTypeObjectFields.WriteVersionTag(data, UInt32.MaxValue)
+        self.assertEquals(CPyMarshal.ReadUIntField(data, PyTypeObject, "tp_version_tag"), UInt32.MaxValue)
+        
+        CPyMarshal.WriteIntField(data, PyTypeObject, "tp_basicsize", 456)
+        self.assertEquals(PyTypeObjectFields.ReadBasicsize(data), 456)
+        CPyMarshal.WritePtrField(data, PyTypeObject, "ob_type", IntPtr(54321))
+        self.assertEquals(PyObjectFields.ReadType(data), IntPtr(54321))
+        
+        Marshal.FreeHGlobal(data)
+
+
+    def testDoubleAccessors(self):
+        data = Marshal.AllocHGlobal(Marshal.SizeOf(PyFloatObject()))
+        CPyMarshal.Zero(data, Marshal.SizeOf(PyFloatObject()))
+        
+        PyFloatObjectFields.WriteFval(data, -1.2e34)
+        self.assertEquals(CPyMarshal.ReadDoubleField(data, PyFloatObject, "ob_fval"), -1.2e34)
+        self.assertEquals(PyFloatObjectFields.ReadFval(data), -1.2e34)
+        
+        Marshal.FreeHGlobal(data)
+
+
+
+
+suite = makesuite(
+    CPyMarshalTest_32,
+    GeneratedFieldsTest,
+)
 if __name__ == '__main__':
     run(suite)
 
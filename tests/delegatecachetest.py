@@ -0,0 +1,46 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from System import IntPtr
+from System.Runtime.InteropServices import Marshal
+
+from Ironclad import DelegateCache, dgt_int_ptr, dgt_void_ptr
+
+
+class DelegateCacheTest(TestCase):
+
+    def testGetReusesDelegates(self):
+        calls = []
+        def f(ptr):
+            calls.append(ptr)
+        keepalive = dgt_void_ptr(f)
+        funcPtr = Marshal.GetFunctionPointerForDelegate(keepalive)
+        
+        cache = DelegateCache()
+        dgt = cache.Get(funcPtr, dgt_void_ptr)
+        self.assertEquals(type(dgt), dgt_void_ptr)
+        self.assertEquals(cache.Get(funcPtr, dgt_void_ptr) is dgt, True)
+        self.assertEquals(cache.Count, 1)
+        
+        dgt(IntPtr(123))
+        self.assertEquals(calls, [IntPtr(123)])
+
+
+    def testDelegateTypeIsPartOfKey(self):
+        def f(ptr):
+            return 0
+        keepalive = dgt_int_ptr(f)
+        funcPtr = Marshal.GetFunctionPointerForDelegate(keepalive)
+        
+        cache = DelegateCache()
+        self.assertEquals(type(cache.Get(funcPtr, dgt_int_ptr)), dgt_int_ptr)
+        self.assertEquals(type(cache.Get(funcPtr, dgt_void_ptr)), dgt_void_ptr)
+        self.assertEquals(cache.Count, 2)
+        
+        cache.Clear()
+        self.assertEquals(cache.Count, 0)
+
+
+suite = makesuite(DelegateCacheTest)
+if __name__ == '__main__':
+    run(suite)
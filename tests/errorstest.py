@@ -20,8 +20,46 @@ class ErrorsTest(TestCase):
                           "get should retrieve last set exception")
         self.assertEquals(str(mapper.LastException), "doozy",
                           "get should retrieve last set exception")
-    
-    
+
+
+    @WithMapper
+    def testErrorOccurred(self, mapper, _):
+        self.assertEquals(mapper.ErrorOccurred, False)
+        mapper.LastException = ValueError("boom")
+        self.assertEquals(mapper.ErrorOccurred, True)
+        mapper.LastException = None
+        self.assertEquals(mapper.ErrorOccurred, False)
+
+
+    @WithMapper
+    def testLastExceptionIsNotRebuilt(self, mapper, _):
+        error = ValueError("boom")
+        mapper.LastException = error
+        self.assertEquals(mapper.LastException is error, True)
+        self.assertEquals(mapper.LastException is error, True)
+        mapper.LastException = None
+
+
+    @WithMapper
+    def testTakeException(self, mapper, _):
+        self.assertEquals(mapper.TakeException(), None)
+
+        error = System.InvalidOperationException("doozy")
+        mapper.LastException = error
+        self.assertEquals(mapper.TakeException() is error, True,
+                          "should get back the original exception")
+        self.assertEquals(mapper.ErrorOccurred, False)
+        self.assertEquals(mapper.LastException, None)
+
+        mapper.LastException = KeyError("whatever")
+        taken = mapper.TakeException()
+        try:
+            raise taken
+        except KeyError, e:
+            self.assertEquals(e.args, ("whatever",))
+        self.assertEquals(mapper.ErrorOccurred, False)
+
+
     @WithMapper
     def testStore(self, mapper, _):
         for type_ in (TypeError, ValueError, IOError):
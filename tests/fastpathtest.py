@@ -0,0 +1,105 @@
+import os
+from tests.utils.runtest import automakesuite, run
+from tests.utils.testcase import TestCase
+
+from System import IntPtr
+from System.Runtime.InteropServices import Marshal
+
+from Ironclad import (
+    dgt_double_ptr, dgt_int_ptr, dgt_ptr_int, dgt_ptr_ptr, PythonMapper, Unmanaged
+)
+
+PYTHON_DLL = "python27.dll"
+DLL_PATH = os.path.join("build", "ironclad", PYTHON_DLL)
+
+
+def WithStubMapper(func):
+    # the C fast paths only exist in the real stub, so we need a mapper which loads it
+    def patched(*args):
+        mapper = PythonMapper(DLL_PATH)
+        mapper.EnsureGIL()
+        try:
+            return func(*(args + (mapper,)))
+        finally:
+            mapper.ReleaseGIL()
+            mapper.Dispose()
+    return patched
+
+
+def GetStubFunction(name, dgtType):
+    funcPtr = Unmanaged.GetProcAddress(Unmanaged.GetModuleHandle(PYTHON_DLL), name)
+    return Marshal.GetDelegateForFunctionPointer(funcPtr, dgtType)
+
+
+class FastPathTest(TestCase):
+
+    def assertMatchesManaged(self, mapper, name, dgtType, ptr):
+        native = GetStubFunction(name, dgtType)(ptr)
+        nativeError = mapper.LastException
+        mapper.LastException = None
+
+        managed = getattr(mapper, name)(ptr)
+        managedError = mapper.LastException
+        mapper.LastException = None
+
+        self.assertEquals(native, managed, "%s: stub and mapper disagree" % name)
+        self.assertEquals(type(nativeError), type(managedError), "%s: stub and mapper set different errors" % name)
+        return native
+
+
+    @WithStubMapper
+    def testPyTuple_Size(self, mapper):
+        for value in ((), (1,), ('a', 'b', 'c')):
+            ptr = mapper.Store(value)
+            self.assertEquals(self.assertMatchesManaged(mapper, 'PyTuple_Size', dgt_int_ptr, ptr), len(value))
+            mapper.DecRef(ptr)
+
+
+    @WithStubMapper
+    def testPyString_Size(self, mapper):
+        for value in ('', 'x', 'hello\0world'):
+            ptr = mapper.Store(value)
+            self.assertEquals(self.assertMatchesManaged(mapper, 'PyString_Size', dgt_int_ptr, ptr), len(value))
+            mapper.DecRef(ptr)
+
+
+    @WithStubMapper
+    def testPyString_AsString(self, mapper):
+        for value in ('', 'hello', 123):
+            ptr = mapper.Store(value)
+            self.assertMatchesManaged(mapper, 'PyString_AsString', dgt_ptr_ptr, ptr)
+            mapper.DecRef(ptr)
+
+
+    @WithStubMapper
+    def testPyInt_AsLong(self, mapper):
+        for value in (0, -5, 2147483647, True, 12L, 3.7, 'nope'):
+            ptr = mapper.Store(value)
+            self.assertMatchesManaged(mapper, 'PyInt_AsLong', dgt_int_ptr, ptr)
+            mapper.DecRef(ptr)
+
+
+    @WithStubMapper
+    def testPyFloat_AsDouble(self, mapper):
+        for value in (0.0, -1.5, 1e300, 7, 12L, 'nope'):
+            ptr = mapper.Store(value)
+            self.assertMatchesManaged(mapper, 'PyFloat_AsDouble', dgt_double_ptr, ptr)
+            mapper.DecRef(ptr)
+
+
+    @WithStubMapper
+    def testPyBool_FromLong(self, mapper):
+        PyBool_FromLong = GetStubFunction('PyBool_FromLong', dgt_ptr_int)
+        for value, expectedPtr in ((0, mapper._Py_ZeroStruct), (1, mapper._Py_TrueStruct), (-23, mapper._Py_TrueStruct)):
+            refcnt = mapper.RefCount(expectedPtr)
+            self.assertEquals(PyBool_FromLong(value), expectedPtr)
+            self.assertEquals(mapper.RefCount(expectedPtr), refcnt + 1)
+            self.assertEquals(mapper.PyBool_FromLong(value), expectedPtr)
+            self.assertEquals(mapper.RefCount(expectedPtr), refcnt + 2)
+            mapper.DecRef(expectedPtr)
+            mapper.DecRef(expectedPtr)
+
+
+suite = automakesuite(locals())
+if __name__ == '__main__':
+    run(suite)
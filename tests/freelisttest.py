@@ -0,0 +1,97 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from tests.utils.allocators import GetAllocatingTestAllocator
+from tests.utils.memory import CreateTypes
+
+from Ironclad import CPyMarshal, dgt_void_ptr, PythonMapper
+from Ironclad.Structs import PyTypeObject
+
+
+class FreeListTest(TestCase):
+
+    def withMapper(self, limit, test):
+        allocs, frees = [], []
+        mapper = PythonMapper(GetAllocatingTestAllocator(allocs, frees))
+        deallocTypes = CreateTypes(mapper)
+        mapper.FreeListLimit = limit
+        mapper.EnsureGIL()
+        try:
+            test(mapper, allocs, frees)
+        finally:
+            mapper.ReleaseGIL()
+            mapper.Dispose()
+            deallocTypes()
+
+
+    def testDisabledByDefault(self):
+        mapper = PythonMapper()
+        try:
+            self.assertEquals(mapper.FreeListLimit, 0)
+        finally:
+            mapper.Dispose()
+
+
+    def testFloatsAreRecycled(self):
+        def test(mapper, allocs, frees):
+            ptr = mapper.Store(1.5)
+            mapper.DecRef(ptr)
+            self.assertFalse(ptr in frees)
+            self.assertFalse(mapper.HasPtr(ptr))
+            self.assertEquals(mapper.FreeListCount, 1)
+            
+            del allocs[:]
+            self.assertEquals(mapper.Store(2.5), ptr)
+            self.assertEquals(allocs, [])
+            self.assertEquals(mapper.Retrieve(ptr), 2.5)
+            self.assertEquals(mapper.FreeListCount, 0)
+        self.withMapper(10, test)
+
+
+    def testTuplesAreRecycledByLength(self):
+        def test(mapper, allocs, frees):
+            ptr3 = mapper.PyTuple_New(3)
+            mapper.DecRef(ptr3)
+            self.assertFalse(ptr3 in frees)
+            
+            self.assertNotEquals(mapper.PyTuple_New(2), ptr3)
+            self.assertEquals(mapper.PyTuple_New(3), ptr3)
+            
+            ptr30 = mapper.PyTuple_New(30)
+            mapper.DecRef(ptr30)
+            self.assertTrue(ptr30 in frees)
+        self.withMapper(10, test)
+
+
+    def testLimit(self):
+        def test(mapper, allocs, frees):
+            ptrs = [mapper.Store(float(i)) for i in range(3)]
+            for ptr in ptrs:
+                mapper.DecRef(ptr)
+            self.assertEquals(mapper.FreeListCount, 2)
+            self.assertEquals([ptr in frees for ptr in ptrs], [False, False, True])
+            
+            mapper.FreeListLimit = 1
+            self.assertEquals(mapper.FreeListCount, 1)
+            self.assertEquals([ptr in frees for ptr in ptrs], [False, True, True])
+        self.withMapper(2, test)
+
+
+    def testCustomFreeFunctionsAreRespected(self):
+        def test(mapper, allocs, frees):
+            calls = []
+            freeDgt = dgt_void_ptr(calls.append)
+            CPyMarshal.WriteFunctionPtrField(mapper.PyFloat_Type, PyTypeObject, "tp_free", freeDgt)
+            
+            ptr = mapper.Store(1.5)
+            mapper.DecRef(ptr)
+            self.assertEquals(calls, [ptr])
+            self.assertEquals(mapper.FreeListCount, 0)
+            mapper.PyObject_Free(ptr)
+        self.withMapper(10, test)
+
+
+suite = makesuite(FreeListTest)
+
+if __name__ == '__main__':
+    run(suite)
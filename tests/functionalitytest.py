@@ -185,6 +185,31 @@ class ExternalFunctionalityTest(FunctionalTestCase):
             
             """ % os.path.abspath(__file__)))
 
+    def testParallelMap(self):
+        self.assertRuns(dedent("""\
+            import bz2
+            texts = [str(i) * 10000 for i in range(20)]
+            compressed = ironclad.parallel_map(bz2.compress, texts, workers=4)
+            assert compressed == map(bz2.compress, texts)
+
+            with ironclad.Executor(2) as executor:
+                future = executor.submit(bz2.decompress, compressed[3])
+                assert future.result(timeout=10) == texts[3]
+
+                future = executor.submit(bz2.decompress, 'not bz2 data')
+                assert isinstance(future.exception(), IOError)
+            """))
+
+    def testParallelMapInsideGILHeld(self):
+        self.assertRuns(dedent("""\
+            import bz2
+            texts = [str(i) * 10000 for i in range(20)]
+            with ironclad.gil_held():
+                compressed = ironclad.parallel_map(bz2.compress, texts, workers=4)
+                assert ironclad._mapper.InGILBatch
+            assert compressed == map(bz2.compress, texts)
+            """))
+
 
 class NumpyTest(FunctionalTestCase):
 
@@ -17,13 +17,14 @@ class StubGeneratorTest(TestCase):
 
 INPUTS = {
     'PURE_C_SYMBOLS': set('FUNC1 DATA1 DATA2'.split()),
-    'EXPORTED_FUNCTIONS': 'FUNC1 FUNC2'.split(),
+    'FAST_PATH_SYMBOLS': set(['FUNC5']),
+    'EXPORTED_FUNCTIONS': 'FUNC1 FUNC2 FUNC5'.split(),
     'EXTRA_FUNCTIONS': ['void FUNC3(void);', 'int FUNC4(void);'],
     'MGD_API_DATA': 'DATA3 DATA2'.split()
 }
 
 EXPECT_STUBINIT = """\
-void *jumptable[3];
+void *jumptable[4];
 
 typedef void *(*getfuncptr_fp)(const char*);
 typedef void (*registerdata_fp)(const char*, const void*);
@@ -32,8 +33,9 @@ void init(getfuncptr_fp getfuncptr, registerdata_fp registerdata)
     registerdata("DATA3", &DATA3);
     registerdata("DATA2", &DATA2);
     jumptable[0] = getfuncptr("FUNC2");
-    jumptable[1] = getfuncptr("FUNC3");
-    jumptable[2] = getfuncptr("FUNC4");
+    jumptable[1] = getfuncptr("FUNC5");
+    jumptable[2] = getfuncptr("FUNC3");
+    jumptable[3] = getfuncptr("FUNC4");
 }
 """
 
@@ -43,14 +45,17 @@ extern _jumptable
 section .code
 
 global _FUNC2
+global _IC_FUNC5
 global _FUNC3
 global _FUNC4
 _FUNC2:
     jmp [_jumptable+0]
-_FUNC3:
+_IC_FUNC5:
     jmp [_jumptable+4]
-_FUNC4:
+_FUNC3:
     jmp [_jumptable+8]
+_FUNC4:
+    jmp [_jumptable+12]
 """
 
 EXPECT_HEADER = """\
@@ -0,0 +1,109 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from System.Diagnostics import Stopwatch
+from System.Threading import Thread, ThreadStart
+
+from Ironclad import GILStats, PythonMapper
+
+
+class GILStatsTest(TestCase):
+
+    def withMapper(self, test):
+        mapper = PythonMapper()
+        try:
+            test(mapper)
+        finally:
+            mapper.Dispose()
+
+
+    def getStats(self, mapper):
+        threadId = Thread.CurrentThread.ManagedThreadId
+        return [s for s in mapper.GetGILStats() if s.ThreadId == threadId]
+
+
+    def testDisabledByDefault(self):
+        def test(mapper):
+            self.assertEquals(mapper.RecordGILStats, False)
+            mapper.EnsureGIL()
+            mapper.ReleaseGIL()
+            self.assertEquals(self.getStats(mapper), [])
+        self.withMapper(test)
+
+
+    def testRecordsOutermostAcquisitions(self):
+        def test(mapper):
+            mapper.RecordGILStats = True
+            for _ in range(3):
+                mapper.EnsureGIL()
+                mapper.EnsureGIL()
+                mapper.ReleaseGIL()
+                mapper.ReleaseGIL()
+            
+            [stats] = self.getStats(mapper)
+            self.assertEquals(stats.Acquisitions, 3)
+            self.assertEquals(sum(stats.WaitHistogram), 3)
+            self.assertEquals(sum(stats.HoldHistogram), 3)
+            self.assertEquals(len(stats.HoldHistogram), GILStats.HISTOGRAM_BUCKETS)
+            self.assertTrue(stats.TotalHold >= stats.MaxHold >= 0)
+            self.assertTrue(stats.TotalWait >= stats.MaxWait >= 0)
+            self.assertEquals(stats.SaveThreadReleases, 0)
+        self.withMapper(test)
+
+
+    def testRecordsSaveThread(self):
+        def test(mapper):
+            mapper.RecordGILStats = True
+            mapper.EnsureGIL()
+            mapper.PyEval_RestoreThread(mapper.PyEval_SaveThread())
+            mapper.ReleaseGIL()
+            
+            [stats] = self.getStats(mapper)
+            self.assertEquals(stats.SaveThreadReleases, 1)
+            self.assertEquals(stats.Acquisitions, 2)
+        self.withMapper(test)
+
+
+    def testRecordsContention(self):
+        def test(mapper):
+            mapper.RecordGILStats = True
+            mapper.EnsureGIL()
+            def Acquire():
+                mapper.EnsureGIL()
+                mapper.ReleaseGIL()
+            t = Thread(ThreadStart(Acquire))
+            t.Start()
+            Thread.CurrentThread.Join(100)
+            mapper.ReleaseGIL()
+            t.Join()
+            
+            [stats] = [s for s in mapper.GetGILStats() if s.ThreadId == t.ManagedThreadId]
+            self.assertEquals(stats.Acquisitions, 1)
+            self.assertTrue(stats.MaxWait > 0.05)
+            self.assertEquals(stats.WaitHistogram[0], 0)
+        self.withMapper(test)
+
+
+    def testReset(self):
+        def test(mapper):
+            mapper.RecordGILStats = True
+            mapper.EnsureGIL()
+            mapper.ReleaseGIL()
+            mapper.ResetGILStats()
+            
+            [stats] = self.getStats(mapper)
+            self.assertEquals(stats.Acquisitions, 0)
+            self.assertEquals(stats.TotalHold, 0)
+            self.assertEquals(sum(stats.HoldHistogram), 0)
+        self.withMapper(test)
+
+
+    def testBuckets(self):
+        self.assertEquals(GILStats.Bucket(0), 0)
+        self.assertEquals(GILStats.Bucket(Stopwatch.Frequency), 20)
+        self.assertEquals(GILStats.Bucket(Stopwatch.Frequency * 100000), GILStats.HISTOGRAM_BUCKETS - 1)
+
+
+suite = makesuite(GILStatsTest)
+if __name__ == '__main__':
+    run(suite)
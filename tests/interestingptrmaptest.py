@@ -4,7 +4,7 @@ from tests.utils.testcase import TestCase
 
 from tests.utils.gc import gcwait
 
-from System import NullReferenceException, WeakReference
+from System import IntPtr, NullReferenceException, WeakReference
 from System.Runtime.InteropServices import Marshal
 
 
@@ -154,6 +154,119 @@ class InterestingPtrMapTest(TestCase):
         self.assertEquals(ref2.IsAlive, False, "failed to GC")
     
     
+    def testUnforcedCheckBridgePtrsSweepsIncrementally(self):
+        def do():
+            # see NOTE
+            map = InterestingPtrMap()
+            map.GCThreshold = 2
+            map.FallbackSweepInterval = 1
+            refs = []
+            for _ in range(4):
+                _, ptr, obj, ref = self.getVars()
+                map.BridgeAssociate(ptr, obj)
+                refs.append(ref)
+            del obj
+            return map, refs
+        map, refs = do()
+
+        # half the bridge objects are examined (and weakened) per check
+        map.CheckBridgePtrs(False)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False, False, True, True])
+
+        map.CheckBridgePtrs(False)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False, False, False, False])
+    
+    
+    def testFallbackSweepIsSlowerThanGCThreshold(self):
+        def do():
+            # see NOTE
+            map = InterestingPtrMap()
+            map.GCThreshold = 1
+            map.FallbackSweepInterval = 10
+            map.SweepBudget = 0
+            refs = []
+            for _ in range(20):
+                _, ptr, obj, ref = self.getVars()
+                map.BridgeAssociate(ptr, obj)
+                refs.append(ref)
+            del obj
+            return map, refs
+        map, refs = do()
+        self.assertEquals(map.FallbackSweepInterval, 10)
+
+        # nothing is dirty, so only 20 / (1 * 10) slots are examined, not 20 / 1
+        map.CheckBridgePtrs(False)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False] * 2 + [True] * 18)
+    
+    
+    def testSweepBudgetLimitsUnforcedCheckBridgePtrs(self):
+        def do():
+            # see NOTE
+            map = InterestingPtrMap()
+            map.GCThreshold = 1
+            map.FallbackSweepInterval = 1
+            map.SweepBudget = 1
+            refs = []
+            for _ in range(3):
+                _, ptr, obj, ref = self.getVars()
+                map.BridgeAssociate(ptr, obj)
+                refs.append(ref)
+            del obj
+            return map, refs
+        map, refs = do()
+
+        map.CheckBridgePtrs(False)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False, True, True])
+
+        map.CheckBridgePtrs(True)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False, False, False])
+    
+    
+    def testUnforcedCheckBridgePtrsUpdatesDirtyPtrs(self):
+        def do():
+            # see NOTE
+            map = InterestingPtrMap()
+            map.GCThreshold = 1000000
+            refs, ptrs = [], []
+            for _ in range(3):
+                _, ptr, obj, ref = self.getVars()
+                map.BridgeAssociate(ptr, obj)
+                refs.append(ref)
+                ptrs.append(ptr)
+            del obj
+            _, simplePtr, simpleObj, __ = self.getVars()
+            map.Associate(simplePtr, simpleObj)
+            
+            map.MarkDirty(ptrs[2])
+            map.MarkDirty(ptrs[2])
+            map.MarkDirty(simplePtr)
+            self.assertEquals(map.DirtyCount, 1)
+            return map, refs
+        map, refs = do()
+        
+        # the fallback sweep only reaches the first slot; the dirty one is handled too
+        map.CheckBridgePtrs(False)
+        self.assertEquals(map.DirtyCount, 0)
+        gcwait()
+        self.assertEquals([ref.IsAlive for ref in refs], [False, True, False])
+    
+    
+    def testReleaseForgetsDirtyPtr(self):
+        map, ptr, obj, _ = self.getVars()
+        map.BridgeAssociate(ptr, obj)
+        map.MarkDirty(ptr)
+        map.Release(ptr)
+        map.Associate(ptr, obj)
+        map.CheckBridgePtrs(False)
+        self.assertEquals(map.GetObj(ptr), obj)
+        self.assertEquals(map.DirtyCount, 0)
+    
+    
     def testMapOverBridgePtrs(self):
         map, ptr1, obj1, _ = self.getVars()
         __, ptr2, obj2, ___ = self.getVars()
@@ -166,6 +279,79 @@ class InterestingPtrMapTest(TestCase):
         map.MapOverBridgePtrs(PtrFunc(MapFunc))
         self.assertEquals(len(ptrs), 2)
         self.assertEquals(set(ptrs), set([ptr1, ptr2]))
+    
+    
+    def testReleasedSlotsAreReused(self):
+        map, ptr1, obj1, _ = self.getVars()
+        __, ptr2, obj2, ___ = self.getVars()
+        map.Associate(ptr1, obj1)
+        map.BridgeAssociate(ptr2, obj2)
+        self.assertEquals((map.Count, map.BridgeCount), (2, 1))
+        
+        map.Release(ptr1)
+        map.Release(ptr2)
+        self.assertEquals((map.Count, map.BridgeCount), (0, 0))
+        self.assertFalse(map.HasPtr(ptr1))
+        self.assertFalse(map.HasObj(obj2))
+        
+        map.Associate(ptr2, obj1)
+        map.BridgeAssociate(ptr1, obj2)
+        self.assertEquals((map.Count, map.BridgeCount), (2, 1))
+        self.assertEquals(map.GetObj(ptr2), obj1)
+        self.assertEquals(map.GetPtr(obj2), ptr1)
+    
+    
+    def testLatestMappingWinsAfterResize(self):
+        map = InterestingPtrMap()
+        obj, filler = object(), object()
+        fillerPtr, oldPtr, newPtr = IntPtr(0x1000), IntPtr(0x1010), IntPtr(0x1020)
+        map.Associate(fillerPtr, filler)
+        map.Associate(oldPtr, obj)
+        map.Release(fillerPtr)
+        
+        # reuses the filler's slot, which comes before the old mapping's
+        map.Associate(newPtr, obj)
+        self.assertEquals(map.GetPtr(obj), newPtr)
+        
+        others = [object() for _ in range(1000)]
+        for i, other in enumerate(others):
+            map.Associate(IntPtr(0x10000 + (i * 16)), other)
+        self.assertEquals(map.GetPtr(obj), newPtr)
+    
+    
+    def testReleasedLatestMappingStaysReleasedAfterResize(self):
+        map = InterestingPtrMap()
+        obj = object()
+        oldPtr, newPtr = IntPtr(0x1000), IntPtr(0x1010)
+        map.Associate(oldPtr, obj)
+        map.Associate(newPtr, obj)
+        map.Release(newPtr)
+        self.assertEquals(map.HasObj(obj), False)
+        self.assertEquals(map.GetObj(oldPtr), obj)
+        
+        others = [object() for _ in range(1000)]
+        for i, other in enumerate(others):
+            map.Associate(IntPtr(0x10000 + (i * 16)), other)
+        self.assertEquals(map.HasObj(obj), False)
+        self.assertEquals(map.GetObj(oldPtr), obj)
+    
+    
+    def testManyMappings(self):
+        map = InterestingPtrMap()
+        objs = [object() for _ in range(5000)]
+        ptrs = [IntPtr(0x1000 + (i * 16)) for i in range(len(objs))]
+        for ptr, obj in zip(ptrs, objs):
+            map.Associate(ptr, obj)
+        for ptr in ptrs[::2]:
+            map.Release(ptr)
+        
+        self.assertEquals(map.Count, len(objs) / 2)
+        for i, (ptr, obj) in enumerate(zip(ptrs, objs)):
+            self.assertEquals(map.HasPtr(ptr), i % 2 == 1)
+            self.assertEquals(map.HasObj(obj), i % 2 == 1)
+            if i % 2:
+                self.assertEquals(map.GetObj(ptr), obj)
+                self.assertEquals(map.GetPtr(obj), ptr)
         
         
 
@@ -2,7 +2,7 @@
 from tests.utils.runtest import makesuite, run
 from tests.utils.testcase import TestCase
 
-from System.Threading import Thread, ThreadStart
+from System.Threading import ManualResetEvent, Thread, ThreadStart
 
 from Ironclad import Lock, LockException
 
@@ -59,6 +59,170 @@ class LockTest(TestCase):
         t.Join()
         
         lock.Release()
+
+
+    def testTryAcquireIsReentrant(self):
+        lock = Lock()
+        self.assertEquals(lock.TryAcquire(), True)
+        self.assertEquals(lock.TryAcquire(), True)
+        self.assertEquals(lock.CountAcquired, 2)
+        lock.Release()
+        lock.Release()
+        self.assertEquals(lock.IsAcquired, False)
+
+
+    def testReleaseUnownedLock(self):
+        lock = Lock()
+        self.assertRaises(LockException, lock.Release)
+        
+        lock.Acquire()
+        def TestCannotRelease():
+            self.assertRaises(LockException, lock.Release)
+        t = Thread(ThreadStart(TestCannotRelease))
+        t.Start()
+        t.Join()
+        lock.Release()
+
+
+    def testBlockedAcquireWakesOnRelease(self):
+        lock = Lock()
+        lock.Acquire()
+        
+        started = ManualResetEvent(False)
+        acquired = []
+        def Acquire():
+            started.Set()
+            lock.Acquire()
+            acquired.append(lock.CountAcquired)
+            lock.Release()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        started.WaitOne()
+        Thread.Sleep(100)
+        self.assertEquals(acquired, [])
+        
+        lock.Release()
+        t.Join()
+        self.assertEquals(acquired, [1])
+        self.assertEquals(lock.IsAcquired, False)
+
+
+    def testContended(self):
+        lock = Lock()
+        counter = [0]
+        def Increment():
+            for _ in range(1000):
+                lock.Acquire()
+                value = counter[0]
+                Thread.SpinWait(10)
+                counter[0] = value + 1
+                lock.Release()
+        threads = [Thread(ThreadStart(Increment)) for _ in range(4)]
+        for t in threads:
+            t.Start()
+        for t in threads:
+            t.Join()
+        self.assertEquals(counter, [4000])
+
+
+    def testSwitchInterval(self):
+        lock = Lock()
+        self.assertEquals(lock.SwitchInterval, 0)
+        lock.SwitchInterval = 0.005
+        self.assertEquals(lock.SwitchInterval, 0.005)
+        lock.SwitchInterval = -1
+        self.assertEquals(lock.SwitchInterval, 0)
+
+
+    def testHandOffToWaiter(self):
+        lock = Lock()
+        lock.SwitchInterval = 0.001
+        lock.Acquire()
+        
+        acquired = []
+        def Acquire():
+            lock.Acquire()
+            acquired.append(lock.CountAcquired)
+            lock.Release()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        while not lock.DropRequested:
+            Thread.Sleep(1)
+        
+        # without the hand-off, we'd get straight back in here
+        lock.Release()
+        lock.Acquire()
+        self.assertEquals(acquired, [1])
+        self.assertEquals(lock.DropRequested, False)
+        lock.Release()
+        t.Join()
+
+
+    def testHandOffToWaiterWhileOwnerKeepsReacquiring(self):
+        lock = Lock()
+        lock.SwitchInterval = 0.005
+        lock.Acquire()
+
+        acquired = []
+        def Acquire():
+            lock.Acquire()
+            acquired.append(lock.CountAcquired)
+            lock.Release()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+
+        # every release wakes the waiter, but it must still get the lock in the end
+        for _ in range(100000):
+            lock.Release()
+            lock.Acquire()
+            if acquired:
+                break
+        lock.Release()
+        t.Join()
+        self.assertEquals(acquired, [1])
+
+
+    def testReleaseAllReacquire(self):
+        lock = Lock()
+        lock.Acquire()
+        lock.Acquire()
+        count = lock.ReleaseAll()
+        self.assertEquals(count, 2)
+        self.assertEquals(lock.IsAcquired, False)
+
+        lock.Reacquire(count)
+        self.assertEquals(lock.CountAcquired, 2)
+        lock.Release()
+        lock.Release()
+        self.assertEquals(lock.IsAcquired, False)
+
+
+    def testYield(self):
+        lock = Lock()
+        lock.SwitchInterval = 0.001
+        lock.Acquire()
+        lock.Acquire()
+        
+        lock.Yield()
+        self.assertEquals(lock.CountAcquired, 2)
+        
+        acquired = []
+        def Acquire():
+            lock.Acquire()
+            acquired.append(lock.CountAcquired)
+            lock.Release()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        while not lock.DropRequested:
+            Thread.Sleep(1)
+        
+        lock.Yield()
+        self.assertEquals(acquired, [1])
+        self.assertEquals(lock.CountAcquired, 2)
+        lock.Release()
+        lock.Release()
+        t.Join()
+        self.assertEquals(lock.IsAcquired, False)
         
 
 suite = makesuite(
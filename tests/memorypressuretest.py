@@ -0,0 +1,36 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from Ironclad import MemoryPressure
+
+
+class MemoryPressureTest(TestCase):
+
+    def testReportsInChunks(self):
+        pressure = MemoryPressure(1000)
+        pressure.Add(600)
+        self.assertEquals((pressure.Tracked, pressure.Reported), (600, 0))
+        pressure.Add(600)
+        self.assertEquals((pressure.Tracked, pressure.Reported), (1200, 1200))
+        
+        pressure.Remove(900)
+        self.assertEquals((pressure.Tracked, pressure.Reported), (300, 1200))
+        pressure.Remove(200)
+        self.assertEquals((pressure.Tracked, pressure.Reported), (100, 100))
+        
+        pressure.Remove(100)
+        self.assertEquals((pressure.Tracked, pressure.Reported), (0, 0))
+
+
+    def testReset(self):
+        pressure = MemoryPressure(1000)
+        pressure.Add(5000)
+        self.assertEquals(pressure.Reported, 5000)
+        pressure.Reset()
+        self.assertEquals((pressure.Tracked, pressure.Reported), (0, 0))
+
+
+suite = makesuite(MemoryPressureTest)
+
+if __name__ == '__main__':
+    run(suite)
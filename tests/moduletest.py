@@ -64,6 +64,8 @@ class Py_InitModule4_Test(TestCase):
                             'delegate not remembered')
             self.assertEquals(test_module.harold.__doc__, "harold's documentation",
                               'function docstring not remembered')
+            self.assertFalse(hasattr(test_module, '_ironclad_bind'),
+                             'generated code left junk in module')
 
         self.assert_Py_InitModule4_withSingleMethod(mapper, method, testModule)
         deallocMethod()
@@ -171,6 +173,8 @@ class Py_InitModule4_Test(TestCase):
         
         def testModule(module, mapper):
             self.assertEquals(module.func(*args), result, "not hooked up")
+            mapper.IncRef(resultPtr)
+            self.assertEquals(module.func(*args), result, "failed with reused args tuple")
             
         self.assert_Py_InitModule4_withSingleMethod(mapper, method, testModule)
         deallocMethod()
@@ -322,6 +326,12 @@ class ImportTest(TestCase):
         self.assertEquals(mapper.PyImport_Import(mapper.Store("test_module")), modulePtr)
         self.assertEquals(mapper.RefCount(modulePtr), 2, "did not incref")
     
+    @WithMapper
+    def testPyImport_ImportModule_Submodule(self, mapper, _):
+        import os.path
+        pathPtr = mapper.PyImport_ImportModule("os.path")
+        self.assertEquals(mapper.Retrieve(pathPtr) is os.path, True)
+    
     @WithMapper
     def testPyImport_AddModule(self, mapper, _):
         sysPtr = mapper.PyImport_ImportModule("sys")
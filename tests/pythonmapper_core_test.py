@@ -11,8 +11,8 @@ from tests.utils.pythonmapper import MakeAndAddEmptyModule
 from tests.utils.testcase import TestCase, WithMapper
 
 from System import Int32, IntPtr, InvalidOperationException, NullReferenceException, Type, WeakReference
-from System.Collections.Generic import Stack, List
 from System.Runtime.InteropServices import Marshal
+from System.Threading import Thread, ThreadStart
 
 from Ironclad import (
     BadRefCountException, CannotInterpretException, CPyMarshal, dgt_void_ptr, dgt_void_void,
@@ -506,58 +506,72 @@ class PythonMapper_References_Test(TestCase):
         mapper.EnsureGIL()
 
 
-    def testReleaseGilDoesntExplodeIfTempObjectsEmpty(self):
+    def testReleaseGilDoesntExplodeIfNoTempObjectScope(self):
         frees = []
         mapper = PythonMapper(GetAllocatingTestAllocator([], frees))
-        mapper.tempObjects = Stack[List[IntPtr]]()
         try:
             mapper.ReleaseGIL()
         except InvalidOperationException:
-            self.fail('ReleaseGIL should not throw StackEmpty if tempObjects is empty')
+            self.fail('ReleaseGIL should not throw StackEmpty if no temp object scope is open')
+        except NullReferenceException:
+            self.fail('ReleaseGIL should not throw NullReference if no temp object scope is open')
         except Exception:
             pass
         finally:
             mapper.Dispose()
 
 
-    def testReleaseGilDoesntExplodeIfTempObjectsContainsNull(self):
-        frees = []
-        mapper = PythonMapper(GetAllocatingTestAllocator([], frees))
-        mapper.tempObjects = Stack[List[IntPtr]]()
-        mapper.tempObjects.Push(None)
-        try:
+    @WithMapper
+    def testTempObjectScopesArePerThread(self, mapper, _):
+        ptr = mapper.Store(object())
+        mapper.IncRef(ptr)
+        mapper.DecRefLater(ptr)
+        
+        refcnts = []
+        def OtherThread():
+            mapper.EnsureGIL()
+            refcnts.append(mapper.RefCount(ptr))
             mapper.ReleaseGIL()
-        except SystemError:
-            self.fail('ReleaseGIL should not throw NullReference if tempObjects contains None')
-        except Exception:
-            pass
-        finally:
-            mapper.Dispose()
+        t = Thread(ThreadStart(OtherThread))
+        t.Start()
+        Thread.CurrentThread.Join(100)
+        
+        mapper.ReleaseGIL()
+        t.Join()
+        self.assertEquals(refcnts, [1], "ReleaseGIL closed the wrong thread's scope")
+        mapper.EnsureGIL()
 
 
-    def testDecRefLaterSurvivesEmptyStack(self):
+    def testDecRefLaterSurvivesNoTempObjectScope(self):
         frees = []
         mapper = PythonMapper(GetAllocatingTestAllocator([], frees))
-        mapper.tempObjects = Stack[List[IntPtr]]()
         try:
             mapper.DecRefLater(IntPtr.Zero)
         except InvalidOperationException:
-            self.fail('DecRefLater should not throw StackEmpty if tempObjects is empty')
+            self.fail('DecRefLater should not throw StackEmpty if no temp object scope is open')
+        except NullReferenceException:
+            self.fail('DecRefLater should not throw NullReference if no temp object scope is open')
         finally:
             mapper.Dispose()
 
 
-    def testDecRefLaterSurvivesNoneOnStack(self):
-        frees = []
-        mapper = PythonMapper(GetAllocatingTestAllocator([], frees))
-        mapper.tempObjects = Stack[List[IntPtr]]()
-        mapper.tempObjects.Push(None)
-        try:
-            mapper.DecRefLater(IntPtr.Zero)
-        except SystemError:
-            self.fail('DecRefLater should not throw NullReference if tempObjects contains None')
-        finally:
-            mapper.Dispose()
+    @WithMapper
+    def testNestedTempObjectScopes(self, mapper, _):
+        ptrs = [mapper.Store(object()) for _ in range(100)]
+        for ptr in ptrs:
+            mapper.IncRef(ptr)
+            mapper.IncRef(ptr)
+            mapper.DecRefLater(ptr)
+        
+        mapper.EnsureGIL()
+        for ptr in ptrs:
+            mapper.DecRefLater(ptr)
+        mapper.ReleaseGIL()
+        self.assertEquals([mapper.RefCount(ptr) for ptr in ptrs], [2] * 100)
+        
+        mapper.ReleaseGIL()
+        self.assertEquals([mapper.RefCount(ptr) for ptr in ptrs], [1] * 100)
+        mapper.EnsureGIL()
 
 
     @WithMapper
@@ -657,6 +657,39 @@ class MethodsTest(MethodConnectionTestCase):
         deallocMethod()
 
 
+    @WithMapper
+    def testMethodNameAndDoc(self, mapper, addToCleanUp):
+        methodDef, deallocMethod = MakeMethodDef("method", lambda _, __: IntPtr.Zero, METH.VARARGS, "method's documentation")
+        addToCleanUp(deallocMethod)
+        typePtr, deallocType = MakeTypePtr(mapper, {"tp_methods": [methodDef]})
+        addToCleanUp(deallocType)
+
+        klass = mapper.Retrieve(typePtr)
+        klass.method
+        method = klass.__dict__['method']
+        self.assertEquals(method.__name__, "method")
+        self.assertEquals(method.__doc__, "method's documentation")
+
+
+    @WithMapper
+    def testMethodsCreatedOnFirstLookup(self, mapper, addToCleanUp):
+        methodDef, deallocMethod = MakeMethodDef("method", lambda _, __: IntPtr.Zero, METH.VARARGS)
+        addToCleanUp(deallocMethod)
+        typePtr, deallocType = MakeTypePtr(mapper, {"tp_name": "klass", "tp_methods": [methodDef]})
+        addToCleanUp(deallocType)
+
+        klass = mapper.Retrieve(typePtr)
+        self.assertEquals(type(klass.__dict__['method']).__name__, '_ironclad_lazy_method')
+        self.assertFalse(klass._dispatcher.table.has_key('klass.method'))
+
+        subclass = type('subclass', (klass,), {})
+        subclass.method
+        method = klass.__dict__['method']
+        self.assertEquals(method.__name__, "method")
+        self.assertEquals(klass._dispatcher.table.has_key('klass.method'), True)
+        self.assertEquals(klass.method.im_func is method, True, "did not cache method on class")
+
+
     def testOldArgsMethod_OneArg(self):
         result = object()
         arg = object()
@@ -433,6 +433,48 @@ class _PyString_Resize_Test(PyString_TestCase):
             mapper.Dispose()
             Marshal.FreeHGlobal(ptrPtr)
             deallocTypes()
+
+
+
+    @WithMapper
+    def testResizeCreatedStringDoesNotAffectEqualStrings(self, mapper, _):
+        testBytes = self.byteArrayFromString("short")
+        testData = self.ptrFromByteArray(testBytes)
+        ptrPtr = Marshal.AllocHGlobal(Marshal.SizeOf(IntPtr()))
+        try:
+            strPtr = mapper.PyString_FromStringAndSize(testData, len(testBytes))
+            Marshal.WriteIntPtr(ptrPtr, strPtr)
+            self.assertEquals(mapper._PyString_Resize(ptrPtr, 2), 0, "bad return on success")
+            self.assertEquals(mapper.Retrieve(Marshal.ReadIntPtr(ptrPtr)), "sh", "did not see resized data")
+            
+            otherPtr = mapper.Store("short")
+            self.assertNotEquals(otherPtr, strPtr, "C string was shared")
+            self.assertEquals(mapper.Retrieve(otherPtr), "short", "resize changed an equal string")
+            
+            self.assertEquals(mapper._PyString_Resize(ptrPtr, 1000), 0, "bad return on success")
+            self.assertEquals(mapper.Retrieve(mapper.Store("short")), "short", "resize changed an equal string")
+        finally:
+            Marshal.FreeHGlobal(ptrPtr)
+            Marshal.FreeHGlobal(testData)
+
+
+    @WithMapper
+    def testResizeSharedString(self, mapper, _):
+        ptrPtr = Marshal.AllocHGlobal(Marshal.SizeOf(IntPtr()))
+        try:
+            strPtr = mapper.Store("shared")
+            mapper.IncRef(strPtr)
+            refcnt = mapper.RefCount(strPtr)
+            Marshal.WriteIntPtr(ptrPtr, strPtr)
+            
+            self.assertEquals(mapper._PyString_Resize(ptrPtr, 2), -1, "bad return on error")
+            self.assertEquals(type(mapper.LastException), SystemError, "wrong exception type")
+            self.assertEquals(Marshal.ReadIntPtr(ptrPtr), IntPtr.Zero, "did not clear ptr")
+            self.assertEquals(mapper.RefCount(strPtr), refcnt - 1, "did not decref")
+            self.assertEquals(mapper.Retrieve(strPtr), "shared", "changed shared string")
+            mapper.LastException = None
+        finally:
+            Marshal.FreeHGlobal(ptrPtr)
             
 
 class PyString_Size_Test(PyString_TestCase):
@@ -6,7 +6,7 @@ from System import IntPtr
 from System.Reflection import BindingFlags
 from System.Threading import AutoResetEvent, Thread, ThreadStart
 
-from Ironclad import CPyMarshal
+from Ironclad import CPyMarshal, LockException, PythonMapper, PyThreadLock
 from Ironclad.Structs import PyThreadState
 
 def GetGIL(mapper):    
@@ -24,10 +24,10 @@ class PyThread_functions_Test(TestCase):
 
         self.assertNotEquals(lockPtr1, lockPtr2, "bad, wrong")
 
-        lockObject1 = mapper.Retrieve(lockPtr1)
-        lockObject2 = mapper.Retrieve(lockPtr2)
-
-        self.assertNotEquals(lockObject1, lockObject2, "bad, wrong")
+        # locks are opaque handles, not objects
+        self.assertEquals(mapper.HasPtr(lockPtr1), False)
+        self.assertEquals(mapper.HasPtr(lockPtr2), False)
+        self.assertEquals(PyThreadLock.IsLocked(lockPtr1), False)
 
         mapper.PyThread_free_lock(lockPtr1)
         mapper.PyThread_free_lock(lockPtr2)
@@ -111,8 +111,45 @@ class PyThread_functions_Test(TestCase):
         self.assertEquals(mapper.PyThread_acquire_lock(lockPtr, 1), 0, "claimed success")
         mapper.PyThread_release_lock(lockPtr)
         
-        lock = mapper.Retrieve(lockPtr)
-        self.assertEquals(lock.IsAcquired, False)
+        self.assertEquals(PyThreadLock.IsAcquired(lockPtr), False)
+        self.assertEquals(PyThreadLock.IsLocked(lockPtr), False)
+        mapper.PyThread_free_lock(lockPtr)
+
+
+    @WithMapper
+    def testReleaseFromOtherThread(self, mapper, _):
+        lockPtr = mapper.PyThread_allocate_lock()
+        self.assertEquals(mapper.PyThread_acquire_lock(lockPtr, 1), 1, "claimed failure")
+        
+        def ReleaseLock():
+            mapper.PyThread_release_lock(lockPtr)
+        t = Thread(ThreadStart(ReleaseLock))
+        t.Start()
+        t.Join()
+        
+        self.assertEquals(PyThreadLock.IsLocked(lockPtr), False)
+        self.assertRaises(LockException, mapper.PyThread_release_lock, lockPtr)
+        mapper.PyThread_free_lock(lockPtr)
+
+
+    @WithMapper
+    def testContendedLock(self, mapper, _):
+        lockPtr = mapper.PyThread_allocate_lock()
+        counter = [0]
+        def Increment():
+            for _ in range(1000):
+                mapper.PyThread_acquire_lock(lockPtr, 1)
+                value = counter[0]
+                Thread.SpinWait(10)
+                counter[0] = value + 1
+                mapper.PyThread_release_lock(lockPtr)
+        threads = [Thread(ThreadStart(Increment)) for _ in range(4)]
+        for t in threads:
+            t.Start()
+        for t in threads:
+            t.Join()
+        self.assertEquals(counter, [4000])
+        mapper.PyThread_free_lock(lockPtr)
 
 
 class PyThreadExceptionTest(TestCase):
@@ -161,6 +198,26 @@ class PyThreadStateTest(TestCase):
         thread.Start()
         thread.Join()
         mapper.EnsureGIL()
+
+
+    @WithMapper
+    def testThreadStatesAreRecycled(self, mapper, _):
+        threadStates = []
+        def UseMapper(error):
+            mapper.EnsureGIL()
+            ts = CPyMarshal.ReadPtr(mapper._PyThreadState_Current)
+            threadStates.append(ts)
+            self.assertEquals(CPyMarshal.ReadPtrField(ts, PyThreadState, "curexc_type"), IntPtr.Zero)
+            mapper.LastException = error
+            mapper.ReleaseGIL()
+        
+        for error in (NameError("Harold"), None):
+            thread = Thread(ThreadStart(lambda: UseMapper(error)))
+            thread.Start()
+            thread.Join()
+        
+        self.assertEquals(threadStates[0], threadStates[1])
+        self.assertEquals(mapper.ThreadStateCount, 2)
         
             
 
@@ -268,12 +325,169 @@ class PyEvalGILThreadTest(TestCase):
         mapper.EnsureGIL()
 
 
+class GILBatchTest(TestCase):
+
+    @WithMapper
+    def testBatchHoldsGIL(self, mapper, _):
+        mapper.ReleaseGIL()
+        lock = GetGIL(mapper)
+        
+        mapper.EnterGILBatch()
+        self.assertEquals(mapper.InGILBatch, True)
+        mapper.EnsureGIL()
+        mapper.ReleaseGIL()
+        self.assertEquals(lock.CountAcquired, 1)
+        
+        results = []
+        def TryAcquire():
+            results.append(lock.TryAcquire())
+            results.append(mapper.InGILBatch)
+        t = Thread(ThreadStart(TryAcquire))
+        t.Start()
+        t.Join()
+        self.assertEquals(results, [False, False])
+        
+        mapper.ExitGILBatch()
+        self.assertEquals(mapper.InGILBatch, False)
+        self.assertEquals(lock.IsAcquired, False)
+        mapper.EnsureGIL()
+
+
+    @WithMapper
+    def testNestedBatches(self, mapper, _):
+        mapper.EnterGILBatch()
+        mapper.EnterGILBatch()
+        mapper.ExitGILBatch()
+        self.assertEquals(mapper.InGILBatch, True)
+        mapper.ExitGILBatch()
+        self.assertEquals(mapper.InGILBatch, False)
+
+
+    @WithMapper
+    def testTempObjectsLiveUntilBatchEnds(self, mapper, _):
+        obj = object()
+        ptr = mapper.Store(obj)
+        mapper.IncRef(ptr)
+        
+        mapper.EnterGILBatch()
+        mapper.EnsureGIL()
+        mapper.DecRefLater(ptr)
+        mapper.ReleaseGIL()
+        self.assertEquals(mapper.RefCount(ptr), 2)
+        
+        mapper.ExitGILBatch()
+        self.assertEquals(mapper.RefCount(ptr), 1)
+
+
+    @WithMapper
+    def testTempObjectsDontPileUpForever(self, mapper, _):
+        obj = object()
+        ptr = mapper.Store(obj)
+        
+        mapper.EnterGILBatch()
+        for _ in range(PythonMapper.GIL_BATCH_TEMP_LIMIT + 1):
+            mapper.IncRef(ptr)
+            mapper.EnsureGIL()
+            mapper.DecRefLater(ptr)
+            mapper.ReleaseGIL()
+        self.assertEquals(mapper.RefCount(ptr), 1)
+        mapper.ExitGILBatch()
+
+
+    @WithMapper
+    def testBatchYieldsToWaitingThread(self, mapper, _):
+        mapper.ReleaseGIL()
+        mapper.SwitchInterval = 0.001
+        lock = GetGIL(mapper)
+        
+        mapper.EnterGILBatch()
+        acquired = []
+        def Acquire():
+            mapper.EnsureGIL()
+            acquired.append(mapper.InGILBatch)
+            mapper.ReleaseGIL()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        while not lock.DropRequested:
+            Thread.Sleep(1)
+        
+        mapper.EnsureGIL()
+        mapper.ReleaseGIL()
+        self.assertEquals(acquired, [False])
+        self.assertEquals(mapper.InGILBatch, True)
+        self.assertEquals(lock.CountAcquired, 1)
+        
+        mapper.ExitGILBatch()
+        t.Join()
+        mapper.EnsureGIL()
+
+
+    @WithMapper
+    def testSaveThreadReleasesBatchGIL(self, mapper, _):
+        mapper.ReleaseGIL()
+        lock = GetGIL(mapper)
+
+        mapper.EnterGILBatch()
+        mapper.EnsureGIL()
+        token = mapper.PyEval_SaveThread()
+        self.assertEquals(lock.IsAcquired, False)
+        self.assertEquals(mapper.InGILBatch, False)
+
+        results = []
+        def Acquire():
+            mapper.EnsureGIL()
+            results.append(mapper.InGILBatch)
+            mapper.ReleaseGIL()
+            results.append(lock.IsAcquired)
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        self.assertEquals(t.Join(5000), True, "other thread could not take the GIL")
+        self.assertEquals(results, [False, False])
+
+        mapper.PyEval_RestoreThread(token)
+        self.assertEquals(lock.CountAcquired, 2)
+        self.assertEquals(mapper.InGILBatch, True)
+        mapper.ReleaseGIL()
+        mapper.ExitGILBatch()
+        self.assertEquals(lock.IsAcquired, False)
+        mapper.EnsureGIL()
+
+
+    @WithMapper
+    def testSuspendResumeGIL(self, mapper, _):
+        mapper.ReleaseGIL()
+        self.assertEquals(mapper.SuspendGIL(), False)
+
+        lock = GetGIL(mapper)
+        mapper.EnterGILBatch()
+        mapper.EnsureGIL()
+        self.assertEquals(mapper.SuspendGIL(), True)
+        self.assertEquals(lock.IsAcquired, False)
+
+        results = []
+        def Acquire():
+            mapper.EnsureGIL()
+            results.append(mapper.InGILBatch)
+            mapper.ReleaseGIL()
+        t = Thread(ThreadStart(Acquire))
+        t.Start()
+        self.assertEquals(t.Join(5000), True, "other thread could not take the GIL")
+        self.assertEquals(results, [False])
+
+        mapper.ResumeGIL()
+        self.assertEquals(lock.CountAcquired, 2)
+        self.assertEquals(mapper.InGILBatch, True)
+        mapper.ReleaseGIL()
+        mapper.ExitGILBatch()
+        mapper.EnsureGIL()
+
 
 suite = makesuite(
     PyThread_functions_Test,
     PyThreadExceptionTest,
     PyThreadStateTest,
     PyEvalGILThreadTest,
+    GILBatchTest,
 )
 
 if __name__ == '__main__':
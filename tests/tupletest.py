@@ -212,6 +212,53 @@ class TupleTest(TestCase):
         self.assertMapperHasError(mapper, TypeError)
 
 
+    @WithMapper
+    def testStoreArgsReusesTuple(self, mapper, _):
+        argsPtr = mapper.StoreArgs((1, 2))
+        self.assertEquals(mapper.RefCount(argsPtr), 1)
+        self.assertEquals(mapper.Retrieve(argsPtr), (1, 2))
+        mapper.ReleaseArgs(argsPtr)
+        self.assertEquals(mapper.ArgsTupleCount, 1)
+        self.assertEquals(mapper.HasPtr(argsPtr), False)
+
+        argsPtr2 = mapper.StoreArgs(('a', 'b'))
+        self.assertEquals(argsPtr2, argsPtr, "didn't reuse tuple")
+        self.assertEquals(mapper.ArgsTupleCount, 0)
+        self.assertEquals(mapper.Retrieve(argsPtr2), ('a', 'b'))
+        mapper.ReleaseArgs(argsPtr2)
+
+
+    @WithMapper
+    def testReleaseArgsDecRefsItems(self, mapper, _):
+        item = object()
+        itemPtr = mapper.Store(item)
+        argsPtr = mapper.StoreArgs((item,))
+        self.assertEquals(mapper.RefCount(itemPtr), 2)
+        mapper.ReleaseArgs(argsPtr)
+        self.assertEquals(mapper.RefCount(itemPtr), 1)
+        self.assertEquals(CPyMarshal.ReadPtrField(argsPtr, PyTupleObject, "ob_item"), IntPtr.Zero)
+
+
+    @WithMapper
+    def testReleaseArgsLeavesTupleSomeoneKept(self, mapper, _):
+        argsPtr = mapper.StoreArgs((1, 2))
+        mapper.IncRef(argsPtr)
+        mapper.ReleaseArgs(argsPtr)
+        self.assertEquals(mapper.ArgsTupleCount, 0)
+        self.assertEquals(mapper.RefCount(argsPtr), 1)
+        self.assertEquals(mapper.Retrieve(argsPtr), (1, 2))
+        mapper.DecRef(argsPtr)
+
+
+    @WithMapper
+    def testStoreArgsLongTuple(self, mapper, _):
+        args = tuple(range(PythonMapper.MAX_ARGS_TUPLE_LENGTH + 1))
+        argsPtr = mapper.StoreArgs(args)
+        self.assertEquals(mapper.Retrieve(argsPtr), args)
+        mapper.ReleaseArgs(argsPtr)
+        self.assertEquals(mapper.ArgsTupleCount, 0)
+
+
 
 suite = makesuite(
     PyTuple_Type_Test,
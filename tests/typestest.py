@@ -307,6 +307,76 @@ class Types_Test(TestCase):
         self.assertEquals(mapper.Store(instance), instancePtr)
 
 
+    @WithMapper
+    def testStoreActualisedInstance(self, mapper, addToCleanUp):
+        typePtr, deallocType = MakeTypePtr(mapper, {"tp_name": "InstanceClass"})
+        addToCleanUp(deallocType)
+        instancePtr = Marshal.AllocHGlobal(Marshal.SizeOf(PyObject()))
+        addToCleanUp(lambda: Marshal.FreeHGlobal(instancePtr))
+        CPyMarshal.WritePtrField(instancePtr, PyObject, "ob_type", typePtr)
+        CPyMarshal.WriteIntField(instancePtr, PyObject, "ob_refcnt", 1)
+        
+        instance = mapper.Retrieve(instancePtr)
+        self.assertEquals(CPyMarshal.ReadIntField(instancePtr, PyObject, "ob_refcnt"), 2)
+        self.assertEquals(mapper.Store(instance), instancePtr)
+        self.assertEquals(CPyMarshal.ReadIntField(instancePtr, PyObject, "ob_refcnt"), 3)
+        
+        # forgotten instances still work, via the ordinary mapping
+        mapper.ForgetInstance(instance)
+        self.assertEquals(mapper.Store(instance), instancePtr)
+        self.assertEquals(CPyMarshal.ReadIntField(instancePtr, PyObject, "ob_refcnt"), 4)
+        mapper.ForgetInstance(instance)
+        
+        mapper.DecRef(instancePtr)
+        mapper.DecRef(instancePtr)
+        mapper.Unmap(instancePtr)
+
+
+    @WithMapper
+    def testStoreActualisedInstanceStrengthens(self, mapper, addToCleanUp):
+        typePtr, deallocType = MakeTypePtr(mapper, {"tp_name": "InstanceClass"})
+        addToCleanUp(deallocType)
+        instancePtr = Marshal.AllocHGlobal(Marshal.SizeOf(PyObject()))
+        addToCleanUp(lambda: Marshal.FreeHGlobal(instancePtr))
+        CPyMarshal.WritePtrField(instancePtr, PyObject, "ob_type", typePtr)
+        CPyMarshal.WriteIntField(instancePtr, PyObject, "ob_refcnt", 1)
+        
+        def Weaken():
+            instance = mapper.Retrieve(instancePtr)
+            mapper.DecRef(instancePtr)
+            mapper.DemandCleanup()
+            return WeakReference(instance)
+        ref = Weaken()
+        
+        # C takes a reference through the fast path; nothing else keeps the instance alive
+        self.assertEquals(mapper.Store(ref.Target), instancePtr)
+        self.assertEquals(CPyMarshal.ReadIntField(instancePtr, PyObject, "ob_refcnt"), 2)
+        gcwait()
+        self.assertEquals(ref.IsAlive, True, "instance was GCed while C held a reference")
+        
+        mapper.DecRef(instancePtr)
+        mapper.Unmap(instancePtr)
+
+
+    @WithMapper
+    def testUnmapForgetsInstancePtr(self, mapper, addToCleanUp):
+        typePtr, deallocType = MakeTypePtr(mapper, {"tp_name": "InstanceClass"})
+        addToCleanUp(deallocType)
+        instancePtr = Marshal.AllocHGlobal(Marshal.SizeOf(PyObject()))
+        addToCleanUp(lambda: Marshal.FreeHGlobal(instancePtr))
+        CPyMarshal.WritePtrField(instancePtr, PyObject, "ob_type", typePtr)
+        CPyMarshal.WriteIntField(instancePtr, PyObject, "ob_refcnt", 1)
+        
+        instance = mapper.Retrieve(instancePtr)
+        mapper.Unmap(instancePtr)
+        CPyMarshal.WriteIntField(instancePtr, PyObject, "ob_refcnt", 12345)
+        
+        # not written through the old ptr: the instance gets a new mapping
+        newPtr = mapper.Store(instance)
+        self.assertNotEquals(newPtr, instancePtr)
+        self.assertEquals(CPyMarshal.ReadIntField(instancePtr, PyObject, "ob_refcnt"), 12345)
+
+
     @WithMapper
     def testStoreUnknownTypeWithBases(self, mapper, _):
         class C(object): pass
@@ -0,0 +1,73 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase, WithMapper
+
+
+class ValueCacheTest(TestCase):
+
+    @WithMapper
+    def testDisabledByDefault(self, mapper, _):
+        self.assertEquals(mapper.ValueCacheSize, 0)
+        self.assertNotEquals(mapper.Store(5), mapper.Store(5))
+        self.assertEquals(mapper.ValueCacheCount, 0)
+
+
+    @WithMapper
+    def testSmallInts(self, mapper, _):
+        mapper.ValueCacheSize = 10
+        ptr = mapper.Store(5)
+        self.assertEquals(mapper.RefCount(ptr), 2)
+        self.assertEquals(mapper.Store(int('5')), ptr)
+        self.assertEquals(mapper.RefCount(ptr), 3)
+        
+        big = mapper.Store(123456)
+        self.assertNotEquals(mapper.Store(int('123456')), big)
+        self.assertEquals(mapper.RefCount(big), 1)
+        self.assertEquals(mapper.ValueCacheCount, 1)
+
+
+    @WithMapper
+    def testFloatsKeyedOnBits(self, mapper, _):
+        mapper.ValueCacheSize = 10
+        zero = mapper.Store(0.0)
+        self.assertEquals(mapper.Store(float('0.0')), zero)
+        self.assertNotEquals(mapper.Store(-0.0), zero)
+        self.assertNotEquals(mapper.Store(0), zero)
+        
+        mapper.ResetValueCacheStats()
+        ptr = mapper.Store(float('2.5'))
+        self.assertEquals(mapper.Store(float('2.5')), ptr)
+        self.assertEquals((mapper.ValueCacheHits, mapper.ValueCacheMisses), (1, 1))
+
+
+    @WithMapper
+    def testStringsAreEvicted(self, mapper, _):
+        mapper.ValueCacheSize = 1
+        a = mapper.Store('a')
+        self.assertEquals(mapper.Store('a'), a)
+        self.assertEquals(mapper.RefCount(a), 3)
+        
+        b = mapper.Store('b')
+        self.assertEquals(mapper.RefCount(a), 2)
+        self.assertEquals(mapper.RefCount(b), 2)
+        
+        long_ = 'x' * 100
+        self.assertNotEquals(mapper.Store(long_), mapper.Store('x' * 100))
+
+
+    @WithMapper
+    def testDisableReleasesReferences(self, mapper, _):
+        mapper.ValueCacheSize = 10
+        ptrs = [mapper.Store(3), mapper.Store(3.5), mapper.Store('hullo')]
+        for ptr in ptrs:
+            self.assertEquals(mapper.RefCount(ptr), 2)
+        
+        mapper.ValueCacheSize = 0
+        self.assertEquals(mapper.ValueCacheCount, 0)
+        for ptr in ptrs:
+            self.assertEquals(mapper.RefCount(ptr), 1)
+
+
+suite = makesuite(ValueCacheTest)
+
+if __name__ == '__main__':
+    run(suite)
@@ -0,0 +1,105 @@
+from tests.utils.runtest import makesuite, run
+from tests.utils.testcase import TestCase
+
+from System import Array, InvalidOperationException
+from System.Threading import ManualResetEvent, Thread
+
+from Ironclad import WorkerPool
+
+
+def Args(*args):
+    return Array[object](args)
+
+
+class WorkerPoolTest(TestCase):
+
+    def testSubmit(self):
+        pool = WorkerPool(2)
+        self.assertEquals(pool.Workers, 2)
+
+        calls = []
+        def f(a, b):
+            calls.append((a, b, Thread.CurrentThread.Name))
+            return a + b
+        future = pool.Submit(f, Args(1, 2))
+        self.assertEquals(future.Result, 3)
+        self.assertEquals(future.Done, True)
+        self.assertEquals(future.Exception, None)
+        self.assertEquals(calls[0][:2], (1, 2))
+        self.assertEquals(calls[0][2].startswith('ironclad worker'), True)
+        pool.Shutdown(True)
+
+
+    def testException(self):
+        pool = WorkerPool(1)
+        def f():
+            raise ValueError('boom')
+        future = pool.Submit(f, Args())
+        self.assertNotEquals(future.Exception, None)
+        try:
+            future.Result
+        except ValueError, e:
+            self.assertEquals(str(e), 'boom')
+        else:
+            self.fail('expected ValueError')
+        pool.Shutdown(True)
+
+
+    def testResultKeepsWorkerStackTrace(self):
+        pool = WorkerPool(1)
+        def f():
+            raise InvalidOperationException('boom')
+        future = pool.Submit(f, Args())
+        try:
+            future.Result
+        except InvalidOperationException, e:
+            self.assertEquals('WorkerPool.Work' in e.StackTrace, True)
+        else:
+            self.fail('expected InvalidOperationException')
+        pool.Shutdown(True)
+
+
+    def testCallsRunConcurrently(self):
+        pool = WorkerPool(2)
+        first, second = ManualResetEvent(False), ManualResetEvent(False)
+        def f(mine, other):
+            mine.Set()
+            return other.WaitOne(5000)
+
+        futures = [pool.Submit(f, Args(first, second)), pool.Submit(f, Args(second, first))]
+        self.assertEquals([future.Result for future in futures], [True, True])
+        pool.Shutdown(True)
+
+
+    def testWait(self):
+        pool = WorkerPool(1)
+        release = ManualResetEvent(False)
+        future = pool.Submit(lambda: release.WaitOne(), Args())
+        self.assertEquals(future.Wait(0.05), False)
+        self.assertEquals(future.Done, False)
+
+        release.Set()
+        self.assertEquals(future.Wait(5), True)
+        self.assertEquals(future.Done, True)
+        pool.Shutdown(True)
+
+
+    def testShutdownFinishesSubmittedWork(self):
+        pool = WorkerPool(1)
+        results = []
+        futures = [pool.Submit(results.append, Args(i)) for i in range(10)]
+        pool.Shutdown(True)
+        self.assertEquals(results, range(10))
+        self.assertEquals(all(future.Done for future in futures), True)
+        self.assertRaises(InvalidOperationException, pool.Submit, results.append, Args(10))
+
+
+    def testNeedsWorkers(self):
+        self.assertRaises(ValueError, WorkerPool, 0)
+
+
+suite = makesuite(
+    WorkerPoolTest,
+)
+if __name__ == '__main__':
+    run(suite)
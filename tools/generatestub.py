@@ -11,6 +11,7 @@ INPUTS = (
     ('_exported_functions.generated',           read_lines),
     ('_extra_functions',                        read_lines),
     ('_pure_c_symbols',                         read_set),
+    ('_fast_path_symbols',                      read_set),
     ('_mgd_api_data',                           read_lines),
 )
 
@@ -41,34 +41,52 @@ def _tweak_args(base_mgd_args, arg_tweak=None):
 
 #==========================================================================
 
-def _get_mgd_arglist(spec):
-    arglist = '%s key' % ICTYPE_2_MGDTYPE['str']
+def _get_mgd_arglist(spec, native=None):
+    arglist = ['%s key' % ICTYPE_2_MGDTYPE['str']]
+    if native is not None:
+        arglist.append('dgt_%s dgt' % (native,))
     arglist_rest = spec.mgd_arglist
     if arglist_rest:
-        arglist = ', '.join((arglist, arglist_rest))
-    return arglist
+        arglist.append(arglist_rest)
+    return ', '.join(arglist)
 
-def _generate_signature_snippet(name, spec):
+def _generate_signature_snippet(name, spec, native=None):
     return SIGNATURE_TEMPLATE % {
         'name': name,
         'rettype': spec.mgd_ret,
-        'arglist': _get_mgd_arglist(spec),
+        'arglist': _get_mgd_arglist(spec, native),
+    }
+
+def _generate_lookup_method_code(name, spec, native):
+    return_ = ''
+    if spec.ret != 'void':
+        return_ = 'return '
+    return LOOKUP_METHOD_TEMPLATE % {
+        'signature': _generate_signature_snippet(name, spec),
+        'return_': return_,
+        'name': name,
+        'spec': native,
+        'arglist': ''.join(', arg%d' % i for i in xrange(len(spec.args))),
     }
 
 
 #==========================================================================
 
 @return_dict('translate_objs cleanup_objs')
-def _generate_translate_snippets(args, nullable_kwargs_index):
+def _generate_translate_snippets(args, nullable_kwargs_index, args_tuple_index):
     cleanups = []
     translates = []
     for (i, arg) in enumerate(args):
         if arg == 'obj':
             translate_template = TRANSLATE_OBJ_TEMPLATE
+            cleanup_template = CLEANUP_OBJ_TEMPLATE
             if i == nullable_kwargs_index:
                 translate_template = TRANSLATE_NULLABLE_KWARGS_TEMPLATE
+            elif i == args_tuple_index:
+                translate_template = TRANSLATE_ARGS_TUPLE_TEMPLATE
+                cleanup_template = CLEANUP_ARGS_TUPLE_TEMPLATE
             translates.append(translate_template % {'index': i})
-            cleanups.append(CLEANUP_OBJ_TEMPLATE % {'index': i})
+            cleanups.append(cleanup_template % {'index': i})
     return '\n'.join(translates), '\n'.join(cleanups)
 
 
@@ -128,7 +146,8 @@ class DispatcherGenerator(CodeGenerator):
             spec_from=None, 
             arg_tweak=None, 
             ret_tweak='', 
-            nullable_kwargs_index=None):
+            nullable_kwargs_index=None,
+            args_tuple_index=None):
         
         base = self._get_spec(spec_from or name)
         native = base.native
@@ -139,13 +158,15 @@ class DispatcherGenerator(CodeGenerator):
         self.context.dispatcher_methods[name] = (mgd.args, native)
         
         info = {
-            'signature':    _generate_signature_snippet(name, mgd),
+            'signature':    _generate_signature_snippet(name, mgd, native),
             'call_dgt':     _generate_call_dgt_snippet(native, native_arg_names),
         }
-        info.update(_generate_translate_snippets(mgd.args, nullable_kwargs_index))
+        info.update(_generate_translate_snippets(mgd.args, nullable_kwargs_index, args_tuple_index))
         info.update(_generate_ret_snippets(base, ret_tweak))
         
-        return METHOD_TEMPLATE % info
+        return '\n\n'.join((
+            METHOD_TEMPLATE % info,
+            _generate_lookup_method_code(name, mgd, native)))
     
 
 #==========================================================================
@@ -6,20 +6,10 @@ from tools.utils.codegen import CodeGenerator, return_dict
 
 #==========================================================================
 
-def _generate_template(template2, functype, inargs, callargs):
-    return template2 % {
-        'functype': functype,
-        'arglist': ', '.join(inargs),
-        'callargs': ', '.join(callargs),
-    }
-
-def _generate_normal_template(template2, functype, inargs):
-    args = ['_%d' % i for i in xrange(len(inargs))]
-    return _generate_template(template2, functype, args, args)
-
-def _generate_swapped_template(template2, functype, inargs):
-    args = ['_%d' % i for i in xrange(len(inargs))]
-    return _generate_template(template2, functype, args, args[::-1])
+def _choose_binder(binder, arity_binders, inargs):
+    if binder is not None:
+        return binder
+    return arity_binders[len(inargs)]
 
 
 #==========================================================================
@@ -29,14 +19,15 @@ def _generate_has_swapped_version_code(has_swapped_version):
         return SWAP_YES_CODE
     return SWAP_NO_CODE
 
-def _generate_case_code(c_field, py_field, has_swapped_version, dgt_spec, template):
+def _generate_case_code(c_field, py_field, has_swapped_version, dgt_spec, functype, binder):
     swapped_code = _generate_has_swapped_version_code(has_swapped_version)
     return MAGICMETHOD_CASE_TEMPLATE % {
         'c_field': c_field, 
         'py_field': py_field, 
         'has_swapped_version_code': swapped_code, 
         'dgt_spec': dgt_spec, 
-        'template': template,
+        'functype': functype,
+        'binder': binder,
     }
 
 
@@ -61,20 +52,20 @@ class MagicMethodsGenerator(CodeGenerator):
     
     def _generate_cases(self, c_field, dispatcher_method, py_field, 
             py_swapped_field=None,
-            template2=MAGICMETHOD_TEMPLATE2,
-            swapped_template2=MAGICMETHOD_TEMPLATE2):
+            binder=None,
+            swapped_binder=None):
         
         has_swapped_version =  py_swapped_field is not None
         mgd_args, dgt_spec = self.context.dispatcher_methods[dispatcher_method]
         
-        template = _generate_normal_template(template2, dispatcher_method, mgd_args)
+        binder = _choose_binder(binder, ARITY_BINDERS, mgd_args)
         self._normal_cases.append(_generate_case_code(
-            c_field, py_field, has_swapped_version, dgt_spec, template))
+            c_field, py_field, has_swapped_version, dgt_spec, dispatcher_method, binder))
         
         if has_swapped_version:
-            swapped_template = _generate_swapped_template(swapped_template2, dispatcher_method, mgd_args)
+            swapped_binder = _choose_binder(swapped_binder, SWAPPED_ARITY_BINDERS, mgd_args)
             self._swapped_cases.append(_generate_case_code(
-                c_field, py_swapped_field, False, dgt_spec, swapped_template))
+                c_field, py_swapped_field, False, dgt_spec, dispatcher_method, swapped_binder))
     
 
 #==========================================================================
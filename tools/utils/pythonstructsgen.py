@@ -1,4 +1,6 @@
 
+import re
+
 from data.snippets.cs.pythonstructs import *
 
 from tools.utils.codegen import CodeGenerator, return_dict
@@ -9,25 +11,78 @@ from tools.utils.platform import ICTYPE_2_MGDTYPE
 
 #==========================================================================
 
-def _generate_field_code(fieldspec):
-    name, ictype = fieldspec
+# managed types which CPyMarshal knows how to read and write
+_MGDTYPE_2_ACCESSOR_KIND = {
+    'IntPtr':   'Ptr',
+    'int':      'Int',
+    'uint':     'UInt',
+    'double':   'Double',
+    'byte':     'Byte',
+}
+
+# struct-specific field prefixes, which don't need to be repeated in accessor names
+_FIELD_PREFIX = re.compile('^(ob|tp|nb|sq|mp|bf|ml|im|cl|in|f|func)_')
+
+def _get_mgdtype(ictype):
     if ictype not in VALID_ICTYPES:
         # FIXME: this is not necessarily a function ptr
         # ...but it has been in all the cases we've seen
         ictype = 'ptr'
-    
+    return ICTYPE_2_MGDTYPE[native_ictype(ictype)]
+
+def _camel(name):
+    return ''.join(part.capitalize() for part in name.split('_'))
+
+def _get_accessor_names(fields):
+    # ob_refcnt -> Refcnt; if stripping prefixes would make names clash, don't
+    short = [_camel(_FIELD_PREFIX.sub('', name)) for (name, _) in fields]
+    if len(set(short)) == len(short):
+        return short
+    return [_camel(name) for (name, _) in fields]
+
+
+#==========================================================================
+
+def _generate_field_code(fieldspec):
+    name, ictype = fieldspec
     return STRUCT_FIELD_TEMPLATE % {
         'name': name,
-        'type': ICTYPE_2_MGDTYPE[native_ictype(ictype)], 
+        'type': _get_mgdtype(ictype), 
+    }
+
+def _generate_offset_code(struct, fieldspec):
+    name, _ = fieldspec
+    return STRUCT_OFFSET_TEMPLATE % {
+        'name': name,
+        'struct': struct,
+    }
+
+def _generate_accessors_code(fieldspec, accessor):
+    name, ictype = fieldspec
+    mgdtype = _get_mgdtype(ictype)
+    if mgdtype not in _MGDTYPE_2_ACCESSOR_KIND:
+        # embedded structs, strings, etc: offset only
+        return None
+    return STRUCT_ACCESSORS_TEMPLATE % {
+        'name': name,
+        'type': mgdtype,
+        'kind': _MGDTYPE_2_ACCESSOR_KIND[mgdtype],
+        'accessor': accessor,
     }
 
 def _generate_struct_code(structspec):
     name, fields = structspec
     fields_code = '\n'.join(
         map(_generate_field_code, fields))
+    offsets_code = '\n'.join(
+        _generate_offset_code(name, field) for field in fields)
+    accessors_code = '\n'.join(filter(None, 
+        map(_generate_accessors_code, fields, _get_accessor_names(fields))))
     return STRUCT_TEMPLATE % {
         'name': name, 
-        'fields': fields_code
+        'fields': fields_code,
+        'offsets': offsets_code,
+        'accessors': accessors_code,
     }
     
 
@@ -13,6 +13,14 @@ def _extract_funcname(c_func):
     if '(' in c_func:
         return c_func.split('(')[0].split()[-1].replace('*', '')
     return c_func.split(';')[0].split()[-1]
+
+
+def _jump_symbol(name, fast_path_symbols):
+    # fast-path functions are defined in C; their managed versions are still
+    # reachable, under another name
+    if name in fast_path_symbols:
+        return 'IC_' + name
+    return name
     
 
 #==========================================================================
@@ -59,16 +67,17 @@ def generate_header(prototypes):
 
 class StubGenerator(CodeGenerator):
 
-    INPUTS = 'EXPORTED_FUNCTIONS EXTRA_FUNCTIONS PURE_C_SYMBOLS MGD_API_DATA'
+    INPUTS = 'EXPORTED_FUNCTIONS EXTRA_FUNCTIONS PURE_C_SYMBOLS FAST_PATH_SYMBOLS MGD_API_DATA'
 
     def _run(self):
         needs_jump = lambda f: f not in self.PURE_C_SYMBOLS
         functions = filter(needs_jump, self.EXPORTED_FUNCTIONS)
         functions += map(_extract_funcname, self.EXTRA_FUNCTIONS)
+        symbols = [_jump_symbol(f, self.FAST_PATH_SYMBOLS) for f in functions]
         return {
             'STUBINIT':     generate_stubinit(functions, self.MGD_API_DATA),
             'HEADER':       generate_header(self.EXTRA_FUNCTIONS),
-            'JUMPS':        generate_jumps(functions),
+            'JUMPS':        generate_jumps(symbols),
         }
 
 